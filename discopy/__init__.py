@@ -1,30 +1,41 @@
 # -*- coding: utf-8 -*-
 
-""" DisCoPy: the Python toolkit for computing with string diagrams. """
+"""
+DisCoPy: the Python toolkit for computing with string diagrams.
 
-from discopy import (
-    cat,
-    monoidal,
-    braided,
-    symmetric,
-    cartesian,
-    traced,
-    closed,
-    rigid,
-    pivotal,
-    ribbon,
-    compact,
-    frobenius,
-    hypergraph,
-    python,
-    matrix,
-    tensor,
-    quantum,
-    grammar,
-    drawing,
-    utils,
-    config,
-    messages,
-)
+Submodules are imported when they are first accessed, e.g. ``import discopy``
+does not import NumPy or matplotlib until ``discopy.tensor`` or a drawing
+method is needed.
+"""
+
+from discopy.utils import lazy_import
 
 __version__ = '1.0.1'
+
+__all__ = [
+    "cat",
+    "monoidal",
+    "braided",
+    "symmetric",
+    "cartesian",
+    "traced",
+    "closed",
+    "rigid",
+    "pivotal",
+    "ribbon",
+    "compact",
+    "frobenius",
+    "hypergraph",
+    "python",
+    "matrix",
+    "tensor",
+    "sparse",
+    "quantum",
+    "grammar",
+    "drawing",
+    "utils",
+    "config",
+    "messages",
+]
+
+__getattr__, __dir__ = lazy_import(__name__, {name: name for name in __all__})
@@ -31,6 +31,7 @@ Summary
         :toctree:
 
         factory
+        trusted
         dumps
         loads
 
@@ -77,19 +78,24 @@ Functors are bubble-preserving.
 
 from __future__ import annotations
 
+import threading
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from copy import copy
 from dataclasses import dataclass
-from functools import total_ordering, cached_property
+from functools import total_ordering, cached_property, lru_cache
+from itertools import chain
 from typing import (
     Callable, Mapping, Iterable, Optional, TypeVar, Generic, Type)
 
-from discopy import messages, utils
+from discopy import config, messages, utils
 from discopy.utils import (
     factory_name,
     from_tree,
     rsubs,
     mmap,
     assert_isinstance,
+    LazyMapping,
     MappingOrCallable,
 )
 
@@ -97,6 +103,9 @@ dumps, loads = utils.dumps, utils.loads
 
 T = TypeVar('T')
 
+HASH_BASE, HASH_MODULUS = 1_000_003, (1 << 61) - 1
+HASH_CACHE = ("_hash", "_box_hash", "_inside_hash", "_prefix_hashes")
+
 
 @total_ordering
 class Ob:
@@ -125,7 +134,16 @@ class Ob:
         return isinstance(other, type(self)) and self.name == other.name
 
     def __hash__(self):
-        return hash(repr(self))
+        return self._hash
+
+    @cached_property
+    def _hash(self) -> int:
+        return hash(self.name)
+
+    def __getstate__(self):
+        # String hashes are salted per process, we do not pickle them.
+        return {key: value for key, value in self.__dict__.items()
+                if key not in HASH_CACHE}
 
     def __lt__(self, other):
         return self.name < other.name
@@ -250,6 +268,42 @@ def factory(cls: Type[Composable]) -> Type[Composable]:
     return cls
 
 
+_local = threading.local()
+
+
+def _is_trusted() -> bool:
+    """ Whether we are inside a :func:`trusted` context in this thread. """
+    return getattr(_local, "trusted", False)
+
+
+@contextmanager
+def trusted():
+    """
+    Context in which arrows are built without checking that their boxes
+    compose, used internally whenever this holds by construction.
+
+    Setting ``config.DEBUG = True`` turns this into a no-op, i.e. arrows are
+    checked inside the context as well. The context is local to each thread.
+
+    Example
+    -------
+    >>> x, y = Ob('x'), Ob('y')
+    >>> f = Box('f', x, y)
+    >>> with trusted():
+    ...     print(f >> f)
+    f >> f
+    >>> f >> f
+    Traceback (most recent call last):
+    ...
+    discopy.cat.AxiomError: f does not compose with f: y != x.
+    """
+    previous, _local.trusted = _is_trusted(), not config.DEBUG
+    try:
+        yield
+    finally:
+        _local.trusted = previous
+
+
 @factory
 class Arrow(Composable[Ob]):
     """
@@ -260,7 +314,7 @@ class Arrow(Composable[Ob]):
         inside: The tuple of boxes inside an arrow.
         dom: The domain of an arrow, i.e. its input.
         cod: The codomain of an arrow, i.e. output
-        _scan: Whether to check composition.
+        _scan: Whether to check composition, see also :func:`trusted`.
 
     .. admonition:: Summary
 
@@ -296,6 +350,15 @@ class Arrow(Composable[Ob]):
     If ``dom`` or ``cod`` are not instances of ``ty_factory``, they are
     automatically cast. This means one can use e.g. ``int`` instead of ``Ob``,
     see :class:`monoidal.PRO`.
+
+    Note
+    ----
+    Arrows are hashed structurally: the hash of each box is computed once and
+    cached, the boxes inside are combined with a rolling hash. This means
+    composition and slicing of hashed arrows gets hashed without traversal.
+
+    >>> assert hash(f >> g) == hash(Arrow((f, g), x, z))
+    >>> assert hash((f >> g)[:1]) == hash(f)
     """
     ty_factory = Ob
 
@@ -305,7 +368,7 @@ class Arrow(Composable[Ob]):
         dom = dom if isinstance(dom, ty_factory) else ty_factory(dom)
         cod = cod if isinstance(cod, ty_factory) else ty_factory(cod)
         self.dom, self.cod, self.inside = dom, cod, inside
-        if _scan:
+        if _scan and not _is_trusted():
             for box in inside:
                 assert_isinstance(box, Box)
             for f, g in zip((Id(dom), ) + inside, inside + (Id(cod), )):
@@ -329,8 +392,15 @@ class Arrow(Composable[Ob]):
                 if (key.start or 0) <= -len(self):
                     return self.id(self.dom)
                 return self.id(self.inside[key.start or 0].dom)
-            return self.factory(
+            result = self.factory(
                 inside, inside[0].dom, inside[-1].cod, _scan=False)
+            if "_prefix_hashes" in vars(self):
+                start, stop, _ = key.indices(len(self))
+                prefix, shift = self._prefix_hashes, pow(
+                    HASH_BASE, stop - start, HASH_MODULUS)
+                result._inside_hash = (
+                    prefix[stop] - prefix[start] * shift) % HASH_MODULUS
+            return result
         if isinstance(key, int):
             if key < 0:
                 return self[len(self) + key]
@@ -356,7 +426,26 @@ class Arrow(Composable[Ob]):
             and self.is_parallel(other) and self.inside == other.inside
 
     def __hash__(self):
-        return hash(repr(self))
+        return self._hash
+
+    __getstate__ = Ob.__getstate__
+
+    @cached_property
+    def _hash(self) -> int:
+        return hash((self.dom, self.cod, self._inside_hash))
+
+    @cached_property
+    def _prefix_hashes(self) -> list[int]:
+        """ The rolling hash of each prefix of the boxes inside. """
+        result = [0]
+        for box in self.inside:
+            result.append(
+                (result[-1] * HASH_BASE + box._box_hash) % HASH_MODULUS)
+        return result
+
+    @cached_property
+    def _inside_hash(self) -> int:
+        return self._prefix_hashes[-1]
 
     def __add__(self, other):
         return self.sum_factory((self, )) + other
@@ -396,12 +485,24 @@ class Arrow(Composable[Ob]):
         """
         if any(isinstance(other, Sum) for other in others):
             return self.sum_factory((self, )).then(*others)
-        inside, dom, cod = self.inside, self.dom, self.cod
-        for other in others:
-            assert_isinstance(other, self.factory)
-            assert_isinstance(self, other.factory)
-            inside, cod = inside + other.inside, other.cod
-        return self.factory(inside, dom, cod)
+        for left, right in zip((self, ) + others, others):
+            assert_isinstance(right, self.factory)
+            assert_isinstance(self, right.factory)
+            if not _is_trusted():
+                assert_iscomposable(left, right)
+        # Arrows are composable so we only need to concatenate once.
+        inside = self.inside + tuple(
+            chain.from_iterable(other.inside for other in others))
+        cod = others[-1].cod if others else self.cod
+        result = self.factory(inside, self.dom, cod, _scan=False)
+        if all("_inside_hash" in vars(arrow) for arrow in (self, ) + others):
+            inside_hash = self._inside_hash
+            for other in others:
+                shift = pow(HASH_BASE, len(other), HASH_MODULUS)
+                inside_hash = (
+                    inside_hash * shift + other._inside_hash) % HASH_MODULUS
+            result._inside_hash = inside_hash
+        return result
 
     def dagger(self) -> Arrow:
         """ Contravariant involution, called with :code:`[::-1]`. """
@@ -612,13 +713,19 @@ class Box(Arrow):
         return str(self.name) + ("[::-1]" if self.is_dagger else '')
 
     def __hash__(self):
-        return hash(Arrow.__repr__(self))
+        return self._hash
+
+    @cached_property
+    def _box_hash(self) -> int:
+        """ The hash of the box itself, rather than the arrow it defines. """
+        return hash((self.name, self.dom, self.cod, self.is_dagger,
+                     utils.hash_data(self.data)))
 
     def __eq__(self, other):
         if isinstance(other, type(self)):
-            eq_data = bool(self.data == other.data)
             return self.name == other.name and self.is_parallel(other)\
-                and self.is_dagger == other.is_dagger and eq_data
+                and self.is_dagger == other.is_dagger\
+                and utils.eq_data(self.data, other.data)
         return isinstance(other, self.factory) and other.inside == (self, )
 
     def __lt__(self, other):
@@ -694,7 +801,12 @@ class Sum(Box):
         return len(self.terms) == 1 and self.terms[0] == other
 
     def __hash__(self):
-        return hash(repr(self))
+        return self._hash
+
+    @cached_property
+    def _hash(self) -> int:
+        return hash(self.terms[0]) if len(self.terms) == 1\
+            else hash((self.dom, self.cod, self.terms))
 
     def __repr__(self):
         return self.name
@@ -839,6 +951,7 @@ class Functor(Composable[Category]):
         ob : Mapping from :class:`Ob` to :code:`cod.ob`.
         ar : Mapping from :class:`Box` to :code:`cod.ar`.
         cod : The codomain, :code:`Category(Ob, Arrow)` by default.
+        cache_size : The size of the cache for images, none by default.
 
     Example
     -------
@@ -869,6 +982,18 @@ class Functor(Composable[Category]):
     >>> assert F(m) == m
     >>> m.data.append(False)
     >>> assert F(m) == m[::-1]
+
+    Note
+    ----
+    Given a ``cache_size``, the images of the objects and boxes inside arrows
+    are kept in a least-recently-used cache of that size, or unbounded if it
+    is ``None``. The cache is keyed by type and equality, so it should only be
+    used for functors that do not depend on mutable :attr:`Box.data`.
+
+    >>> F = Functor(ob, ar=lambda f: f >> f, cache_size=128)
+    >>> assert F(h >> h >> h) == h >> h >> h >> h >> h >> h
+    >>> F.cache_info()
+    CacheInfo(hits=2, misses=1, maxsize=128, currsize=1)
     """
     dom = cod = Category(Ob, Arrow)
 
@@ -891,11 +1016,22 @@ class Functor(Composable[Category]):
         Parameters:
             other : The other functor with which to compose.
 
+        Raises:
+            cat.AxiomError : Whenever the codomain of ``self`` is not the
+                domain of ``other``.
+
         Note
         ----
         Functor composition is unital only on the left. Indeed, we cannot check
         equality of functors defined with functions instead of dictionaries.
 
+        Note
+        ----
+        The composite is a copy of ``other``, i.e. it has the same type,
+        codomain and attributes, e.g. the ``dtype`` of a tensor functor, with
+        the domain of ``self`` and the smallest cache size of the two. Thus a
+        rigid functor composed with a tensor functor is a tensor functor.
+
         Example
         -------
         >>> x, y = Ob('x'), Ob('y')
@@ -905,23 +1041,69 @@ class Functor(Composable[Category]):
         >>> assert F >> Functor.id() == F != Functor.id() >> F
         >>> print(Functor.id() >> F)  # doctest: +ELLIPSIS
         cat.Functor(ob=<function ...>, ar=...)
+
+        Note
+        ----
+        The composition is fused, i.e. it maps each box straight to
+        :code:`other(self(box))` without building the intermediate arrow. When
+        ``ar`` is a dictionary, each image is computed once when it is first
+        needed, otherwise it is cached whenever both functors have a cache.
+
+        >>> f = Box('f', x, x)
+        >>> F = Functor({x: x}, {f: f >> f})
+        >>> G = Functor({x: y}, lambda box: print(box) or Box('g', y, y))
+        >>> print((F >> G)(f >> f))
+        f
+        f
+        g >> g >> g >> g
         """
         assert_isinstance(other, Functor)
-        assert_isparallel(self, other)
-        ob = self.ob.then(other)
-        ar = self.ar.then(other)
-        result = type(self)(ob, ar, other.cod)
-        result.dom = self.dom
+        assert_iscomposable(self, other)
+        image = lambda x: other(self(x))
+        ob, ar = (LazyMapping(mapping, image) if isinstance(
+            mapping.mapping, Mapping) else image for mapping in (
+                self.ob, self.ar))
+        # The composite is a copy of other as it knows about its codomain.
+        result = copy(other)
+        vars(result).pop("_cache", None)
+        result.ob, result.ar = map(MappingOrCallable, (ob, ar))
+        result.dom, result.cache_size = self.dom, min(
+            self.cache_size, other.cache_size,
+            key=lambda size: float('inf') if size is None else size)
         return result
 
     def __init__(
             self,
             ob: Mapping[Ob, Ob] | Callable[[Ob], Ob] | None = None,
             ar: Mapping[Box, Arrow] | Callable[[Box], Arrow] | None = None,
-            cod: Category = None):
+            cod: Category = None, cache_size: int | None = 0):
         self.cod = cod or type(self).cod
         self.ob: MappingOrCallable[Ob, Ob] = MappingOrCallable(ob or {})
         self.ar: MappingOrCallable[Box, Arrow] = MappingOrCallable(ar or {})
+        self.cache_size = cache_size
+
+    @cached_property
+    def _cache(self) -> Callable:
+        return lru_cache(self.cache_size)(lambda _, other: self(other))
+
+    def _image(self, other: Ob | Box):
+        """ The image of an object or a box, cached by type and equality. """
+        return self._cache(type(other), other)
+
+    def cache_info(self):
+        """
+        The hits, misses, maximum and current size of the cache, see
+        :func:`functools.lru_cache`.
+        """
+        return self._cache.cache_info()
+
+    def cache_clear(self):
+        """ Clear the cache, e.g. after updating :code:`ob` or :code:`ar`. """
+        self._cache.cache_clear()
+
+    def __getstate__(self):
+        return {key: value for key, value in self.__dict__.items()
+                if key != "_cache"}
 
     def __eq__(self, other):
         return type(self) == type(other)\
@@ -946,12 +1128,22 @@ class Functor(Composable[Category]):
         if isinstance(other, Box):
             result = self.ar[other]
             # This allows some nice syntactic sugar for the ar mapping.
-            return result if isinstance(result, self.cod.ar)\
-                else self.cod.ar(result, self(other.dom), self(other.cod))
+            if not isinstance(result, self.cod.ar):
+                return self.cod.ar(result, self(other.dom), self(other.cod))
+            # Arrows are composed unchecked so we check each image instead.
+            if isinstance(result, Arrow) and (result.dom, result.cod)\
+                    != (self(other.dom), self(other.cod)):
+                raise AxiomError(messages.WRONG_IMAGE.format(
+                    other, self(other.dom), self(other.cod), result))
+            return result
         assert_isinstance(other, Arrow)
         result = self.cod.ar.id(self(other.dom))
-        for box in other.inside:
-            result = result >> self(box)
+        images = [self._image(box) for box in other.inside]
+        if isinstance(result, Arrow):  # We compose all the images at once.
+            with trusted():  # The images compose by functoriality.
+                return result.then(*images)
+        for image in images:
+            result = result >> image
         return result
 
 
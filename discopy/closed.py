@@ -53,6 +53,8 @@ Axioms
 
 from __future__ import annotations
 
+from functools import cached_property
+
 from discopy import cat, monoidal
 from discopy.cat import Category, factory
 from discopy.utils import (
@@ -122,7 +124,11 @@ class Exp(Ty, cat.Ob):
         return isinstance(other, Ty) and other.inside == (self, )
 
     def __hash__(self):
-        return hash(repr(self))
+        return self._hash
+
+    @cached_property
+    def _hash(self) -> int:
+        return hash((self.base, self.exponent))
 
     def __str__(self):
         return f"({self.base} ** {self.exponent})"
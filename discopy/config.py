@@ -4,6 +4,10 @@
 
 DEFAULT_BACKEND = 'numpy'
 NUMPY_THRESHOLD = 16
+DEBUG = False  # Whether to check arrows built in a cat.trusted context.
+CONTRACTION_CACHE_SIZE = 1024  # The number of contraction paths to cache.
+MAX_OPTIMAL_OPERANDS = 8  # Above which contraction paths are greedy.
+SPARSE_THRESHOLD = .1  # The fill above which sparse arrays become dense.
 IGNORE_WARNINGS = [
     "No GPU/TPU found, falling back to CPU.",
     "Casting complex values to real discards the imaginary part"]
@@ -35,11 +35,6 @@ from abc import ABC, abstractmethod
 from math import sqrt
 from tempfile import NamedTemporaryFile, TemporaryDirectory
 
-import matplotlib.pyplot as plt
-from PIL import Image
-from matplotlib.patches import PathPatch
-from matplotlib.path import Path
-
 from discopy.utils import assert_isinstance
 
 # Mapping from attribute to function from box to default value.
@@ -461,6 +456,7 @@ class TikzBackend(Backend):
 class MatBackend(Backend):
     """ Matplotlib drawing backend. """
     def __init__(self, axis=None, figsize=None, linewidth=1):
+        import matplotlib.pyplot as plt
         self.axis = axis or plt.subplots(figsize=figsize, facecolor='white')[1]
         self.linewidth = linewidth
         super().__init__()
@@ -480,6 +476,8 @@ class MatBackend(Backend):
         super().draw_node(i, j, **params)
 
     def draw_polygon(self, *points, color=DEFAULT["color"]):
+        from matplotlib.patches import PathPatch
+        from matplotlib.path import Path
         codes = [Path.MOVETO]
         codes += len(points[1:]) * [Path.LINETO] + [Path.CLOSEPOLY]
         path = Path(points + points[:1], codes)
@@ -489,6 +487,8 @@ class MatBackend(Backend):
 
     def draw_wire(self, source, target,
                   bend_out=False, bend_in=False, style=None):
+        from matplotlib.patches import PathPatch
+        from matplotlib.path import Path
         if style == '->':  # pragma: no cover
             self.axis.arrow(
                 *(source + (target[0] - source[0], target[1] - source[1])),
@@ -521,6 +521,7 @@ class MatBackend(Backend):
         super().draw_spiders(graph, positions, draw_box_labels)
 
     def output(self, path=None, show=True, **params):
+        import matplotlib.pyplot as plt
         xlim, ylim = params.get("xlim", None), params.get("ylim", None)
         margins = params.get("margins", DEFAULT['margins'])
         aspect = params.get("aspect", DEFAULT['aspect'])
@@ -764,6 +765,7 @@ def to_gif(diagram, *diagrams, **params):  # pragma: no cover
     params : any, optional
         Passed to :meth:`Diagram.draw`.
     """
+    from PIL import Image
     path = params.pop("path", None)
     timestep = params.get("timestep", 500)
     loop = params.get("loop", False)
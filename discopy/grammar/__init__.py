@@ -2,7 +2,22 @@
 
 """
 DisCopy's grammar modules: thue, cfg, categorial, pregroup and dependency.
+
+The modules are imported lazily, i.e. when one of their names is accessed.
 """
 
-from discopy.grammar import thue, cfg, categorial, pregroup, dependency
-from discopy.grammar.thue import Word, Rule
+from discopy.utils import lazy_import
+
+ATTRIBUTES = {
+    "thue": "thue",
+    "cfg": "cfg",
+    "categorial": "categorial",
+    "pregroup": "pregroup",
+    "dependency": "dependency",
+    "Word": "thue",
+    "Rule": "thue",
+}
+
+__all__ = list(ATTRIBUTES)
+
+__getattr__, __dir__ = lazy_import(__name__, ATTRIBUTES)
@@ -37,7 +37,7 @@ The axioms of multicategories (aka operads) hold on the nose.
 
 from __future__ import annotations
 
-from discopy import monoidal
+from discopy import cat, monoidal
 from discopy.cat import factory, Category, Functor, AxiomError
 from discopy.grammar import thue
 from discopy.monoidal import Ty, assert_isatomic
@@ -112,10 +112,11 @@ class Tree:
         >>> f = Rule(x @ x, x, name='f')
         >>> tree = f(f(f, f), f)
         >>> print(tree.to_diagram().foliation())
-        f @ f @ x @ x >> f @ f >> f
+        f @ f @ f >> f @ x >> f
         """
-        return self.root.to_diagram()\
-            << monoidal.Id().tensor(*[t.to_diagram() for t in self.branches])
+        branches = [t.to_diagram() for t in self.branches]
+        with cat.trusted():  # Trees are checked upon construction.
+            return self.root.to_diagram() << monoidal.Id().tensor(*branches)
 
     @staticmethod
     def from_nltk(tree: nltk.Tree, lexicalised=True, word_types=False) -> Tree:
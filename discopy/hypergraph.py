@@ -128,9 +128,6 @@ from __future__ import annotations
 
 import random
 
-import matplotlib.pyplot as plt
-from networkx import Graph, connected_components, spring_layout, draw_networkx
-
 from discopy import cat, monoidal, drawing, frobenius
 from discopy.braided import BinaryBoxConstructor
 from discopy.cat import AxiomError, Composable
@@ -163,6 +160,7 @@ def pushout(
     """
     if len(left_boundary) != len(right_boundary):
         raise ValueError
+    from networkx import Graph, connected_components
     components, left_pushout, right_pushout = set(), dict(), dict()
     left_proper = sorted(set(range(left)) - set(left_boundary))
     left_pushout.update({j: i for i, j in enumerate(left_proper)})
@@ -697,6 +695,7 @@ class Diagram(Composable[Ty], Whiskerable):
         >>> print(x @ Swap(x, x) >> v[::-1] @ x)
         x @ Swap(x, x) >> v[::-1] @ x
         """
+        from networkx import Graph
         diagram = self.make_progressive()
         graph = Graph()
         graph.add_nodes_from(diagram.ports)
@@ -731,6 +730,7 @@ class Diagram(Composable[Ty], Whiskerable):
 
     def spring_layout(self, seed=None, k=None):
         """ Computes planar position using a force-directed layout. """
+        from networkx import Graph, spring_layout
         if seed is not None:
             random.seed(seed)
         height = len(self.boxes) + self.n_spiders
@@ -795,6 +795,8 @@ class Diagram(Composable[Ty], Whiskerable):
         .. image:: /_static/hypergraph/diagram.png
             :align: center
         """
+        import matplotlib.pyplot as plt
+        from networkx import draw_networkx
         graph, pos = self.spring_layout(seed=seed, k=k)
         for i, (dom_wires, cod_wires) in enumerate(self.box_wires):
             box_node = Node("box", i=i)
@@ -15,6 +15,7 @@ Summary
     JAX
     PyTorch
     TensorFlow
+    Sparse
 
 .. admonition:: Functions
 
@@ -158,6 +159,22 @@ class Matrix(Composable[int], Whiskerable):
         with backend() as np:
             self.array = np.array(array, dtype=self.dtype).reshape((dom, cod))
 
+    @classmethod
+    def _wrap(cls, array, dom: int, cod: int) -> Matrix:
+        """
+        Wrap a backend array in a matrix without copying it, unless it needs
+        a different data type, the reshaping being a view whenever possible.
+
+        This is for arrays computed internally and not shared with the user:
+        unlike :meth:`__init__`, the result may alias the given ``array``.
+        """
+        result = cls.__new__(cls)
+        result.dom, result.cod = dom, cod
+        with backend() as np:
+            result.array = np.asarray(array, dtype=cls.dtype).reshape(
+                (dom, cod))
+        return result
+
     def __eq__(self, other):
         return isinstance(other, self.factory)\
             and self.dtype == other.dtype\
@@ -216,7 +233,7 @@ class Matrix(Composable[int], Whiskerable):
             return monoidal.Diagram.tensor(self, other, *others)
         assert_isinstance(other, type(self))
         dom, cod = self.dom + other.dom, self.cod + other.cod
-        array = Matrix.zero(dom, cod).array
+        array = self.zero(dom, cod).array
         array[:self.dom, :self.cod] = self.array
         array[self.dom:, self.cod:] = other.array
         return type(self)(array, dom, cod)
@@ -372,8 +389,9 @@ def array2string(array, **params):
 
 
 class Backend:
-    def __init__(self, module, array=None):
+    def __init__(self, module, array=None, asarray=None):
         self.module, self.array = module, array or module.array
+        self.asarray = asarray or module.asarray
 
     def __getattr__(self, attr):
         return getattr(self.module, attr)
@@ -394,7 +412,8 @@ class JAX(Backend):
 class PyTorch(Backend):
     def __init__(self):
         import torch
-        super().__init__(torch, array=torch.as_tensor)
+        super().__init__(
+            torch, array=torch.as_tensor, asarray=torch.as_tensor)
 
 
 class TensorFlow(Backend):
@@ -405,6 +424,12 @@ class TensorFlow(Backend):
         super().__init__(tnp)
 
 
+class Sparse(Backend):
+    def __init__(self):
+        from discopy import sparse
+        super().__init__(sparse)
+
+
 BACKENDS = {
     'np': NumPy,
     'numpy': NumPy,
@@ -413,6 +438,7 @@ BACKENDS = {
     'pytorch': PyTorch,
     'torch': PyTorch,
     'tensorflow': TensorFlow,
+    'sparse': Sparse,
 }
 
 
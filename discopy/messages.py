@@ -6,6 +6,7 @@ discopy error messages.
 
 TYPE_ERROR = "Expected {}, got {} instead."
 NOT_COMPOSABLE = "{} does not compose with {}: {} != {}."
+WRONG_IMAGE = "Expected the image of {} to go from {} to {}, got {} instead."
 NOT_PARALLEL = "Expected parallel arrows, got {} and {} instead."
 NOT_ATOMIC = "Expected {} of length 1, got length {} instead."
 NOT_CONNECTED = "{} is not boundary-connected."
@@ -27,3 +28,12 @@ INTERCHANGER_ERROR = "Boxes {} and {} do not commute."
 WRONG_PERMUTATION = "Expected a permutation of length {}, got {}."
 ZERO_DISTANCE_CONTROLLED = "Zero-distance controlled gates are ill-defined."
 HAS_NO_ATTRIBUTE = "{!r} object has no attribute {!r}"
+UNKNOWN_OPTIMIZE = "Expected 'greedy', 'optimal' or 'auto', got {!r} instead."
+WRONG_PARAMETERS = "Expected a vector of {} parameters, got {} instead."
+BATCH_MISMATCH = "Expected tensors with the same batch size, got {} and {}."
+MAX_SIZE_EXCEEDED = "Cannot slice the contraction to intermediates of at "\
+                    "most {} entries, the smallest peak is {}."
+UNKNOWN_SIMULATOR = "Expected a pytket backend or one of {}, got {!r} instead."
+MIXED_SIMULATION = "Cannot simulate mixed circuits with the {!r} simulator."
+UNSUPPORTED_SIMULATION = "Cannot simulate {!r} with the {!r} simulator."
+UNSUPPORTED_PARAMS = "Cannot sample with numpy given {}, use a backend."
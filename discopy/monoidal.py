@@ -18,6 +18,7 @@ Summary
     Box
     Sum
     Bubble
+    PackedDiagram
     Category
     Functor
     Whiskerable
@@ -54,6 +55,7 @@ from __future__ import annotations
 
 import itertools
 from abc import ABC, abstractmethod
+from functools import cached_property
 from typing import Iterator
 
 from discopy import cat, drawing, messages
@@ -97,11 +99,20 @@ class Ty(cat.Ob):
     __ambiguous_inheritance__ = True
 
     def __init__(self, *inside: str | cat.Ob):
+        if cat._is_trusted():  # The objects inside are already checked.
+            self.inside = tuple(
+                self.ob_factory(x) if isinstance(x, str) else x
+                for x in inside)
+            return
         for obj in inside:
             assert_isinstance(obj, (str, self.ob_factory))
         self.inside = tuple(
             self.ob_factory(x) if isinstance(x, str) else x for x in inside)
-        super().__init__(str(self))
+
+    @property
+    def name(self) -> str:
+        """ The name of a type, computed on the fly from its objects. """
+        return str(self)
 
     def tensor(self, *others: Ty) -> Ty:
         """
@@ -124,7 +135,8 @@ class Ty(cat.Ob):
             assert_isinstance(self, other.factory)
             assert_isinstance(other, self.factory)
         inside = self.inside + tuple(x for t in others for x in t.inside)
-        return self.factory(*inside)
+        with cat.trusted():
+            return self.factory(*inside)
 
     def count(self, obj: cat.Ob) -> int:
         """
@@ -160,7 +172,12 @@ class Ty(cat.Ob):
         return isinstance(other, self.factory) and self.inside == other.inside
 
     def __hash__(self):
-        return hash(repr(self))
+        return self._hash
+
+    @cached_property
+    def _hash(self) -> int:
+        # Atomic types have the same hash as the object inside.
+        return hash(self.inside[0]) if len(self) == 1 else hash(self.inside)
 
     def __repr__(self):
         return factory_name(type(self))\
@@ -260,7 +277,7 @@ class PRO(Ty):
         return isinstance(other, self.factory) and self.n == other.n
 
     def __hash__(self):
-        return hash(repr(self))
+        return self._hash
 
     def __pow__(self, n_times):
         return self.factory(n_times * self.n)
@@ -315,6 +332,14 @@ class Layer(cat.Box):
     def __eq__(self, other):
         return isinstance(other, type(self)) and tuple(self) == tuple(other)
 
+    def __hash__(self):
+        return self._box_hash
+
+    @cached_property
+    def _box_hash(self) -> int:
+        return hash(tuple(
+            x._box_hash if i % 2 else x for i, x in enumerate(self)))
+
     def __repr__(self):
         return factory_name(type(self))\
             + f"({', '.join(map(repr, self))})"
@@ -497,8 +522,9 @@ class Diagram(cat.Arrow, Whiskerable):
 
     def __init__(
             self, inside: tuple[Layer, ...], dom: Ty, cod: Ty, _scan=True):
-        for layer in inside:
-            assert_isinstance(layer, Layer)
+        if _scan and not cat._is_trusted():
+            for layer in inside:
+                assert_isinstance(layer, Layer)
         super().__init__(inside, dom, cod, _scan=_scan)
 
     def tensor(self, other: Diagram = None, *others: Diagram) -> Diagram:
@@ -595,13 +621,33 @@ class Diagram(cat.Arrow, Whiskerable):
         Parameters:
             dom : The domain of the diagram.
             boxes_and_offsets : The boxes and offsets of the diagram.
+
+        Note
+        ----
+        Each layer is composable with the previous one by construction, so we
+        only need to check the domain of each box against the wires it is
+        plugged into, this is skipped in a :func:`cat.trusted` context.
+
+        >>> x, y = Ty('x'), Ty('y')
+        >>> f = Box('f', x, y)
+        >>> Diagram.decode(x @ x, [(f, 0), (f, 0)])
+        Traceback (most recent call last):
+        ...
+        discopy.cat.AxiomError: f @ x does not compose with f @ x: \
+y @ x != x @ x.
         """
-        diagram = cls.id(dom)
+        dom = cls.id(dom).dom
+        inside, cod = [], dom
         for box, offset in boxes_and_offsets:
-            left = diagram.cod[:offset]
-            right = diagram.cod[offset + len(box.dom):]
-            diagram = diagram >> left @ box @ right
-        return diagram
+            left, right = cod[:offset], cod[offset + len(box.dom):]
+            layer = cls.layer_factory(left, box, right)
+            if not cat._is_trusted()\
+                    and cod[offset:offset + len(box.dom)] != box.dom:
+                assert_iscomposable(
+                    inside[-1] if inside else cls.id(dom), layer)
+            inside.append(layer)
+            cod = left @ box.cod @ right
+        return cls(tuple(inside), dom, cod, _scan=False)
 
     def to_drawing(self):
         """ Called before :meth:`Diagram.draw`. """
@@ -625,10 +671,85 @@ class Diagram(cat.Arrow, Whiskerable):
         """
         return Functor.id(Category(self.ty_factory, self.factory))(self)
 
-    def foliation(self):
+    def _wiring(self) -> tuple[list, ...]:
+        """
+        Scan the diagram once to compute its wires and the dependencies
+        between its boxes, used by :meth:`Diagram.foliation`.
+
+        Returns:
+            The type and the rank from left to right of each wire, the wires
+            consumed and produced by each box, the boxes that each box depends
+            on and its level, i.e. the length of the longest chain of boxes it
+            depends on.
+
+        Note
+        ----
+        A box with no output leaves a scar, i.e. a wire with type :code:`None`
+        which is consumed by any box that it lies strictly inside of. Each wire
+        also records the box that opened the gap on its right, if any. A box
+        with no input may slide past scars, so it goes in the earliest gap
+        between the wires on either side of it, the rightmost one if tied.
+        """
+        types, producers, openers, successors = [], [], [], {None: None}
+        inputs, outputs, parents, levels = [], [], [], []
+
+        def new_wires(producer, types_and_openers, left):
+            result = []
+            for typ, opener in types_and_openers:
+                types.append(typ)
+                producers.append(producer)
+                openers.append(opener)
+                wire = len(types) - 1
+                successors[left], successors[wire] = wire, successors[left]
+                left = wire
+                result.append(wire)
+            return result
+
+        def level_of(box):
+            return 0 if box is None else levels[box]
+
+        row = new_wires(None, (
+            (self.dom[i:i + 1], None) for i in range(len(self.dom))), None)
+        for i, (box, offset) in enumerate(zip(self.boxes, self.offsets)):
+            wires = [
+                j for j, wire in enumerate(row) if types[wire] is not None]
+            start = wires[offset] if offset < len(wires) else len(row)
+            stop = wires[offset + len(box.dom) - 1] + 1 if box.dom else start
+            inside = row[start:stop]
+            if inside:
+                left, opener = inside[-1], openers[inside[-1]]
+                dependencies = {producers[wire] for wire in inside}
+            else:  # Slide past the scars up to the wire on the left.
+                start = stop = 1 + min(
+                    range(max((j for j in wires if j < start), default=-1),
+                          start),
+                    key=lambda j: (
+                        level_of(openers[row[j]] if j >= 0 else None), -j))
+                left = row[start - 1] if start else None
+                opener = None if left is None else openers[left]
+                dependencies = {opener}
+            cod = [box.cod[j:j + 1] for j in range(len(box.cod))] or [None]
+            inputs.append(inside)
+            outputs.append(new_wires(i, (
+                (typ, i if j + 1 < len(cod) else opener)
+                for j, typ in enumerate(cod)), left))
+            dependencies.discard(None)
+            parents.append(dependencies)
+            levels.append(1 + max(map(level_of, dependencies), default=0))
+            row[start:stop] = outputs[-1]
+        ranks, wire = len(types) * [0], successors[None]
+        for rank in range(len(types)):
+            ranks[wire], wire = rank, successors[wire]
+        return types, ranks, inputs, outputs, parents, levels
+
+    def foliation(self, left=True) -> Diagram:
         """
         Merges layers together to reduce the length of a diagram.
 
+        Parameters:
+            left : Whether to pack boxes to the left, i.e. as early as
+                   possible, or to the right, i.e. as late as possible.
+
         Example
         -------
         >>> from discopy.monoidal import *
@@ -638,33 +759,73 @@ class Diagram(cat.Arrow, Whiskerable):
         >>> print(diagram)
         f0 @ y >> f0[::-1] @ y >> x @ f1
         >>> print(diagram.foliation())
+        f0 @ f1 >> f0[::-1] @ x
+        >>> print(diagram.foliation(left=False))
         f0 @ y >> f0[::-1] @ f1
 
         Note
         ----
-        If one defines a foliation as a sequence of unmergeable layers, there
-        may exist many distinct foliations for the same diagram. This method
-        scans top to bottom and merges layers eagerly.
+        The boxes of the diagram form a directed acyclic graph, where each box
+        depends on the boxes it cannot be interchanged with. Each layer of the
+        foliation contains the boxes of the same level, i.e. at the same
+        distance from the domain (or from the codomain, packing right).
+
+        Boxes with no inputs or no outputs may be interchanged either side of
+        each other, we break the tie by placing each box with no input in the
+        gap opened the earliest, then the latest one on the right. As this
+        depends on the direction of the scan, we scan the diagram both ways
+        and keep the shortest foliation.
         """
-        while len(self) > 1:
-            keep_on_going = False
-            for i, (first, second) in enumerate(zip(
-                    self.inside, self.inside[1:])):
-                try:
-                    inside = self.inside[:i] + (first.merge(second), )\
-                        + self.inside[i + 2:]
-                    self = self.factory(inside, self.dom, self.cod)
-                    keep_on_going = True
-                    break
-                except cat.AxiomError:
-                    continue
-            if not keep_on_going:
-                break
-        return self
-
-    def depth(self):
+        wiring, flipped = self._wiring(), self[::-1]._wiring()
+        if max(flipped[-1], default=0) < max(wiring[-1], default=0):
+            return self[::-1]._foliate(flipped, not left)[::-1]
+        return self._foliate(wiring, left)
+
+    def _foliate(self, wiring: tuple[list, ...], left: bool) -> Diagram:
+        """ Builds the layers of a foliation from the wiring of a diagram. """
+        types, ranks, inputs, outputs, parents, levels = wiring
+        if not left:
+            depth, heights = max(levels, default=0), len(levels) * [0]
+            for i in reversed(range(len(levels))):
+                for j in parents[i]:
+                    heights[j] = max(heights[j], heights[i] + 1)
+            levels = [depth - height for height in heights]
+
+        def rank(item):
+            """ The rank of a wire or the first wire around a box. """
+            return ranks[item] if item >= 0\
+                else ranks[(inputs[~item] or outputs[~item])[0]]
+
+        layer_of, boxes = {}, self.boxes
+        for i, level in enumerate(levels):
+            layer_of.setdefault(level, []).append(i)
+        row, inside = list(range(len(self.dom))), []
+        for level in sorted(layer_of):
+            for i in layer_of[level]:
+                if inputs[i]:
+                    start = row.index(inputs[i][0])
+                    stop = row.index(inputs[i][-1]) + 1
+                    row[start:stop] = [~i]
+                else:
+                    row.insert(next((
+                        j for j, item in enumerate(row)
+                        if rank(item) > rank(~i)), len(row)), ~i)
+            boxes_or_types, typ = [], []
+            for item in row:
+                if item < 0:
+                    boxes_or_types += [self.dom[:0].tensor(*typ), boxes[~item]]
+                    typ = []
+                elif types[item] is not None:
+                    typ.append(types[item])
+            boxes_or_types.append(self.dom[:0].tensor(*typ))
+            inside.append(self.layer_factory(*boxes_or_types))
+            row = [wire for item in row
+                   for wire in (outputs[~item] if item < 0 else [item])]
+        return self.factory(tuple(inside), self.dom, self.cod, _scan=False)
+
+    def depth(self) -> int:
         """
-        Computes (an upper bound to) the depth of a diagram by foliating it.
+        Computes the depth of a diagram, i.e. the length of its foliation.
 
         Example
         -------
@@ -675,13 +836,17 @@ class Diagram(cat.Arrow, Whiskerable):
         >>> assert f.depth() == 1
         >>> assert (f @ g).depth() == 1
         >>> assert (f >> g).depth() == 2
+        >>> assert (f @ x >> g @ x >> x @ f >> x @ g).depth() == 2
 
         Note
         ----
         The depth of a diagram is the minimum length over all its foliations,
-        this method just returns the length of :meth:`Diagram.foliation`.
+        i.e. the length of the longest chain of boxes which cannot be
+        interchanged. It is computed by scanning the diagram both ways,
+        without building layers.
         """
-        return len(self.foliation())
+        return min(max(self._wiring()[-1], default=0),
+                   max(self[::-1]._wiring()[-1], default=0))
 
     def interchange(self, i: int, j: int, left=False) -> Diagram:
         """
@@ -743,7 +908,40 @@ class Diagram(cat.Arrow, Whiskerable):
             layer1 = left0 @ box0.dom @ middle @ box1 @ right1
         else:
             raise AxiomError(messages.INTERCHANGER_ERROR.format(box0, box1))
-        return self[:i] >> layer1 >> layer0 >> self[i + 2:]
+        with cat.trusted():
+            return self[:i] >> layer1 >> layer0 >> self[i + 2:]
+
+    def _interchanges(self, left=False) -> Iterator[tuple[int, list, list]]:
+        """
+        The interchanges applied by :meth:`Diagram.normalize`, computed in
+        place on a list of boxes and a list of offsets.
+
+        Parameters:
+            left : Passed to :meth:`Diagram.interchange`.
+
+        Returns:
+            A generator of triples :code:`(i, boxes, offsets)` where the boxes
+            and offsets after interchanging layers :code:`i` and :code:`i + 1`
+            are updated in place.
+        """
+        boxes, offsets = self.boxes, self.offsets
+        while True:
+            no_more_moves = True
+            for i in range(len(boxes) - 1):
+                box0, box1 = boxes[i], boxes[i + 1]
+                off0, off1 = offsets[i], offsets[i + 1]
+                if left and off1 >= off0 + len(box0.cod):
+                    off1 = off1 - len(box0.cod) + len(box0.dom)
+                elif not left and off0 >= off1 + len(box1.dom):
+                    off0 = off0 - len(box1.dom) + len(box1.cod)
+                else:
+                    continue
+                boxes[i], boxes[i + 1] = box1, box0
+                offsets[i], offsets[i + 1] = off1, off0
+                yield i, boxes, offsets
+                no_more_moves = False
+            if no_more_moves:
+                break
 
     def normalize(self, left=False) -> Iterator[Diagram]:
         """
@@ -764,18 +962,9 @@ class Diagram(cat.Arrow, Whiskerable):
         s1 >> s0
         """
         diagram = self
-        while True:
-            no_more_moves = True
-            for i in range(len(diagram) - 1):
-                box0, box1 = diagram.boxes[i], diagram.boxes[i + 1]
-                off0, off1 = diagram.offsets[i], diagram.offsets[i + 1]
-                if left and off1 >= off0 + len(box0.cod)\
-                        or not left and off0 >= off1 + len(box1.dom):
-                    diagram = diagram.interchange(i, i + 1, left=left)
-                    yield diagram
-                    no_more_moves = False
-            if no_more_moves:
-                break
+        for i, _, _ in self._interchanges(left=left):
+            diagram = diagram.interchange(i, i + 1, left=left)
+            yield diagram
 
     def normal_form(self, **params) -> Diagram:
         """
@@ -788,7 +977,26 @@ class Diagram(cat.Arrow, Whiskerable):
         NotImplementedError
             Whenever ``normalize`` yields the same rewrite steps twice, e.g.
             the diagram is not boundary-connected.
+
+        Note
+        ----
+        Unless :meth:`Diagram.normalize` is overriden, the interchanges are
+        applied in place to a list of boxes and offsets and the diagram is
+        built only once at the end. Repeated steps are detected with the
+        rolling hash of each step, then compared with the boxes and offsets
+        of the previous steps with the same hash.
+
+        Example
+        -------
+        >>> x = Ty('x')
+        >>> f, g = Box('f', x, x), Box('g', x, x)
+        >>> print((f @ g).normal_form())
+        f @ x >> x @ g
+        >>> print((f @ g).normal_form(left=True))
+        x @ g >> f @ x
         """
+        if type(self).normalize is Diagram.normalize:
+            return self._normal_form(**params)
         cache = set()
         for diagram in itertools.chain([self], self.normalize(**params)):
             if diagram in cache:
@@ -799,6 +1007,41 @@ class Diagram(cat.Arrow, Whiskerable):
             cache.add(diagram)
         return diagram
 
+    def _normal_form(self, left=False) -> Diagram:
+        """
+        The normal form of a diagram, computed in place with the interchanges
+        of :meth:`Diagram._interchanges`, called by :meth:`normal_form`.
+
+        Parameters:
+            left : Passed to :meth:`Diagram.interchange`.
+        """
+        boxes, offsets = self.boxes, self.offsets
+        powers = list(itertools.accumulate(
+            len(boxes) * [cat.HASH_BASE],
+            lambda x, y: x * y % cat.HASH_MODULUS, initial=1))
+        digests = [hash(pair) for pair in zip(boxes, offsets)]
+        fingerprint = sum(
+            digest * power for digest, power in zip(digests, powers)
+        ) % cat.HASH_MODULUS
+        cache = {fingerprint: [(tuple(boxes), tuple(offsets))]}
+        for i, boxes, offsets in self._interchanges(left=left):
+            old = digests[i] * powers[i] + digests[i + 1] * powers[i + 1]
+            digests[i:i + 2] = map(hash, zip(boxes[i:i + 2], offsets[i:i + 2]))
+            new = digests[i] * powers[i] + digests[i + 1] * powers[i + 1]
+            fingerprint = (fingerprint - old + new) % cat.HASH_MODULUS
+            step = (tuple(boxes), tuple(offsets))
+            # Steps with the same hash are compared, in case of a collision.
+            if step in cache.get(fingerprint, ()):
+                exception = NotImplementedError(
+                    messages.NOT_CONNECTED.format(self))
+                with cat.trusted():
+                    exception.last_step = self.factory.decode(
+                        self.dom, zip(boxes, offsets))
+                raise exception
+            cache.setdefault(fingerprint, []).append(step)
+        with cat.trusted():
+            return self.factory.decode(self.dom, zip(boxes, offsets))
+
 
 class Box(cat.Box, Diagram):
     """
@@ -864,7 +1107,7 @@ class Box(cat.Box, Diagram):
             and other.inside == (self.layer_factory.cast(self), )
 
     def __hash__(self):
-        return hash(repr(self))
+        return self._hash
 
 
 class Sum(cat.Sum, Box):
@@ -940,6 +1183,274 @@ class Bubble(cat.Bubble, Box):
         return _open >> left @ self.arg.to_drawing() @ right >> _close
 
 
+class PackedDiagram(cat.Composable, Whiskerable):
+    """
+    A packed diagram is a table of distinct :code:`boxes` with two integer
+    arrays, the :code:`indices` in the table and the :code:`offsets` of the
+    box in each layer, together with a domain.
+
+    Parameters:
+        dom : The domain of the packed diagram.
+        table : The distinct boxes of the packed diagram.
+        indices : The index in the table of the box in each layer.
+        offsets : The offset of the box in each layer.
+        cod : The codomain, computed from the layers if :code:`None`.
+        factory : The type of diagram to unpack into.
+
+    Note
+    ----
+    Packed diagrams never construct layers, thus slicing, dagger, tensor
+    and composition are computed with array operations. They can be drawn
+    and evaluated by :class:`tensor.Functor` without unpacking.
+
+    Example
+    -------
+    >>> x, y = Ty('x'), Ty('y')
+    >>> f, g = Box('f', x, y), Box('g', y @ y, x)
+    >>> diagram = f @ f >> g
+    >>> packed = diagram.to_packed()
+    >>> assert packed.table == (f, g)
+    >>> print(packed.indices, packed.offsets)
+    [0 0 1] [0 1 0]
+    >>> assert packed.cod == x and packed.to_diagram() == diagram
+    >>> assert packed[1:].to_diagram() == diagram[1:]
+    >>> assert packed[::-1].to_diagram() == diagram[::-1]
+    >>> assert (packed @ packed >> packed[::-1] @ x).to_diagram()\\
+    ...     == diagram @ diagram >> diagram[::-1] @ x
+    """
+    def __init__(self, dom: Ty, table: tuple[Box, ...], indices, offsets,
+                 cod: Ty = None, factory: type = None):
+        import numpy
+        self.factory = factory or Diagram
+        self.dom, self.table = dom, tuple(table)
+        self.indices = numpy.asarray(indices, dtype=int)
+        self.offsets = numpy.asarray(offsets, dtype=int)
+        if self.indices.shape != self.offsets.shape:
+            raise ValueError(
+                f"Expected as many indices as offsets, got "
+                f"{len(self.indices)} and {len(self.offsets)} instead.")
+        if cod is not None:
+            self.cod = cod
+
+    @cached_property
+    def cod(self) -> Ty:
+        """ The codomain of the packed diagram. """
+        return self._types[-1]
+
+    @property
+    def boxes(self) -> list[Box]:
+        """ The boxes in each layer of the packed diagram. """
+        return [self.table[i] for i in self.indices.tolist()]
+
+    @property
+    def width(self) -> int:
+        """
+        The width of a packed diagram, i.e. the maximum number of wires.
+
+        Example
+        -------
+        >>> x = Ty('x')
+        >>> f = Box('f', x, x ** 4)
+        >>> diagram = f @ x ** 2 >> x ** 2 @ f.dagger()
+        >>> assert diagram.to_packed().width == diagram.width == 6
+        """
+        import numpy
+        growth = numpy.array(
+            [len(box.cod) - len(box.dom) for box in self.table], dtype=int)
+        widths = len(self.dom) + numpy.cumsum(growth[self.indices])
+        return int(max(len(self.dom), widths.max(initial=0)))
+
+    @cached_property
+    def _types(self) -> list[Ty]:
+        """
+        The type of the wires before each layer then the codomain, scanned
+        only once for slicing and hashing, or taken from the layers when
+        packing a diagram.
+        """
+        typ, result = self.dom, [self.dom]
+        for i, off in zip(self.indices.tolist(), self.offsets.tolist()):
+            box = self.table[i]
+            typ = typ[:off] @ box.cod @ typ[off + len(box.dom):]
+            result.append(typ)
+        return result
+
+    @staticmethod
+    def from_diagram(diagram: Diagram) -> PackedDiagram:
+        """
+        Pack a diagram, called by :code:`Diagram.to_packed`.
+
+        Parameters:
+            diagram : The diagram to pack.
+        """
+        dom, boxes_and_offsets = diagram.encode()
+        table, indices = {}, []
+        for box, _ in boxes_and_offsets:
+            indices.append(table.setdefault(box, len(table)))
+        offsets = [offset for _, offset in boxes_and_offsets]
+        result = PackedDiagram(
+            dom, tuple(table), indices, offsets, diagram.cod, diagram.factory)
+        result._types = [dom] + [layer.cod for layer in diagram.inside]
+        return result
+
+    def encode(self) -> tuple[Ty, list[tuple[Box, int]]]:
+        """ Compact encoding as a domain with a list of boxes and offsets. """
+        return self.dom, list(zip(self.boxes, self.offsets.tolist()))
+
+    def to_diagram(self) -> Diagram:
+        """ Unpack into a diagram of type :code:`self.factory`. """
+        return self.factory.decode(*self.encode())
+
+    def to_drawing(self) -> PackedDiagram:
+        """ Called before :meth:`PackedDiagram.draw`. """
+        return PackedDiagram(
+            self.dom.to_drawing(), [box.to_drawing() for box in self.table],
+            self.indices, self.offsets, self.cod.to_drawing(), Diagram)
+
+    @classmethod
+    def id(cls, dom: Ty = None) -> PackedDiagram:
+        """
+        The identity packed diagram, with no layers.
+
+        Parameters:
+            dom : The domain (and codomain) of the identity.
+        """
+        dom = Ty() if dom is None else dom
+        return cls(dom, (), (), (), dom)
+
+    def _merge(self, *others: PackedDiagram) -> tuple[tuple, list]:
+        """ Merge the tables and re-index the layers of packed diagrams. """
+        import numpy
+        table, indices = {}, []
+        for packed in (self, ) + others:
+            index = numpy.array([
+                table.setdefault(box, len(table)) for box in packed.table],
+                dtype=int)
+            indices.append(index[packed.indices])
+        return tuple(table), indices
+
+    def then(self, *others: PackedDiagram) -> PackedDiagram:
+        """
+        Sequential composition, called using :code:`>>` and :code:`<<`.
+
+        Parameters:
+            others : The other packed diagrams to compose.
+
+        Raises:
+            cat.AxiomError : Whenever the packed diagrams do not compose.
+        """
+        import numpy
+        for left, right in zip((self, ) + others, others):
+            assert_isinstance(right, PackedDiagram)
+            assert_iscomposable(left, right)
+        table, indices = self._merge(*others)
+        offsets = [packed.offsets for packed in (self, ) + others]
+        cod = others[-1].cod if others else self.cod
+        result = PackedDiagram(
+            self.dom, table, numpy.concatenate(indices),
+            numpy.concatenate(offsets), cod, self.factory)
+        if all("_types" in vars(packed) for packed in (self, ) + others):
+            result._types = self._types + [
+                typ for packed in others for typ in packed._types[1:]]
+        return result
+
+    def tensor(self, other: PackedDiagram = None, *others: PackedDiagram
+               ) -> PackedDiagram:
+        """
+        Parallel composition, called using :code:`@`.
+
+        Parameters:
+            other : The other packed diagram to tensor.
+            others : More packed diagrams to tensor.
+
+        Note
+        ----
+        As for :meth:`Diagram.tensor`, the definition is biased to the left.
+        """
+        import numpy
+        if other is None:
+            return self
+        if others:
+            return self.tensor(other).tensor(*others)
+        assert_isinstance(other, PackedDiagram)
+        table, indices = self._merge(other)
+        offsets = (self.offsets, other.offsets + len(self.cod))
+        return PackedDiagram(
+            self.dom @ other.dom, table, numpy.concatenate(indices),
+            numpy.concatenate(offsets), self.cod @ other.cod, self.factory)
+
+    def dagger(self) -> PackedDiagram:
+        """ The dagger of a packed diagram, called with :code:`[::-1]`. """
+        result = PackedDiagram(
+            self.cod, [box.dagger() for box in self.table],
+            self.indices[::-1], self.offsets[::-1], self.dom, self.factory)
+        if "_types" in vars(self):
+            result._types = self._types[::-1]
+        return result
+
+    def __getitem__(self, key: int | slice) -> PackedDiagram:
+        if isinstance(key, slice):
+            if key.step == -1:
+                layers = range(len(self))[key]
+                start, stop = (layers[-1], layers[0] + 1) if layers else (
+                    key.indices(len(self))[0] + 1, ) * 2
+                return self[start:stop].dagger()
+            if (key.step or 1) != 1:
+                raise IndexError
+            start, stop, _ = key.indices(len(self))
+            stop = max(start, stop)
+            types = self._types[start:stop + 1]
+            result = PackedDiagram(
+                types[0], self.table, self.indices[start:stop],
+                self.offsets[start:stop], types[-1], self.factory)
+            result._types = types
+            return result
+        if isinstance(key, int):
+            if key < 0:
+                return self[len(self) + key]
+            if key >= len(self):
+                raise IndexError
+            return self[key:key + 1]
+        raise TypeError
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __eq__(self, other):
+        if isinstance(other, Diagram):
+            return self.to_diagram() == other
+        return isinstance(other, PackedDiagram)\
+            and (self.dom, self.cod) == (other.dom, other.cod)\
+            and self.offsets.tolist() == other.offsets.tolist()\
+            and self.boxes == other.boxes
+
+    def __hash__(self):
+        return self._hash
+
+    @cached_property
+    def _hash(self) -> int:
+        """
+        The same rolling hash as :class:`Diagram`, with the hash of each
+        layer computed from the types of :attr:`_types` without unpacking.
+        """
+        inside_hash = 0
+        for typ, i, off in zip(
+                self._types, self.indices.tolist(), self.offsets.tolist()):
+            box = self.table[i]
+            layer_hash = hash((
+                typ[:off], box._box_hash, typ[off + len(box.dom):]))
+            inside_hash = (inside_hash * cat.HASH_BASE + layer_hash)\
+                % cat.HASH_MODULUS
+        return hash((self.dom, self.cod, inside_hash))
+
+    def __repr__(self):
+        return factory_name(type(self)) + f"(dom={repr(self.dom)}, "\
+            f"table={repr(self.table)}, indices={self.indices.tolist()}, "\
+            f"offsets={self.offsets.tolist()})"
+
+    def __str__(self):
+        return str(self.to_diagram())
+
+
 class Category(cat.Category):
     """
     A monoidal category is a category with a method :code:`tensor`.
@@ -992,7 +1503,9 @@ class Functor(cat.Functor):
         if isinstance(other, PRO):
             return sum(other.n * [self.ob[other.factory(1)]], self.cod.ob())
         if isinstance(other, Ty):
-            return sum(map(self, other.inside), self.cod.ob())
+            images, unit = map(self._image, other.inside), self.cod.ob()
+            return unit.tensor(*images) if isinstance(unit, Ty)\
+                else sum(images, unit)
         if isinstance(other, cat.Ob):
             result = self.ob[self.dom.ob(other)]
             dtype = getattr(self.cod.ob, "__origin__", self.cod.ob)
@@ -1002,11 +1515,16 @@ class Functor(cat.Functor):
         if isinstance(other, Layer):
             head, *tail = other
             result = self(head)
-            for box_or_typ in tail:
-                result = result @ self(box_or_typ)
+            for i, box_or_typ in enumerate(tail):
+                result = result @ (
+                    self(box_or_typ) if i % 2 else self._image(box_or_typ))
             return result
         return super().__call__(other)
 
+    def _image(self, other: cat.Ob | Box):
+        return self(other) if isinstance(other, Layer)\
+            else super()._image(other)
+
 
 def assert_isatomic(typ: Ty, cls: type = None):
     cls = cls or type(typ)
@@ -1019,6 +1537,10 @@ def assert_isatomic(typ: Ty, cls: type = None):
 Diagram.draw = drawing.draw
 Diagram.to_gif = drawing.to_gif
 Diagram.to_grid = drawing.Grid.from_diagram
+Diagram.to_packed = PackedDiagram.from_diagram
+
+PackedDiagram.draw = drawing.draw
+PackedDiagram.to_gif = drawing.to_gif
 
 Diagram.sum_factory = Sum
 Diagram.bubble_factory = Bubble
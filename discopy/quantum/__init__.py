@@ -1,22 +1,38 @@
 # -*- coding: utf-8 -*-
 
 """
-DisCoPy quantum modules: channel, circuit, gates, tk and zx.
+DisCoPy quantum modules: channel, circuit, gates, simulation, tk and zx.
+
+The modules are imported lazily, i.e. when one of their names is accessed.
 """
 
-from discopy.quantum import circuit, gates, channel, ansatze, zx
-from discopy.quantum.ansatze import (
-    IQPansatz, Sim14ansatz, Sim15ansatz,
-)
-from discopy.quantum.channel import C, Q, CQ, Channel
-from discopy.quantum.circuit import (
-    bit, qubit, Ty, Digit, Qudit, Circuit, Id, Box, Sum, Swap,
-    Functor as CircuitFunctor,
-)
-from discopy.quantum.gates import (
-    Discard, MixedState, Measure, Encode,
-    SWAP, ClassicalGate, QuantumGate,
-    Controlled, Ket, Bra, Bits, Copy, Match,
-    Rx, Ry, Rz, CU1, CRz, CRx, CZ, CX,
-    X, Y, Z, H, S, T, scalar, sqrt,
-)
+from discopy.utils import lazy_import
+
+ATTRIBUTES = {
+    "circuit": "circuit",
+    "gates": "gates",
+    "channel": "channel",
+    "ansatze": "ansatze",
+    "zx": "zx",
+    "simulation": "simulation",
+    "StateVector": "simulation",
+    "DensityMatrix": "simulation",
+    "Stabilizer": "simulation",
+    "Tableau": "simulation",
+    **dict.fromkeys(("IQPansatz", "Sim14ansatz", "Sim15ansatz"), "ansatze"),
+    **dict.fromkeys(("C", "Q", "CQ", "Channel"), "channel"),
+    **dict.fromkeys((
+        "bit", "qubit", "Ty", "Digit", "Qudit", "Circuit", "Id", "Box", "Sum",
+        "Swap"), "circuit"),
+    "CircuitFunctor": "circuit.Functor",
+    **dict.fromkeys((
+        "Discard", "MixedState", "Measure", "Encode",
+        "SWAP", "ClassicalGate", "QuantumGate",
+        "Controlled", "Ket", "Bra", "Bits", "Copy", "Match",
+        "Rx", "Ry", "Rz", "CU1", "CRz", "CRx", "CZ", "CX",
+        "X", "Y", "Z", "H", "S", "T", "scalar", "sqrt"), "gates"),
+}
+
+__all__ = list(ATTRIBUTES)
+
+__getattr__, __dir__ = lazy_import(__name__, ATTRIBUTES)
@@ -43,15 +43,16 @@ Channel([0.5+0.j, 0.5+0.j, 0.5+0.j, 0.5+0.j], dom=CQ(), cod=Q(Dim(2)))
 
 from __future__ import annotations
 
-from discopy import frobenius, tensor
+from discopy import frobenius, rigid, tensor
 from discopy.cat import factory, Category
 from discopy.frobenius import Ty, Diagram, Box
 from discopy.matrix import backend
 from discopy.quantum.circuit import (
     Digit, Qudit)
-from discopy.quantum.gates import Discard, Measure, MixedState, Encode, Scalar
+from discopy.quantum.gates import (
+    Copy, Discard, Match, Measure, MixedState, Encode, Scalar)
 from discopy.tensor import Dim, Tensor
-from discopy.utils import assert_isinstance
+from discopy.utils import assert_isinstance, LazyMapping
 
 
 class CQ:
@@ -88,7 +89,7 @@ class CQ:
             and self.quantum == other.quantum
 
     def __hash__(self):
-        return hash(repr(self))
+        return hash((self.classical, self.quantum))
 
     def __repr__(self):
         return f"CQ(classical={self.classical}, quantum={self.quantum})"
@@ -163,9 +164,15 @@ class Channel(Tensor):
         super().__init__(array, dom.to_dim(), cod.to_dim())
         self.dom, self.cod = dom, cod
 
+    @classmethod
+    def _wrap(cls, array, dom: CQ, cod: CQ) -> Channel:
+        result = super()._wrap(array, dom.to_dim(), cod.to_dim())
+        result.dom, result.cod = dom, cod
+        return result
+
     def to_tensor(self) -> Tensor:
-        """ The underlying tensor of a channel. """
-        return Tensor[self.dtype](
+        """ The underlying tensor of a channel, sharing its array. """
+        return Tensor[self.dtype]._wrap(
             self.array, self.dom.to_dim(), self.cod.to_dim())
 
     @classmethod
@@ -178,10 +185,11 @@ class Channel(Tensor):
             return super().then(other, *others)
         assert_isinstance(other, type(self))
         array = (self.to_tensor() >> other.to_tensor()).array
-        return type(self)(array, self.dom, other.cod)
+        return type(self)._wrap(array, self.dom, other.cod)
 
     def dagger(self) -> Channel:
-        return type(self)(self.to_tensor().dagger().array, self.cod, self.dom)
+        return type(self)._wrap(
+            self.to_tensor().dagger().array, self.cod, self.dom)
 
     def tensor(self, other: Channel = None, *others: Channel) -> Channel:
         if other is None or others:
@@ -202,7 +210,8 @@ class Channel(Tensor):
                 for c, z in zip([0, 1], [self, other])},
             ar={f: self.to_tensor(), g: other.to_tensor()}, dtype=self.dtype
         )(above >> f @ g >> below).array
-        return type(self)(array, self.dom @ other.dom, self.cod @ other.cod)
+        return type(self)._wrap(
+            array, self.dom @ other.dom, self.cod @ other.cod)
 
     @classmethod
     def swap(cls, left, right) -> Channel:
@@ -311,6 +320,11 @@ class Functor(tensor.Functor):
             return C(Dim(other.dim))
         if isinstance(other, Qudit):
             return Q(Dim(other.dim))
+        if isinstance(other, Diagram) and not isinstance(other, Box)\
+                and not any(isinstance(box, (
+                    rigid.Cup, rigid.Cap, frobenius.Spider))
+                    for box in other.boxes):
+            return self._contract(other)
         if not isinstance(other, Box):
             return frobenius.Functor.__call__(self, other)
         if isinstance(other, Discard):
@@ -318,7 +332,8 @@ class Functor(tensor.Functor):
         if isinstance(other, Measure):
             measure = self.cod.ar.measure(
                 self(other.dom).quantum, destructive=other.destructive)
-            measure = measure @ self.cod.ar.discard(self(other.dom).classical)\
+            classical = C(self(other.dom).classical)
+            measure = measure @ self.cod.ar.discard(classical)\
                 if other.override_bits else measure
             return measure
         if isinstance(other, (MixedState, Encode)):
@@ -326,6 +341,8 @@ class Functor(tensor.Functor):
         if isinstance(other, Scalar):
             scalar = other.array if other.is_mixed else abs(other.array) ** 2
             return self.cod.ar(scalar, CQ(), CQ())
+        if not other.is_mixed and other.is_dagger:
+            return self(other.dagger()).dagger()
         if not other.is_mixed and other.is_classical:
             dom, cod = self(other.dom).classical, self(other.cod).classical
             return self.cod.ar.single(
@@ -337,3 +354,81 @@ class Functor(tensor.Functor):
         if hasattr(other, "array"):
             return self.cod.ar(other.array, self(other.dom), self(other.cod))
         return frobenius.Functor.__call__(self, other)
+
+    def _contract(self, diagram: Diagram) -> Channel:
+        plan, dom, cod = self._compile(diagram), self(diagram.dom), self(
+            diagram.cod)
+        images = LazyMapping(plan.boxes, lambda box: self._image(box).array)
+        return self.cod.ar._wrap(
+            plan(images, dtype=self.dtype).array, dom, cod)
+
+    def _compile(self, diagram: Diagram) -> tensor.Contraction:
+        """
+        Compile a diagram to one :class:`tensor.Contraction` with the axes of
+        each wire side by side, where swaps, measurements, encodings and
+        discards only merge and relabel indices.
+        """
+        wires = lambda typ: [self._image(x) for x in typ.inside]
+        plan = tensor.Contraction.from_diagram(
+            diagram, lambda typ: [x.to_dim() for x in wires(typ)],
+            self._delta)
+        inputs = tuple(
+            tuple(labels[i] for i in _regroup(wires(box.dom), wires(box.cod)))
+            for box, labels in zip(plan.boxes, plan.inputs))
+        output = tuple(plan.output[i] for i in _regroup(
+            wires(diagram.dom), wires(diagram.cod)))
+        dom, cod = self(diagram.dom), self(diagram.cod)
+        return tensor.Contraction(
+            plan.boxes, inputs + plan.inputs[len(plan.boxes):], output,
+            plan.sizes, dom.to_dim(), cod.to_dim())
+
+    def _delta(self, box: Box) -> tuple[tuple[int, ...], ...] | None:
+        """
+        The axes identified by a measurement, an encoding, a discard or the
+        copy and match of bits, as products of copy tensors, see
+        :meth:`tensor.Contraction.from_diagram`.
+        """
+        if isinstance(box, (Copy, Match)):
+            return (tuple(range(len(box.dom @ box.cod))), )
+        if isinstance(box, Encode) and (
+                not box.constructive or box.reset_bits):
+            return None
+        if isinstance(box, (Encode, MixedState)):
+            dom, cod = (sum(len(self(x).to_dim()) for x in typ.inside)
+                        for typ in (box.dom, box.cod))
+            return tuple(
+                tuple(i + dom if i < cod else i - cod for i in group)
+                for group in self._delta(box.dagger()))
+        if isinstance(box, Discard):
+            groups, offset = [], 0
+            for x in map(self, box.dom.inside):
+                c, q = len(x.classical), len(x.quantum)
+                groups += [(offset + i, ) for i in range(c)] + [
+                    (offset + c + i, offset + c + q + i) for i in range(q)]
+                offset += c + 2 * q
+            return tuple(groups)
+        if isinstance(box, Measure):
+            n = box.n_qubits
+            dom = 2 * n + n * box.override_bits
+            bits = dom + 2 * n * (not box.destructive)
+            return tuple((2 * i, 2 * i + 1) + (
+                () if box.destructive else (dom + 2 * i, dom + 2 * i + 1))
+                + (bits + i, ) for i in range(n)) + tuple(
+                    (2 * n + i, ) for i in range(n * box.override_bits))
+        return None
+
+
+def _regroup(dom: list[CQ], cod: list[CQ]) -> list[int]:
+    """
+    The position of each axis of a channel in the layout wire by wire, given
+    the classical-quantum dimension of each wire in its domain and codomain.
+    """
+    result, offset = [], 0
+    for wires in (dom, cod):
+        groups = ([], [], [])
+        for x in wires:
+            for group, dim in zip(groups, (x.classical, x.quantum, x.quantum)):
+                group.extend(range(offset, offset + len(dim)))
+                offset += len(dim)
+        result += sum(groups, [])
+    return result
@@ -70,7 +70,7 @@ Examples
 from __future__ import annotations
 
 from collections.abc import Mapping
-from math import pi
+from math import pi, prod
 
 from discopy import messages, rigid, tensor, frobenius
 from discopy.cat import factory, Category
@@ -198,6 +198,24 @@ class Circuit(tensor.Diagram):
                    for layer in self.inside)
         return both_bits_and_qubits or any(box.is_mixed for box in self.boxes)
 
+    @property
+    def is_clifford(self):
+        """
+        Whether the circuit is Clifford, i.e. it has only Clifford gates,
+        kets, bras, bits, measurements and discards.
+
+        The counts of Clifford circuits are sampled in polynomial time with a
+        :class:`discopy.quantum.simulation.Stabilizer` in :meth:`get_counts`.
+
+        Example
+        -------
+        >>> from discopy.quantum import Ket, H, T, CX, Measure, qubit
+        >>> assert (Ket(0, 0) >> H @ qubit >> CX >> Measure(2)).is_clifford
+        >>> assert not (Ket(0) >> H >> T >> Measure()).is_clifford
+        """
+        from discopy.quantum.simulation import Stabilizer
+        return all(map(Stabilizer.is_clifford, self.boxes))
+
     def init_and_discard(self):
         """ Returns a circuit with empty domain and only bits as codomain. """
         from discopy.quantum.gates import Bits, Ket, Discard
@@ -222,9 +240,12 @@ class Circuit(tensor.Diagram):
         ----------
         others : :class:`discopy.quantum.circuit.Circuit`
             Other circuits to process in batch.
-        backend : pytket.Backend, optional
+        backend : pytket.Backend | str, optional
             Backend on which to run the circuit, if none then we apply
-            :class:`discopy.tensor.Functor` or :class:`ChannelFunctor` instead.
+            :class:`discopy.tensor.Functor` or :class:`ChannelFunctor` instead,
+            if a string then the simulator of that name, e.g.
+            :code:`'statevector'` or :code:`'density_matrix'` for mixed
+            circuits, see :mod:`discopy.quantum.simulation`.
         mixed : bool, optional
             Whether to apply :class:`discopy.tensor.Functor`
             or :class:`ChannelFunctor`.
@@ -283,18 +304,11 @@ class Circuit(tensor.Diagram):
 
         from discopy.quantum import channel
         from discopy.quantum.gates import Bits
-        if backend is None:
+        if backend is None or isinstance(backend, str):
             if others:
-                return [circuit.eval(mixed=mixed, **params)
+                return [circuit.eval(backend=backend, mixed=mixed, **params)
                         for circuit in (self, ) + others]
-            if mixed or self.is_mixed:
-                return channel.Functor(
-                    {}, {}, dom=Category(Ty, Circuit), dtype=complex)(self)
-            return tensor.Functor(
-                lambda x: x.inside[0].dim,
-                lambda f: f.array,
-                dom=Category(Ty, Circuit),
-                dtype=complex)(self)
+            return self._simulator(mixed, backend)(self)
         circuits = [circuit.to_tk() for circuit in (self, ) + others]
         results, counts = [], circuits[0].get_counts(
             *circuits[1:], backend=backend, **params)
@@ -308,6 +322,57 @@ class Circuit(tensor.Diagram):
             results.append(result)
         return results if len(results) > 1 else results[0]
 
+    def _simulator(self, mixed=False, backend=None) -> tensor.Functor:
+        """ The functor with which to simulate the circuit with numpy. """
+        from discopy.quantum import channel
+        if backend is not None:
+            from discopy.quantum.simulation import SIMULATORS
+            if backend not in SIMULATORS:
+                raise ValueError(messages.UNKNOWN_SIMULATOR.format(
+                    list(SIMULATORS), backend))
+            if mixed and not SIMULATORS[backend].mixed:
+                raise ValueError(messages.MIXED_SIMULATION.format(backend))
+            return SIMULATORS[backend]()
+        if mixed or self.is_mixed:
+            return channel.Functor(
+                {}, {}, dom=Category(Ty, Circuit), dtype=complex)
+        return tensor.Functor(
+            lambda x: x.inside[0].dim,
+            lambda f: f.array,
+            dom=Category(Ty, Circuit),
+            dtype=complex)
+
+    def cost(self, mixed=False, max_memory=None) -> tensor.Cost:
+        """
+        Estimate the cost of simulating a circuit with :meth:`eval`, without
+        computing the array of any gate.
+
+        Parameters
+        ----------
+        mixed : bool, optional
+            Whether to estimate the cost of the :class:`Channel` rather than
+            the :class:`discopy.tensor.Tensor`.
+        max_memory : int, optional
+            The maximum number of bytes in intermediate arrays.
+
+        Returns
+        -------
+        cost : :class:`discopy.tensor.Cost`
+            The number of multiply-adds, the peak memory in bytes, the number
+            of slices and the size of the output in bytes.
+
+        Example
+        -------
+        >>> from discopy.quantum.gates import Ket, H, CX, Measure
+        >>> circuit = Ket(0, 0, 0) >> H @ qubit ** 2\\
+        ...     >> CX @ qubit >> qubit @ CX
+        >>> circuit.cost()
+        Cost(flops=80, memory=256, slices=1, output=128)
+        >>> (circuit >> Measure() @ Measure() @ Measure()).cost()
+        Cost(flops=896, memory=1536, slices=1, output=128)
+        """
+        return self._simulator(mixed).cost(self, max_memory)
+
     def get_counts(self, *others, backend=None, **params):
         """
         Get counts from a backend, or simulate them with numpy.
@@ -319,9 +384,12 @@ class Circuit(tensor.Diagram):
         backend : pytket.Backend, optional
             Backend on which to run the circuit, if none then `numpy`.
         n_shots : int, optional
-            Number of shots, default is :code:`2**10`.
+            Number of shots, default is :code:`2**10` on a backend.
+            Without a backend, we sample this many shots with `numpy` if
+            given, otherwise we compute the exact probabilities.
         measure_all : bool, optional
             Whether to measure all qubits, default is :code:`False`.
+            Only supported on a backend, like :code:`compilation`.
         normalize : bool, optional
             Whether to normalize the counts, default is :code:`True`.
         post_select : bool, optional
@@ -346,7 +414,33 @@ class Circuit(tensor.Diagram):
         >>> backend = mockBackend({(0, 1): 512, (1, 0): 512})
         >>> circuit.get_counts(backend=backend, n_shots=2**10)
         {(0, 1): 0.5, (1, 0): 0.5}
+
+        Without a backend, the shots are sampled from the exact probabilities
+        of the measured and post-selected bits, with the same post-selection,
+        normalisation and scaling as on a backend.
+
+        >>> circuit = Ket(0, 0) >> H @ Rx(0.3) >> CX >> Measure() @ Bra(0)
+        >>> counts = circuit.get_counts(n_shots=100, seed=42)
+        >>> {bits: round(count, 2) for bits, count in counts.items()}
+        {(0,): 0.2, (1,): 0.23}
+        >>> counts = circuit.get_counts(
+        ...     n_shots=100, seed=42, post_select=False)
+        >>> {bits: round(count, 2) for bits, count in counts.items()}
+        {(0, 0): 0.2, (0, 1): 0.35, (1, 0): 0.23, (1, 1): 0.22}
+
+        Clifford circuits, see :attr:`is_clifford`, are sampled with a
+        stabilizer tableau so that they can have hundreds of qubits.
+
+        >>> n = 200
+        >>> circuit = Ket(*n * [0]) >> H @ qubit ** (n - 1)
+        >>> for i in range(n - 1):
+        ...     circuit = circuit >> qubit ** i @ CX @ qubit ** (n - i - 2)
+        >>> counts = (circuit >> Measure(n)).get_counts(n_shots=100, seed=42)
+        >>> {sum(bits): count for bits, count in counts.items()}
+        {0: 0.48, 200: 0.52}
         """
+        if backend is None and params.get("n_shots", None) is not None:
+            return self._sample(*others, **params)
         if backend is None:
             if others:
                 return [circuit.get_counts(**params)
@@ -361,31 +455,174 @@ class Circuit(tensor.Diagram):
             *(other.to_tk() for other in others), backend=backend, **params)
         return counts if len(counts) > 1 else counts[0]
 
-    def measure(self, mixed=False):
+    def _sample(self, *others, n_shots=2**10, seed=None, post_select=True,
+                normalize=True, scale=True, **params):
+        """
+        Sample the counts of circuits with numpy, see :meth:`get_counts`,
+        with one multinomial draw for the whole batch, except for Clifford
+        circuits which are sampled with a stabilizer tableau.
+
+        The probabilities are normalised for sampling, their total is
+        multiplied back in with the scalars when :code:`scale=True`.
+
+        Raises
+        ------
+        TypeError
+            If given parameters that only make sense on a backend, e.g.
+            :code:`measure_all` or :code:`compilation`.
+        """
+        if params:
+            raise TypeError(messages.UNSUPPORTED_PARAMS.format(
+                ", ".join(map(repr, params))))
+        from discopy.quantum.simulation import Stabilizer
+        circuits = [circuit.init_and_discard()._measure_post_selection()
+                    for circuit in (self, ) + others]
+        with backend('numpy') as np:
+            rng = np.random.default_rng(seed)
+            arrays = [np.asarray(circuit.eval(mixed=True).array).real.reshape(
+                -1) for circuit, _, _ in circuits if not circuit.is_clifford]
+            pvals = np.zeros((len(arrays), max(map(len, arrays), default=0)))
+            for i, array in enumerate(arrays):
+                pvals[i, :len(array)] = np.clip(array, 0, None)
+            totals = pvals.sum(axis=1)
+            pvals /= np.maximum(totals, 1e-300)[:, None]
+            samples = iter(rng.multinomial(n_shots, pvals) if arrays else ())
+            totals = iter(totals.tolist())
+            results = []
+            for circuit, values, scalar in circuits:
+                if circuit.is_clifford:
+                    keys, counts = np.unique(Stabilizer().sample(
+                        circuit, n_shots, rng), axis=0, return_counts=True)
+                    items = zip(map(tuple, keys.tolist()), counts.tolist())
+                    total = 1
+                else:
+                    dims = [x.dim for x in circuit.cod.inside]
+                    counts, total = next(samples), next(totals)
+                    items = ((tuple(map(int, np.unravel_index(i, dims))),
+                              int(counts[i])) for i in np.flatnonzero(counts))
+                n_values, result = len(values), dict()
+                for key, count in items:
+                    if post_select and n_values:
+                        if key[-n_values:] != values:
+                            continue
+                        key = key[:-n_values]
+                    count = count / n_shots if normalize else count
+                    result[key] = count * scalar * total if scale else count
+                results.append(result)
+        return results if others else results[0]
+
+    def _measure_post_selection(self
+                                ) -> tuple[Circuit, tuple[int, ...], float]:
         """
-        Measure a circuit on the computational basis using :code:`numpy`.
+        Measure the post-selected qubits and bits of a circuit instead, moving
+        them to the right of its codomain, and remove its scalars.
+
+        Returns
+        -------
+        circuit : Circuit
+            The circuit without post-selection nor scalars.
+        values : tuple[int, ...]
+            The post-selected value for each of the extra wires on the right.
+        scalar : float
+            The product of the scalars, squared unless they are mixed.
+        """
+        from discopy.quantum.gates import Bra, Digits, Measure, Scalar
+        result, extra, values, scalar = Id(self.dom), self.dom[:0], (), 1
+        for left, box, right in self.inside:
+            if isinstance(box, Scalar):
+                scalar *= (box.array if box.is_mixed
+                           else abs(box.array) ** 2).item()
+            elif isinstance(box, Bra)\
+                    or isinstance(box, Digits) and box.is_dagger:
+                measure = Measure(len(box.dom)) if isinstance(box, Bra)\
+                    else Id(box.dom)
+                result = result >> left @ measure @ right @ extra\
+                    >> left @ Circuit.swap(measure.cod, right @ extra)
+                extra, values = extra @ measure.cod, values + tuple(
+                    box.bitstring)
+            else:
+                result = result >> left @ box @ right @ extra
+        return result, values, scalar
+
+    def measure(self, mixed=False, wires=None, as_dict=False, backend=None,
+                measure_all=False):
+        """
+        Measure a circuit on the computational basis using :code:`numpy`,
+        i.e. compute the probability of each outcome on its output wires once
+        its input wires are initialised to zero.
 
         Parameters
         ----------
-        mixed : Whether to apply a :class:`tensor.Functor`
-                or a :class:`channel.Functor`.
+        mixed : bool, optional
+            Whether to take the diagonal of the density matrix computed with
+            a :class:`channel.Functor` rather than the squared amplitudes of
+            the state computed with a :class:`tensor.Functor`. Mixed circuits
+            are always evaluated this way, then their qubits are discarded.
+        wires : list[int], optional
+            The indices of the measured wires to keep, in the given order,
+            the other ones are marginalised, all the wires by default.
+        as_dict : bool, optional
+            Whether to return a dictionary from outcomes to probabilities,
+            with only the non-zero ones, rather than an array.
+        backend : str, optional
+            The simulator with which to evaluate the circuit, see :meth:`eval`.
+        measure_all : bool, optional
+            Whether to measure the qubits of a mixed circuit rather than
+            discard them, so that there is one axis for each output wire.
 
         Returns
         -------
-        array : numpy.ndarray
+        probabilities : numpy.ndarray | dict[tuple[int, ...], float]
+            The array with one axis for each measured wire, or a dictionary.
+
+        Example
+        -------
+        >>> from discopy.quantum.gates import Ket, X, CX, Measure
+        >>> circuit = Ket(0, 0, 0) >> X @ qubit ** 2 >> CX @ qubit
+        >>> circuit.measure(as_dict=True)
+        {(1, 1, 0): 1.0}
+        >>> circuit.measure(wires=[2, 0])
+        array([[0., 1.],
+               [0., 0.]])
+        >>> circuit = circuit >> Measure() @ qubit ** 2
+        >>> circuit.measure()
+        array([0., 1.])
+        >>> circuit.measure(measure_all=True).shape
+        (2, 2, 2)
         """
-        from discopy.quantum.gates import Bra, Ket
-        if mixed or self.is_mixed:
-            return self.init_and_discard().eval(mixed=True).array.real
-        state = (Ket(*(len(self.dom) * [0])) >> self).eval()
-        effects = [Bra(*index2bitstring(j, len(self.cod))).eval()
-                   for j in range(2 ** len(self.cod))]
-        with backend() as np:
-            array = np.zeros(len(self.cod) * (2, )) + 0j
-            for effect in effects:
-                array +=\
-                    effect.array * np.absolute((state >> effect).array) ** 2
-        return array
+        from discopy.quantum.gates import Bits, Ket
+        circuit = Id().tensor(*(
+            Bits(0) if x.name == "bit" else Ket(0) for x in self.dom)) >> self
+        measure_all = measure_all or not (mixed or self.is_mixed)
+        if backend is not None:
+            mixed = mixed or self._simulator(backend=backend).mixed
+        with tensor.backend() as np:
+            if mixed or self.is_mixed:
+                result = circuit.eval(mixed=True, backend=backend)
+                classical = result.cod.classical.inside
+                quantum = result.cod.quantum.inside
+                array = np.reshape(result.array, (
+                    prod(classical), prod(quantum), prod(quantum)))
+                array = np.diagonal(array, axis1=1, axis2=2).real
+                if not measure_all:
+                    array = np.reshape(np.sum(array, axis=1), classical)
+                else:
+                    array = np.reshape(array, classical + quantum)
+                    is_bit = [x.name == "bit" for x in self.cod]
+                    source = [i for i, x in enumerate(is_bit) if x]\
+                        + [i for i, x in enumerate(is_bit) if not x]
+                    array = np.moveaxis(array, range(len(source)), source)
+            else:
+                array = np.absolute(circuit.eval(backend=backend).array) ** 2
+            if wires is not None:
+                array = np.sum(array, axis=tuple(
+                    i for i in range(np.ndim(array)) if i not in wires))
+                array = np.transpose(
+                    array, [sorted(wires).index(i) for i in wires])
+            if as_dict:
+                return {tuple(map(int, index)): float(array[tuple(index)])
+                        for index in np.argwhere(array)}
+            return array
 
     def to_tn(self, mixed=False):
         """
@@ -882,11 +1119,11 @@ class Functor(frobenius.Functor):
     """ :class:`Circuit`-valued functor. """
     dom = cod = Category(Ty, Circuit)
 
-    def __init__(self, ob, ar, cod=None):
+    def __init__(self, ob, ar, cod=None, cache_size=0):
         if isinstance(ob, Mapping):
             ob = {x: qubit ** y if isinstance(y, int) else y
                   for x, y in ob.items()}
-        super().__init__(ob, ar, cod)
+        super().__init__(ob, ar, cod, cache_size)
 
 
 def index2bitstring(i: int, length: int) -> tuple[int, ...]:
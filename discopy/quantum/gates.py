@@ -457,8 +457,10 @@ class Controlled(QuantumGate):
         n_qubits = len(self.dom)
         if distance == 1:
             return self
-        src, tgt = (0, 1) if distance > 0 else (1, 0)
-        perm = Circuit.permutation([src, *range(2, n_qubits), tgt])
+        n_targets = len(controlled.dom)
+        perm = Circuit.permutation([
+            0, *range(n_targets + 1, n_qubits), *range(1, n_targets + 1)]
+            if distance > 0 else [*range(1, n_qubits), 0])
         diagram = perm[::-1]\
             >> type(self)(controlled) @ qubit ** (abs(distance) - 1)\
             >> perm
@@ -481,8 +483,11 @@ class Controlled(QuantumGate):
                 d = 1 << n_qubits - 1
                 part1 = np.array([[1, 0], [0, 0]])
                 part2 = np.array([[0, 0], [0, 1]])
+                matrix = np.conjugate(controlled.dagger().array.reshape(
+                    d, d)).T if controlled.is_dagger\
+                    else controlled.array.reshape(d, d)
                 array = np.kron(part1, np.eye(d))\
-                    + np.kron(part2, np.array(controlled.array.reshape(d, d)))
+                    + np.kron(part2, np.array(matrix))
             else:
                 array = self._decompose().eval().array
         return array.reshape(*[2] * 2 * n_qubits)
@@ -0,0 +1,637 @@
+# -*- coding: utf-8 -*-
+
+"""
+Simulators for circuits, which apply the array of each gate to the state of
+all the wires rather than contracting the whole circuit as a tensor network.
+
+Summary
+-------
+
+.. autosummary::
+    :template: class.rst
+    :nosignatures:
+    :toctree:
+
+    StateVector
+    DensityMatrix
+    Stabilizer
+    Tableau
+
+Note
+----
+The simulators are selected by name in :meth:`Circuit.eval`, see
+:data:`SIMULATORS`.
+
+>>> from discopy.quantum import Ket, H, CX, qubit
+>>> circuit = Ket(0, 0) >> H @ qubit >> CX
+>>> assert circuit.eval(backend='statevector') == circuit.eval()
+>>> assert circuit.eval(backend='density_matrix') == circuit.eval(mixed=True)
+
+The :class:`Stabilizer` simulator is not a backend for :meth:`Circuit.eval`,
+it samples the counts of Clifford circuits in :meth:`Circuit.get_counts`.
+"""
+
+from __future__ import annotations
+
+from math import prod
+
+import numpy
+
+from discopy import messages
+from discopy.cat import Category
+from discopy.quantum.channel import CQ, Channel, Functor
+from discopy.quantum.circuit import Circuit, Qudit, Swap, Ty, bit, qubit
+from discopy.quantum.gates import (
+    Box, Bra, Controlled, Digits, Discard, Encode, Ket, Measure, MixedState,
+    Scalar, H, S, X, Y, Z)
+from discopy.tensor import Dim, Tensor
+
+
+class StateVector:
+    """
+    A statevector simulator for pure circuits, with one axis for each wire.
+
+    Gates are applied one after the other as matrices acting on the axes of
+    their wires, controlled gates only to the slice of their control, with
+    the state being overwritten whenever the shapes allow it.
+
+    Parameters:
+        dtype : The data type of the state.
+
+    Example
+    -------
+    >>> from discopy.quantum import Ket, Bra, H, X, CX, Controlled, qubit
+    >>> simulate = StateVector()
+    >>> circuit = Ket(0, 0, 0) >> H @ qubit ** 2\\
+    ...     >> CX @ qubit >> Controlled(X, distance=2)
+    >>> state = simulate(circuit)
+    >>> state.cod
+    Dim(2, 2, 2)
+    >>> (abs(state.array.reshape(-1)) ** 2).round(2)
+    array([0.5, 0. , 0. , 0. , 0. , 0. , 0. , 0.5])
+
+    Circuits with a non-empty domain are simulated on each basis state, i.e.
+    the result is the same tensor as the one computed by :meth:`Circuit.eval`.
+
+    >>> assert simulate(H >> Bra(0)) == (H >> Bra(0)).eval()
+    """
+    mixed = False
+
+    def __init__(self, dtype: type = complex):
+        self.dtype = dtype
+
+    def __call__(self, circuit: Circuit) -> Tensor:
+        if circuit.is_mixed:
+            raise ValueError(messages.MIXED_SIMULATION.format('statevector'))
+        dom = _dims(circuit.dom)
+        state = numpy.identity(prod(dom), self.dtype).reshape(
+            (prod(dom), ) + dom)
+        spare = None
+        for layer in circuit.inside:
+            offset = 1
+            for i, box_or_typ in enumerate(layer):
+                if i % 2:
+                    state, spare = self._apply(
+                        box_or_typ, state, offset, spare)
+                    offset += len(box_or_typ.cod)
+                else:
+                    offset += len(box_or_typ)
+        return Tensor[self.dtype]._wrap(
+            state, Dim(*dom), Dim(*_dims(circuit.cod)))
+
+    def _apply(self, box: Box, state: numpy.ndarray, offset: int,
+               spare: numpy.ndarray = None, conjugate: bool = False
+               ) -> tuple[numpy.ndarray, numpy.ndarray | None]:
+        """
+        Apply a box to the axes of a state from a given offset.
+
+        Parameters:
+            box : The box to apply.
+            state : The array with one axis for each wire.
+            offset : The axis of the first wire in the domain of the box.
+            spare : An array which may be overwritten with the result.
+            conjugate : Whether to apply the conjugate of the box instead.
+
+        Returns:
+            state : The new state, possibly the same array.
+            spare : An array which may be overwritten by the next box.
+        """
+        shape, before = state.shape, (slice(None), ) * offset
+        n_dom, cod = len(box.dom), _dims(box.cod)
+        if isinstance(box, Ket):
+            result = numpy.zeros(shape[:offset] + cod + shape[offset:],
+                                 self.dtype)
+            result[before + tuple(box.bitstring)] = state
+            return result, None
+        if isinstance(box, Bra):
+            return state[before + tuple(box.bitstring)], None
+        if isinstance(box, Controlled):
+            state = numpy.ascontiguousarray(state)
+            self._control(box, state.reshape(
+                prod(shape[:offset]), -1, prod(shape[offset + n_dom:])),
+                conjugate)
+            return state, spare
+        left, right = prod(shape[:offset]), prod(shape[offset + n_dom:])
+        dom_size, cod_size = prod(shape[offset:offset + n_dom]), prod(cod)
+        matrix = self._matrix(box, dom_size, cod_size, conjugate)
+        shape = shape[:offset] + cod + shape[offset + n_dom:]
+        view = state.reshape(left, dom_size, right)
+        if spare is None or spare.size != prod(shape)\
+                or not spare.flags.c_contiguous:
+            spare = numpy.empty(shape, self.dtype)
+        if right == 1:
+            numpy.matmul(view.reshape(left, dom_size), matrix,
+                         out=spare.reshape(left, cod_size))
+        else:
+            _matmul(matrix, view, out=spare.reshape(left, cod_size, right))
+        return spare.reshape(shape), state if state.flags.c_contiguous\
+            else None
+
+    def _control(self, box: Box, view: numpy.ndarray,
+                 conjugate: bool = False) -> None:
+        """
+        Apply a square qubit gate in place to a view of shape ``(..., n, m)``
+        where ``n`` is the dimension of its domain, controlled gates being
+        applied only to the slice where their control qubit is one.
+        """
+        if not isinstance(box, Controlled):
+            size = view.shape[-2]
+            _matmul(self._matrix(box, size, size, conjugate), view, out=view)
+            return
+        *batch, size, right = view.shape
+        targets = 2 ** len(box.controlled.dom)
+        idle = size // targets // 2
+        if box.distance > 0:
+            view = view.reshape(
+                *batch, 2, idle, targets, right)[..., 1, :, :, :]
+        else:
+            view = numpy.moveaxis(view.reshape(
+                *batch, targets, idle, 2, right)[..., 1, :], -3, -2)
+        self._control(box.controlled, view, conjugate)
+
+    def _matrix(self, box: Box, dom: int, cod: int,
+                conjugate: bool = False) -> numpy.ndarray:
+        """ The array of a box as a matrix from its domain to its codomain. """
+        if box.is_dagger:  # As in tensor.Functor, a dagger is the adjoint.
+            matrix = numpy.asarray(box.dagger().array, self.dtype).reshape(
+                cod, dom).T
+            return matrix if conjugate else matrix.conjugate()
+        matrix = numpy.asarray(box.array, self.dtype).reshape(dom, cod)
+        return matrix.conjugate() if conjugate else matrix
+
+
+class DensityMatrix(StateVector):
+    """
+    A density matrix simulator for mixed circuits, with one axis for each
+    wire and one more axis for each qubit, i.e. bits are stored as a
+    classical register rather than as doubled wires.
+
+    Quantum gates are applied as :math:`U \\rho U^\\dagger` on the axes of
+    their qubits, measurements as a diagonal, discards as a partial trace and
+    mixed states as a tensor product with the identity. Any other mixed box
+    is applied as the array of its :class:`Channel`.
+
+    Parameters:
+        dtype : The data type of the state.
+
+    Example
+    -------
+    >>> from discopy.quantum import Ket, H, CX, Measure, Discard, qubit
+    >>> simulate = DensityMatrix()
+    >>> circuit = Ket(0, 0) >> H @ qubit >> CX >> Measure() @ Discard()
+    >>> channel = simulate(circuit)
+    >>> channel.cod
+    CQ(classical=Dim(2), quantum=Dim(1))
+    >>> channel.array.real.round(2)
+    array([0.5, 0.5])
+
+    The result is the same channel as the one computed by
+    :meth:`Circuit.eval` with ``mixed=True``.
+
+    >>> assert simulate(circuit) == circuit.eval(mixed=True)
+    """
+    mixed = True
+
+    def __call__(self, circuit: Circuit) -> Channel:
+        qubits = [isinstance(x, Qudit) for x in circuit.dom.inside]
+        dom = _cq(circuit.dom)
+        wires = _wires(qubits)
+        shape = tuple(dom.to_dim().inside)
+        state = numpy.moveaxis(
+            numpy.identity(prod(shape), self.dtype).reshape((-1, ) + shape),
+            range(1, len(wires) + 1), wires)
+        spare = None
+        for layer in circuit.inside:
+            offset = 0
+            for i, box_or_typ in enumerate(layer):
+                if i % 2:
+                    state, spare = self._evolve(
+                        box_or_typ, state, offset, qubits, spare)
+                    offset += len(box_or_typ.cod)
+                else:
+                    offset += len(box_or_typ)
+        wires = _wires(qubits)
+        state = numpy.moveaxis(state, wires, range(1, len(wires) + 1))
+        return Channel._wrap(state, dom, _cq(circuit.cod))
+
+    def _evolve(self, box: Box, state: numpy.ndarray, offset: int,
+                qubits: list[bool], spare: numpy.ndarray = None
+                ) -> tuple[numpy.ndarray, numpy.ndarray | None]:
+        """
+        Apply a box to a density matrix from a given wire.
+
+        Parameters:
+            box : The box to apply.
+            state : The array with one axis for each wire then for each qubit.
+            offset : The index of the first wire in the domain of the box.
+            qubits : Whether each wire is a qubit, updated in place.
+            spare : An array which may be overwritten with the result.
+
+        Returns:
+            state : The new state, possibly the same array.
+            spare : An array which may be overwritten by the next box.
+        """
+        n_dom, n_cod = len(box.dom), len(box.cod)
+        if isinstance(box, Scalar):
+            scalar = box.array if box.is_mixed else abs(box.array) ** 2
+            return state * scalar, None
+        if isinstance(box, Swap):
+            state = numpy.swapaxes(state, 1 + offset, 2 + offset)
+            if all(qubits[offset:offset + 2]):
+                bra = _bra(qubits, offset)
+                state = numpy.swapaxes(state, bra, bra + 1)
+            qubits[offset:offset + 2] = qubits[offset:offset + 2][::-1]
+            return state, None
+        if not box.is_mixed and box.is_classical:
+            qubits[offset:offset + n_dom] = n_cod * [False]
+            return self._apply(box, state, 1 + offset, spare)
+        if not box.is_mixed:
+            bra = _bra(qubits, offset) + n_cod - n_dom
+            qubits[offset:offset + n_dom] = n_cod * [True]
+            state, spare = self._apply(box, state, 1 + offset, spare)
+            return self._apply(box, state, bra, spare, conjugate=True)
+        if isinstance(box, Measure)\
+                and box.destructive and not box.override_bits:
+            for wire in range(offset, offset + n_dom):
+                state = numpy.moveaxis(numpy.diagonal(
+                    state, 0, 1 + wire, _bra(qubits, wire)), -1, 1 + wire)
+                qubits[wire] = False
+            return numpy.ascontiguousarray(state), None
+        if isinstance(box, Discard):
+            for wire in reversed(range(offset, offset + n_dom)):
+                state = numpy.trace(state, 0, 1 + wire, _bra(qubits, wire))\
+                    if qubits[wire] else numpy.sum(state, 1 + wire)
+                del qubits[wire]
+            return state, None
+        if isinstance(box, Encode) and box.constructive and not box.reset_bits:
+            for wire in range(offset, offset + n_dom):
+                qubits[wire] = True
+                state = numpy.expand_dims(state, _bra(qubits, wire))
+                state = state * _identity(state.ndim, 1 + wire, _bra(
+                    qubits, wire), box.dom.inside[wire - offset].dim)
+            return state, None
+        if isinstance(box, MixedState):
+            for wire, x in enumerate(box.cod.inside, offset):
+                qubits.insert(wire, isinstance(x, Qudit))
+                state = numpy.expand_dims(state, 1 + wire)
+                if qubits[wire]:
+                    state = numpy.expand_dims(state, _bra(qubits, wire))
+                    state = state * _identity(
+                        state.ndim, 1 + wire, _bra(qubits, wire), x.dim)
+                else:
+                    state = numpy.repeat(state, x.dim, 1 + wire)
+            return state, None
+        return self._contract(box, state, offset, qubits), None
+
+    def _contract(self, box: Box, state: numpy.ndarray, offset: int,
+                  qubits: list[bool]) -> numpy.ndarray:
+        """ Apply any box as the array of its channel. """
+        array = Functor({}, {}, dom=Category(Ty, Circuit), dtype=self.dtype)(
+            box).array
+        dom = range(offset, offset + len(box.dom))
+        axes = [1 + i for i in dom if not qubits[i]]\
+            + [1 + i for i in dom if qubits[i]]\
+            + [_bra(qubits, i) for i in dom if qubits[i]]
+        state = numpy.tensordot(
+            state, numpy.asarray(array, self.dtype), (axes, range(len(axes))))
+        qubits[offset:offset + len(box.dom)] = [
+            isinstance(x, Qudit) for x in box.cod.inside]
+        cod = range(offset, offset + len(box.cod))
+        destination = [1 + i for i in cod if not qubits[i]]\
+            + [1 + i for i in cod if qubits[i]]\
+            + [_bra(qubits, i) for i in cod if qubits[i]]
+        return numpy.moveaxis(
+            state, range(state.ndim - len(destination), state.ndim),
+            destination)
+
+
+class Stabilizer:
+    """
+    A stabilizer simulator for Clifford circuits, i.e. with the gates
+    :code:`H`, :code:`S`, :code:`X`, :code:`Y`, :code:`Z`, :code:`CX`,
+    :code:`CZ` and :code:`SWAP`, kets, bits, measurements and discards.
+
+    The qubits are stored in a :class:`Tableau`, which takes quadratic space
+    and time for each measurement. The outcome of each measurement is an
+    affine function of the random bits drawn by the previous ones, so that
+    shots are sampled all at once without simulating the circuit again.
+
+    Example
+    -------
+    >>> from discopy.quantum import Ket, H, CX, Measure, qubit
+    >>> n = 100
+    >>> circuit = Ket(*n * [0]) >> H @ qubit ** (n - 1)
+    >>> for i in range(n - 1):
+    ...     circuit = circuit >> qubit ** i @ CX @ qubit ** (n - i - 2)
+    >>> circuit = circuit >> Measure(n)
+    >>> samples = Stabilizer().sample(circuit, n_shots=10, seed=42)
+    >>> samples.shape
+    (10, 100)
+    >>> samples.sum(axis=1)
+    array([  0, 100, 100,   0,   0, 100,   0, 100,   0,   0])
+
+    Note
+    ----
+    The input wires are initialised to zero and the qubits left in the
+    codomain are discarded. Post-selection is not supported, it is done in
+    :meth:`Circuit.get_counts` by measuring the post-selected qubits instead.
+    """
+    @staticmethod
+    def is_clifford(box: Box) -> bool:
+        """
+        Whether a box can be simulated in a Clifford circuit, where bras and
+        scalars are allowed for :meth:`Circuit.get_counts`.
+
+        Parameters:
+            box : The box to check.
+        """
+        if not all(x in (bit, qubit) for x in box.dom @ box.cod):
+            return False
+        if isinstance(box, (Ket, Bra, Digits, Discard, Swap, Scalar)):
+            return True
+        if isinstance(box, Measure):
+            return box.destructive and not box.override_bits
+        if isinstance(box, Controlled):
+            return box.controlled in (X, Z)
+        return box in (H, S, S.dagger(), X, Y, Z)
+
+    def __call__(self, circuit: Circuit) -> numpy.ndarray:
+        """
+        Simulate a Clifford circuit.
+
+        Parameters:
+            circuit : The circuit to simulate.
+
+        Returns:
+            outcomes : A boolean array with one row for each bit in the
+                codomain, with the constant then the coefficient of each
+                random bit, see :meth:`sample`.
+        """
+        n_qubits = circuit.dom.count(qubit) + sum(
+            len(box.cod) for box in circuit.boxes if isinstance(box, Ket))
+        n_bits = sum(
+            len(box.dom) for box in circuit.boxes if isinstance(box, Measure))
+        tableau, qubits = Tableau(n_qubits, n_bits), iter(range(n_qubits))
+        wires = [next(qubits) if x == qubit else tableau.constant(0)
+                 for x in circuit.dom]
+        for layer in circuit.inside:
+            offset = 0
+            for i, box_or_typ in enumerate(layer):
+                if i % 2:
+                    n_dom = len(box_or_typ.dom)
+                    wires[offset:offset + n_dom] = self._apply(
+                        box_or_typ, tableau, wires[offset:offset + n_dom],
+                        qubits)
+                    offset += len(box_or_typ.cod)
+                else:
+                    offset += len(box_or_typ)
+        outcomes = [wire for wire in wires if not isinstance(wire, int)]
+        return numpy.array(outcomes, bool).reshape(
+            len(outcomes), tableau.r.shape[1])[:, :tableau.n_random + 1]
+
+    def sample(self, circuit: Circuit, n_shots: int = 1, seed=None
+               ) -> numpy.ndarray:
+        """
+        Sample the bits in the codomain of a Clifford circuit.
+
+        Parameters:
+            circuit : The circuit to simulate.
+            n_shots : The number of samples.
+            seed : The seed or :class:`numpy.random.Generator` to use.
+
+        Returns:
+            samples : An array of shape :code:`(n_shots, len(circuit.cod))`.
+        """
+        outcomes = self(circuit).astype(int)
+        random = numpy.random.default_rng(seed).integers(
+            2, size=(n_shots, outcomes.shape[1] - 1))
+        return (outcomes[:, 0] + random @ outcomes[:, 1:].T) % 2
+
+    def _apply(self, box: Box, tableau: Tableau, wires: list, qubits
+               ) -> list:
+        """
+        Apply a box to a tableau, where each wire is either the index of a
+        qubit or the outcome of a bit, and return the wires of its codomain.
+        """
+        if isinstance(box, Scalar):
+            return wires
+        if isinstance(box, Swap):
+            return wires[::-1]
+        if isinstance(box, Discard):
+            return []
+        if isinstance(box, Ket):
+            wires = [next(qubits) for _ in box.cod]
+            for wire, value in zip(wires, box.bitstring):
+                if value:
+                    tableau.pauli(wire, x=True)
+            return wires
+        if isinstance(box, Digits) and not box.is_dagger:
+            return list(map(tableau.constant, box.digits))
+        if isinstance(box, Measure) and self.is_clifford(box):
+            return list(map(tableau.measure, wires))
+        if isinstance(box, Controlled) and self.is_clifford(box):
+            control, target = (wires[0], wires[box.distance])\
+                if box.distance > 0 else (wires[-1], wires[0])
+            tableau.cnot(control, target, phase=box.controlled == Z)
+            return wires
+        if box in (H, S, S.dagger()):
+            wire, = wires
+            tableau.hadamard(wire) if box == H\
+                else tableau.phase(wire, dagger=box != S)
+            return wires
+        if box in (X, Y, Z):
+            wire, = wires
+            tableau.pauli(wire, x=box != Z, z=box != X)
+            return wires
+        raise ValueError(
+            messages.UNSUPPORTED_SIMULATION.format(box, 'stabilizer'))
+
+
+class Tableau:
+    """
+    The stabilizer tableau of Aaronson and Gottesman, where the signs are
+    affine functions of some random bits rather than constants.
+
+    The first ``n_qubits`` rows are the destabilizers and the last ones the
+    stabilizers, each row being a Pauli operator with bits ``x`` and ``z`` for
+    each qubit, and a sign with a constant bit then one bit for each of the
+    random bits it depends on.
+
+    Parameters:
+        n_qubits : The number of qubits, all initialised to zero.
+        n_bits : The maximum number of random bits, e.g. of measurements.
+
+    Example
+    -------
+    >>> tableau = Tableau(2, 2)
+    >>> tableau.hadamard(0)
+    >>> tableau.cnot(0, 1)
+    >>> tableau.measure(0).astype(int), tableau.measure(1).astype(int)
+    (array([0, 1, 0]), array([0, 1, 0]))
+    """
+    def __init__(self, n_qubits: int, n_bits: int = 0):
+        self.n_qubits, self.n_random = n_qubits, 0
+        self.x = numpy.eye(2 * n_qubits, n_qubits, dtype=bool)
+        self.z = numpy.eye(2 * n_qubits, n_qubits, -n_qubits, dtype=bool)
+        self.r = numpy.zeros((2 * n_qubits, n_bits + 1), bool)
+
+    def constant(self, value: int) -> numpy.ndarray:
+        """ The outcome of a bit with a constant value. """
+        outcome = numpy.zeros(self.r.shape[1], bool)
+        outcome[0] = value
+        return outcome
+
+    def hadamard(self, a: int) -> None:
+        """ Apply a Hadamard gate to a qubit. """
+        self.r[:, 0] ^= self.x[:, a] & self.z[:, a]
+        self.x[:, a], self.z[:, a] = self.z[:, a], self.x[:, a].copy()
+
+    def phase(self, a: int, dagger: bool = False) -> None:
+        """ Apply a phase gate, or its dagger, to a qubit. """
+        self.r[:, 0] ^= self.x[:, a] & (self.z[:, a] ^ dagger)
+        self.z[:, a] ^= self.x[:, a]
+
+    def pauli(self, a: int, x: bool = False, z: bool = False) -> None:
+        """ Apply a Pauli gate, i.e. flip the sign of the rows it anticommutes
+        with. """
+        self.r[:, 0] ^= x & self.z[:, a] ^ z & self.x[:, a]
+
+    def cnot(self, a: int, b: int, phase: bool = False) -> None:
+        """ Apply a controlled-X gate, or a controlled-Z if ``phase``. """
+        if phase:
+            self.hadamard(b)
+        self.r[:, 0] ^= self.x[:, a] & self.z[:, b]\
+            & ~(self.x[:, b] ^ self.z[:, a])
+        self.x[:, b] ^= self.x[:, a]
+        self.z[:, a] ^= self.z[:, b]
+        if phase:
+            self.hadamard(b)
+
+    def measure(self, a: int) -> numpy.ndarray:
+        """
+        Measure a qubit in the computational basis and return its outcome,
+        drawing a new random bit if it is not determined by the tableau.
+        """
+        n, x, z, r = self.n_qubits, self.x, self.z, self.r
+        anticommuting = numpy.flatnonzero(x[n:, a])
+        if not anticommuting.size:
+            rows = n + numpy.flatnonzero(x[:n, a])
+            previous_x = numpy.bitwise_xor.accumulate(x[rows], axis=0)
+            previous_z = numpy.bitwise_xor.accumulate(z[rows], axis=0)
+            phase = _phase(x[rows][1:], z[rows][1:],
+                           previous_x[:-1], previous_z[:-1]).sum()
+            outcome = numpy.bitwise_xor.reduce(r[rows], axis=0)
+            outcome[0] ^= phase % 4 == 2
+            return outcome
+        p = n + anticommuting[0]
+        rows = numpy.flatnonzero(x[:, a])
+        rows = rows[rows != p]
+        phase = _phase(x[p], z[p], x[rows], z[rows]).sum(axis=1)
+        r[rows] ^= r[p]
+        r[rows, 0] ^= phase % 4 == 2
+        x[rows] ^= x[p]
+        z[rows] ^= z[p]
+        x[p - n], z[p - n], r[p - n] = x[p], z[p], r[p]
+        x[p], z[p], r[p] = False, False, False
+        z[p, a] = True
+        self.n_random += 1
+        r[p, self.n_random] = True
+        return r[p].copy()
+
+
+def _phase(x1: numpy.ndarray, z1: numpy.ndarray,
+           x2: numpy.ndarray, z2: numpy.ndarray) -> numpy.ndarray:
+    """
+    The exponent of :math:`i` when multiplying the Pauli operators with bits
+    ``x1, z1`` on the left of those with bits ``x2, z2``, for each qubit.
+    """
+    x1, z1, x2, z2 = (numpy.asarray(a, int) for a in (x1, z1, x2, z2))
+    return x1 * z1 * (z2 - x2) + x1 * (1 - z1) * z2 * (2 * x2 - 1)\
+        + (1 - x1) * z1 * x2 * (1 - 2 * z2)
+
+
+def _matmul(matrix: numpy.ndarray, view: numpy.ndarray,
+            out: numpy.ndarray) -> None:
+    """
+    Multiply a view of shape ``(..., n, m)`` by a matrix of shape ``(n, k)``
+    on its axis of size ``n``, writing the result of shape ``(..., k, m)``
+    in ``out``, which may be the view itself.
+
+    NumPy broadcasts small matrices over the batch axes one at a time, so
+    when ``m`` is small we multiply the rows of size ``n * m`` by the
+    Kronecker product of the matrix with the identity on ``m`` instead.
+    """
+    *batch, n, m = view.shape
+    if m >= 32:
+        numpy.matmul(matrix.T, view, out=out)
+    elif n * m <= 64 and _is_flat(view) and _is_flat(out):
+        numpy.matmul(
+            view.reshape(*batch, n * m), numpy.kron(matrix, numpy.identity(
+                m, matrix.dtype)), out=out.reshape(*batch, -1))
+    else:
+        out[...] = numpy.moveaxis(
+            numpy.tensordot(view, matrix, (view.ndim - 2, 0)), -1, -2)
+
+
+def _is_flat(view: numpy.ndarray) -> bool:
+    """ Whether the last two axes of a view can be reshaped into one. """
+    return view.strides[-2] == view.shape[-1] * view.strides[-1]
+
+
+def _dims(typ: Ty) -> tuple[int, ...]:
+    """ The dimension of each wire in a circuit type. """
+    return tuple(x.dim for x in typ.inside)
+
+
+def _cq(typ: Ty) -> CQ:
+    """ The classical-quantum dimension of a circuit type. """
+    return CQ(Dim(*(x.dim for x in typ.inside if not isinstance(x, Qudit))),
+              Dim(*(x.dim for x in typ.inside if isinstance(x, Qudit))))
+
+
+def _wires(qubits: list[bool]) -> list[int]:
+    """
+    The axes of a density matrix for the classical wires then the kets and the
+    bras of the qubits, i.e. where the axes of a channel array should go.
+    """
+    return [1 + i for i, x in enumerate(qubits) if not x]\
+        + [1 + i for i, x in enumerate(qubits) if x]\
+        + [_bra(qubits, i) for i, x in enumerate(qubits) if x]
+
+
+def _bra(qubits: list[bool], wire: int) -> int:
+    """ The axis of a density matrix for the bra of a given qubit. """
+    return 1 + len(qubits) + sum(qubits[:wire])
+
+
+def _identity(ndim: int, axis1: int, axis2: int, dim: int) -> numpy.ndarray:
+    """ The identity matrix on two axes of an array, broadcast on the rest. """
+    shape = [1] * ndim
+    shape[axis1] = shape[axis2] = dim
+    return numpy.identity(dim).reshape(shape)
+
+
+SIMULATORS = {
+    "statevector": StateVector,
+    "density_matrix": DensityMatrix,
+}
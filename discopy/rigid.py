@@ -43,6 +43,7 @@ Axioms
 from __future__ import annotations
 
 from collections.abc import Callable
+from functools import cached_property
 
 from discopy import cat, monoidal, closed, messages
 from discopy.braided import BinaryBoxConstructor
@@ -85,7 +86,11 @@ class Ob(cat.Ob):
         return cat.Ob.__eq__(self, other) and self.z == other.z
 
     def __hash__(self):
-        return hash(repr(self))
+        return self._hash
+
+    @cached_property
+    def _hash(self) -> int:
+        return hash(self.name) if not self.z else hash((self.name, self.z))
 
     def __repr__(self):
         return factory_name(type(self))\
@@ -492,11 +497,95 @@ class Diagram(closed.Diagram):
 
     normalize = snake_removal
 
-    def normal_form(self, **params):
+    def _yank_snakes(self) -> Diagram:
+        """
+        Remove all the snakes at once, used by :code:`normal_form(fast=True)`.
+
+        The diagram is kept as a doubly linked list of boxes and offsets. Each
+        cap follows its legs down to the box that consumes them, if it is a
+        yankable cup then the boxes in between are reordered and their offsets
+        are updated as in :meth:`snake_removal`, but in one go.
+        """
+        from discopy.rigid import Cup, Cap
+
+        boxes, offsets = self.boxes, self.offsets
+        n_boxes = len(boxes)
+        after = list(range(1, n_boxes + 1)) + [0]
+        before = [n_boxes] + list(range(n_boxes))  # n_boxes is the sentinel.
+
+        def follow_wire(i, j):
+            """ The box taking the j-th wire below box i and obstructions. """
+            left_obstruction, right_obstruction = [], []
+            i = after[i]
+            while i != n_boxes:
+                box, off = boxes[i], offsets[i]
+                if off <= j < off + len(box.dom):
+                    return i, j, (left_obstruction, right_obstruction)
+                if off <= j:
+                    j += len(box.cod) - len(box.dom)
+                    left_obstruction.append(i)
+                else:
+                    right_obstruction.append(i)
+                i = after[i]
+            return None, j, (left_obstruction, right_obstruction)
+
+        def yank(cap, cup, obstructions, left_snake):
+            """ Remove a cup and a cap, reorder the boxes in between. """
+            left_obstruction, right_obstruction = obstructions
+            growth = {
+                i: len(boxes[i].cod) - len(boxes[i].dom)
+                for i in left_obstruction}
+            segment, i = [], after[cap]
+            while i != cup:
+                segment.append(i)
+                i = after[i]
+            # Right obstructions skip over the left ones moved past them.
+            shift = 0
+            for i in (segment[::-1] if left_snake else segment):
+                if i in growth:
+                    shift += growth[i]
+                else:
+                    offsets[i] += (shift if left_snake else -shift) - 2
+            segment = left_obstruction + right_obstruction if left_snake\
+                else right_obstruction + left_obstruction
+            chain = [before[cap]] + segment + [after[cup]]
+            for top, bottom in zip(chain, chain[1:]):
+                after[top], before[bottom] = bottom, top
+
+        keep_on_going = True
+        while keep_on_going:
+            keep_on_going, cap = False, after[n_boxes]
+            while cap != n_boxes:
+                next_cap = after[cap]
+                if isinstance(boxes[cap], Cap):
+                    for left_snake, wire in [(True, offsets[cap]),
+                                             (False, offsets[cap] + 1)]:
+                        cup, wire, obstructions = follow_wire(cap, wire)
+                        if cup is None or not isinstance(boxes[cup], Cup)\
+                                or offsets[cup] + left_snake != wire:
+                            continue
+                        yank(cap, cup, obstructions, left_snake)
+                        keep_on_going, next_cap = True, after[before[cap]]
+                        break
+                cap = next_cap
+        order, i = [], after[n_boxes]
+        while i != n_boxes:
+            order.append(i)
+            i = after[i]
+        with cat.trusted():
+            return self.factory.decode(
+                self.dom, [(boxes[i], offsets[i]) for i in order])
+
+    def normal_form(self, fast=False, **params):
         """
         Implements the normalisation of rigid categories,
         see Dunn and Vicary :cite:`DunnVicary19`, definition 2.12.
 
+        Parameters:
+            fast : Whether to yank all the snakes at once then normalise in
+                   place, without computing any of the intermediate steps.
+            params : Passed to :meth:`snake_removal`.
+
         Examples
         --------
         >>> a, b = Ty('a'), Ty('b')
@@ -516,7 +605,12 @@ class Diagram(closed.Diagram):
         >>> *_, two_snakes_nf = monoidal.Diagram.normalize(
         ...     snakes, left=True)
         >>> assert double_snake == two_snakes_nf
+
+        >>> diagram = f.transpose().transpose(left=True)
+        >>> assert diagram.normal_form(fast=True) == diagram.normal_form() == f
         """
+        if fast:
+            return self._yank_snakes()._normal_form(**params)
         return super().normal_form(**params)
 
 
@@ -540,6 +634,7 @@ class Box(closed.Box, Diagram):
     >>> assert f.l.l != f != f.r.r
     """
     __ambiguous_inheritance__ = (closed.Box, )
+    z = 0  # For subclasses that do not call Box.__init__, e.g. bubbles.
 
     def __init__(self, name: str, dom: Ty, cod: Ty, data=None, z=0, **params):
         self.z = z
@@ -561,7 +656,11 @@ class Box(closed.Box, Diagram):
         return monoidal.Box.__eq__(self, other)
 
     def __hash__(self):
-        return hash(repr(self))
+        return self._hash
+
+    @cached_property
+    def _box_hash(self) -> int:
+        return hash((super()._box_hash, self.z))
 
     def rotate(self, left=False):
         dom, cod = (
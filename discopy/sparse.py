@@ -0,0 +1,484 @@
+# -*- coding: utf-8 -*-
+
+"""
+Sparse arrays in coordinate format, with the NumPy functions needed by
+:class:`discopy.matrix.Matrix` and :class:`discopy.tensor.Tensor`.
+
+This module is the ``'sparse'`` backend of :func:`discopy.matrix.backend`.
+
+Summary
+-------
+
+.. autosummary::
+    :template: class.rst
+    :nosignatures:
+    :toctree:
+
+    COO
+
+.. admonition:: Functions
+
+    .. autosummary::
+        :template: function.rst
+        :nosignatures:
+        :toctree:
+
+        array
+        asarray
+        zeros
+        identity
+        matmul
+        tensordot
+        moveaxis
+        conjugate
+        einsum
+
+Note
+----
+Arrays with more than a fraction ``config.SPARSE_THRESHOLD`` of non-zero
+entries are returned as dense NumPy arrays. The functions of this module
+accept both kinds of arrays, any other function is taken from NumPy.
+
+Example
+-------
+>>> from discopy.tensor import Dim, Tensor, backend
+>>> with backend('sparse'):
+...     x = Tensor([0] * 99 + [1], Dim(1), Dim(100))
+...     m = Tensor.id(Dim(100))
+...     y = x >> m >> x.dagger()
+>>> x.array
+COO(shape=(100,), nnz=1, dtype=int64)
+>>> y
+Tensor([1], dom=Dim(1), cod=Dim(1))
+"""
+
+from __future__ import annotations
+
+from math import prod
+
+import numpy
+
+from discopy import config
+
+
+class COO:
+    """
+    A sparse array given by the ``coords`` of its non-zero entries, of shape
+    ``(ndim, nnz)``, and the value of each entry in ``data``.
+
+    Parameters:
+        coords : The coordinates of the non-zero entries.
+        data : The value of each non-zero entry.
+        shape : The shape of the array.
+
+    Example
+    -------
+    >>> x = COO.from_dense([[0, 2], [3, 0]])
+    >>> x.coords
+    array([[0, 1],
+           [1, 0]])
+    >>> x.data
+    array([2, 3])
+    >>> x.T.todense()
+    array([[0, 3],
+           [2, 0]])
+    """
+    __array_ufunc__ = None  # So that NumPy defers to our operators.
+
+    def __init__(self, coords, data, shape: tuple[int, ...]):
+        self.shape = tuple(map(int, shape))
+        self.data = numpy.asarray(data).reshape(-1)
+        self.coords = numpy.asarray(coords, dtype=numpy.intp).reshape(
+            len(self.shape), len(self.data))
+
+    @classmethod
+    def from_dense(cls, array) -> COO:
+        """
+        The sparse array with the non-zero entries of a dense ``array``.
+
+        Parameters:
+            array : The dense array.
+        """
+        array = numpy.asarray(array)
+        flat = numpy.flatnonzero(array.reshape(-1) != 0)
+        return cls(_unravel(flat, array.shape),
+                   array.reshape(-1)[flat], array.shape)
+
+    def todense(self) -> numpy.ndarray:
+        """ The dense array with the same entries. """
+        result = numpy.zeros(self.shape, dtype=self.dtype)
+        if self.nnz:
+            result[tuple(self.coords)] = self.data if self.ndim\
+                else self.data[0]
+        return result
+
+    def __array__(self, dtype=None, copy=None):
+        return self.todense() if dtype is None\
+            else self.todense().astype(dtype)
+
+    numpy = todense
+
+    @property
+    def ndim(self) -> int:
+        """ The number of axes of the array. """
+        return len(self.shape)
+
+    @property
+    def size(self) -> int:
+        """ The number of entries of the array, zero or not. """
+        return prod(self.shape)
+
+    @property
+    def nnz(self) -> int:
+        """ The number of stored entries of the array. """
+        return len(self.data)
+
+    @property
+    def dtype(self) -> numpy.dtype:
+        """ The data type of the entries. """
+        return self.data.dtype
+
+    def __repr__(self):
+        return f"COO(shape={self.shape}, nnz={self.nnz}, dtype={self.dtype})"
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __iter__(self):
+        return iter(self.todense())
+
+    def __bool__(self):
+        return bool(self.todense())
+
+    def __int__(self):
+        return int(self.todense())
+
+    def __float__(self):
+        return float(self.todense())
+
+    def __complex__(self):
+        return complex(self.todense())
+
+    def __eq__(self, other):
+        return self.todense() == numpy.asarray(other)
+
+    def __ne__(self, other):
+        return self.todense() != numpy.asarray(other)
+
+    def __getitem__(self, key):
+        return self.todense()[key]
+
+    def __setitem__(self, key, value):
+        key = key if isinstance(key, tuple) else (key, )
+        if len(key) != self.ndim or not all(
+                isinstance(i, slice) and (i.step or 1) > 0 for i in key):
+            result = self.todense()
+            result[key] = value
+            result = COO.from_dense(result)
+            self.coords, self.data = result.coords, result.data
+            return
+        ranges = [range(*i.indices(n)) for i, n in zip(key, self.shape)]
+        shape = tuple(map(len, ranges))
+        if not isinstance(value, COO) or value.shape != shape:
+            value = COO.from_dense(numpy.broadcast_to(value, shape))
+        inside = numpy.ones(self.nnz, dtype=bool)
+        for coords, r in zip(self.coords, ranges):
+            inside &= (coords >= r.start) & (coords < r.stop)\
+                & ((coords - r.start) % r.step == 0)
+        shift = numpy.array([[r.start] for r in ranges], dtype=numpy.intp)
+        step = numpy.array([[r.step] for r in ranges], dtype=numpy.intp)
+        self.coords = numpy.concatenate(
+            [self.coords[:, ~inside], shift + step * value.coords], axis=1)
+        self.data = numpy.concatenate(
+            [self.data[~inside], value.data.astype(self.dtype)])
+
+    def reshape(self, *shape: int) -> COO:
+        shape = shape[0] if len(shape) == 1\
+            and not isinstance(shape[0], int) else shape
+        shape = tuple(map(int, shape))
+        if -1 in shape:
+            i = shape.index(-1)
+            rest = prod(shape[:i] + shape[i + 1:])
+            shape = shape[:i] + (self.size // (rest or 1), ) + shape[i + 1:]
+        if prod(shape) != self.size:
+            raise ValueError(
+                f"cannot reshape array of size {self.size} into {shape}")
+        linear = _ravel(self.coords, self.shape)
+        return COO(_unravel(linear, shape), self.data, shape)
+
+    def transpose(self, *axes: int) -> COO:
+        axes = axes[0] if len(axes) == 1 and not isinstance(axes[0], int)\
+            else axes
+        axes = tuple(axes) or tuple(reversed(range(self.ndim)))
+        return COO(self.coords[list(axes)], self.data,
+                   tuple(self.shape[i] for i in axes))
+
+    T = property(transpose)
+
+    def conjugate(self) -> COO:
+        return COO(self.coords, self.data.conjugate(), self.shape)
+
+    conj = conjugate
+
+    def astype(self, dtype) -> COO:
+        return COO(self.coords, self.data.astype(dtype), self.shape)
+
+    def round(self, decimals=0, out=None) -> COO:
+        del out
+        return _prune(COO(
+            self.coords, numpy.around(self.data, decimals), self.shape))
+
+    def all(self) -> bool:
+        return self.nnz == self.size and bool(numpy.all(self.data))
+
+    def any(self) -> bool:
+        return bool(numpy.any(self.data))
+
+    def __neg__(self):
+        return COO(self.coords, -self.data, self.shape)
+
+    def __add__(self, other):
+        if not isinstance(other, COO) and numpy.ndim(other) == 0\
+                and other == 0:
+            return self
+        if not isinstance(other, COO):
+            return self.todense() + other
+        return _sum_duplicates(
+            numpy.concatenate([self.coords, other.coords], axis=1),
+            numpy.concatenate([self.data, other.data]), self.shape)
+
+    def __radd__(self, other):
+        return self + other if isinstance(other, COO)\
+            or numpy.ndim(other) == 0 and other == 0\
+            else other + self.todense()
+
+    def __sub__(self, other):
+        return self + (-other)
+
+    def __rsub__(self, other):
+        return (-self) + other
+
+    def __mul__(self, other):
+        if isinstance(other, COO) and not other.shape:
+            other = other.todense()[()]
+        if not isinstance(other, COO) and numpy.ndim(other) == 0:
+            return _prune(COO(self.coords, self.data * other, self.shape))
+        if not self.shape:
+            return other * self.todense()[()]
+        labels = tuple(range(self.ndim))
+        return _result(_pairwise(self, labels, _sparse(other), labels, labels))
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __truediv__(self, other):
+        return COO(self.coords, self.data / other, self.shape)
+
+
+def _ravel(coords, shape):
+    """ The linear index of each column of ``coords`` in a given ``shape``. """
+    strides = [prod(shape[i + 1:]) for i in range(len(shape))]
+    return numpy.dot(numpy.array(strides, dtype=numpy.intp), coords)\
+        if len(shape) else numpy.zeros(coords.shape[1], dtype=numpy.intp)
+
+
+def _unravel(linear, shape):
+    """ The coordinates of each linear index in a given ``shape``. """
+    linear, coords = numpy.asarray(linear, dtype=numpy.intp), []
+    for n in reversed(shape):
+        coords.append(linear % n)
+        linear = linear // n
+    return numpy.array(coords[::-1], dtype=numpy.intp).reshape(
+        len(shape), len(linear))
+
+
+def _sum_duplicates(coords, data, shape) -> COO:
+    """ Add up the entries with the same coordinates and drop the zeros. """
+    linear, inverse = numpy.unique(
+        _ravel(coords, shape), return_inverse=True)
+    result = numpy.zeros(len(linear), dtype=data.dtype)
+    numpy.add.at(result, inverse.reshape(-1), data)
+    return _prune(COO(_unravel(linear, shape), result, shape))
+
+
+def _prune(x: COO) -> COO:
+    """ Drop the entries that are zero. """
+    keep = x.data != 0
+    return x if keep.all() else COO(x.coords[:, keep], x.data[keep], x.shape)
+
+
+def _sparse(x) -> COO:
+    return x if isinstance(x, COO) else COO.from_dense(x)
+
+
+def _result(x: COO) -> COO | numpy.ndarray:
+    """ Densify an array with too many non-zero entries. """
+    return x.todense() if x.nnz > config.SPARSE_THRESHOLD * x.size else x
+
+
+def _single(x: COO, labels: tuple, keep: tuple) -> COO:
+    """
+    Take the diagonal of the repeated ``labels`` of ``x`` then sum over the
+    labels that are not in ``keep``, in the order of ``keep``.
+    """
+    first, mask = {}, numpy.ones(x.nnz, dtype=bool)
+    for i, label in enumerate(labels):
+        if label in first:
+            mask &= x.coords[i] == x.coords[first[label]]
+        else:
+            first[label] = i
+    axes = [first[label] for label in keep]
+    coords, data = x.coords[axes][:, mask], x.data[mask]
+    shape = tuple(x.shape[i] for i in axes)
+    if len(set(keep)) == len(first):
+        return COO(coords, data, shape)
+    return _sum_duplicates(coords, data, shape)
+
+
+def _join(x_keys, y_keys):
+    """ The pairs of positions in ``x_keys`` and ``y_keys`` that are equal. """
+    order = numpy.argsort(y_keys, kind="stable")
+    lo = numpy.searchsorted(y_keys, x_keys, "left", sorter=order)
+    hi = numpy.searchsorted(y_keys, x_keys, "right", sorter=order)
+    counts = hi - lo
+    x_index = numpy.repeat(numpy.arange(len(x_keys)), counts)
+    starts = numpy.repeat(lo - numpy.cumsum(counts) + counts, counts)
+    return x_index, order[numpy.arange(counts.sum()) + starts]
+
+
+def _pairwise(x: COO, x_labels: tuple, y: COO, y_labels: tuple,
+              labels: tuple) -> COO:
+    """ Contract two sparse arrays, as :func:`einsum` with explicit labels. """
+    x_keep = tuple(dict.fromkeys(
+        i for i in x_labels if i in y_labels or i in labels))
+    y_keep = tuple(dict.fromkeys(
+        i for i in y_labels if i in x_labels or i in labels))
+    x, y = _single(x, x_labels, x_keep), _single(y, y_labels, y_keep)
+    sizes = dict(zip(x_keep + y_keep, x.shape + y.shape))
+    shared = [i for i in x_keep if i in y_keep]
+    x_index, y_index = _join(*(
+        _ravel(z.coords[[keep.index(i) for i in shared]],
+               [sizes[i] for i in shared])
+        for z, keep in ((x, x_keep), (y, y_keep))))
+    coords = numpy.array([
+        x.coords[x_keep.index(i)][x_index] if i in x_keep
+        else y.coords[y_keep.index(i)][y_index] for i in labels],
+        dtype=numpy.intp).reshape(len(labels), len(x_index))
+    data = x.data[x_index] * y.data[y_index]
+    shape = tuple(map(sizes.get, labels))
+    if set(shared) <= set(labels):
+        return _prune(COO(coords, data, shape))
+    return _sum_duplicates(coords, data, shape)
+
+
+def array(x, dtype=None) -> COO | numpy.ndarray:
+    """
+    A sparse array, or a dense one if it has too many non-zero entries.
+
+    Parameters:
+        x : A sparse array or anything that NumPy can make an array of.
+        dtype : The data type of the entries.
+    """
+    if isinstance(x, COO):
+        return _result(x if dtype is None else x.astype(dtype))
+    x = numpy.array(x, dtype=dtype)
+    if numpy.count_nonzero(x != 0) > config.SPARSE_THRESHOLD * x.size:
+        return x
+    return COO.from_dense(x)
+
+
+def asarray(x, dtype=None) -> COO | numpy.ndarray:
+    """
+    An array without copying ``x`` if it is already a sparse or dense array
+    with the right data type, otherwise the same as :func:`array`.
+
+    Parameters:
+        x : A sparse array or anything that NumPy can make an array of.
+        dtype : The data type of the entries.
+    """
+    if isinstance(x, (COO, numpy.ndarray))\
+            and (dtype is None or x.dtype == numpy.dtype(dtype)):
+        return x
+    return array(x, dtype)
+
+
+def zeros(shape: int | tuple[int, ...], dtype=float) -> COO:
+    """ The sparse array with no non-zero entries. """
+    shape = (shape, ) if isinstance(shape, int) else tuple(shape)
+    return COO(numpy.zeros((len(shape), 0)), numpy.zeros(0, dtype), shape)
+
+
+def identity(n: int, dtype=None) -> COO | numpy.ndarray:
+    """ The identity matrix of size ``n``. """
+    return _result(COO([range(n), range(n)], numpy.ones(n, dtype), (n, n)))
+
+
+def matmul(a, b) -> COO | numpy.ndarray:
+    """ The product of two matrices. """
+    if isinstance(a, COO) or isinstance(b, COO):
+        if numpy.ndim(a) == numpy.ndim(b) == 2:
+            return tensordot(a, b, 1)
+        a, b = numpy.asarray(a), numpy.asarray(b)
+    return numpy.matmul(a, b)
+
+
+def tensordot(a, b, axes=2) -> COO | numpy.ndarray:
+    """ The contraction of two arrays along some ``axes``. """
+    if not isinstance(a, COO) and not isinstance(b, COO):
+        return numpy.tensordot(a, b, axes)
+    n, m = numpy.ndim(a), numpy.ndim(b)
+    if numpy.ndim(axes) == 0:
+        axes = (range(n - axes, n), range(axes))
+    a_axes, b_axes = ([i % k for i in (ax if numpy.ndim(ax) else [ax])]
+                      for ax, k in zip(axes, (n, m)))
+    a_labels, b_labels = list(range(n)), list(range(n, n + m))
+    for i, j in zip(a_axes, b_axes):
+        b_labels[j] = a_labels[i]
+    labels = [i for k, i in enumerate(a_labels) if k not in a_axes]\
+        + [j for k, j in enumerate(b_labels) if k not in b_axes]
+    return _result(_pairwise(
+        _sparse(a), tuple(a_labels), _sparse(b), tuple(b_labels),
+        tuple(labels)))
+
+
+def moveaxis(a, source, destination) -> COO | numpy.ndarray:
+    """ Move the ``source`` axes of an array to the ``destination``. """
+    if not isinstance(a, COO):
+        return numpy.moveaxis(a, source, destination)
+    source, destination = (
+        [i % a.ndim for i in (axes if numpy.ndim(axes) else [axes])]
+        for axes in (source, destination))
+    order = [i for i in range(a.ndim) if i not in source]
+    for i, j in sorted(zip(destination, source)):
+        order.insert(i, j)
+    return a.transpose(order)
+
+
+def conjugate(a) -> COO | numpy.ndarray:
+    """ The complex conjugate of an array. """
+    return a.conjugate() if isinstance(a, COO) else numpy.conjugate(a)
+
+
+def einsum(subscripts: str, *operands) -> COO | numpy.ndarray:
+    """
+    Contract arrays given the ``subscripts`` of each and of the result,
+    e.g. ``"ij,jk->ik"``, pair by pair from left to right.
+    """
+    if not any(isinstance(x, COO) for x in operands):
+        return numpy.einsum(subscripts, *operands)
+    if "->" not in subscripts or "." in subscripts:
+        return numpy.einsum(subscripts, *map(numpy.asarray, operands))
+    inputs, output = subscripts.replace(" ", "").split("->")
+    inputs = inputs.split(",")
+    result, labels = _sparse(operands[0]), inputs[0]
+    for i, (x, x_labels) in enumerate(zip(operands[1:], inputs[1:])):
+        later = set(output).union(*inputs[i + 2:])
+        keep = "".join(dict.fromkeys(
+            j for j in labels + x_labels if j in later))
+        result = _pairwise(result, labels, _sparse(x), x_labels, keep)
+        labels = keep
+    return _result(_single(result, labels, output))
+
+
+def __getattr__(attr):
+    return getattr(numpy, attr)
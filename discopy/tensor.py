@@ -14,6 +14,8 @@ Summary
     Dim
     Tensor
     Functor
+    Contraction
+    Cost
     Diagram
     Box
     Swap
@@ -22,18 +24,43 @@ Summary
     Spider
     Sum
     Bubble
+
+.. admonition:: Functions
+
+    .. autosummary::
+        :template: function.rst
+        :nosignatures:
+        :toctree:
+
+        einsum
+        contraction_path
+        connected_components
+        contraction_cost
+        contraction_slices
 """
 
 from __future__ import annotations
 
+from collections import Counter, defaultdict
+from collections.abc import Callable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from functools import lru_cache
+from heapq import heappop, heappush
+from itertools import accumulate, chain, product as cartesian
+from math import prod
+from string import ascii_letters
+
 from discopy import (
-    cat, monoidal, rigid, symmetric, frobenius)
+    cat, monoidal, rigid, symmetric, frobenius, config, messages)
 from discopy.cat import factory, assert_iscomposable
 from discopy.frobenius import Ty, Cup, Category
 from discopy.matrix import Matrix, backend
 from discopy.monoidal import assert_isatomic
 from discopy.rigid import assert_isadjoint
-from discopy.utils import factory_name, assert_isinstance, product
+from discopy.utils import (
+    factory_name, assert_isinstance, product, LazyMapping)
 
 
 @factory
@@ -73,6 +100,7 @@ class Tensor(Matrix):
         inside : The array inside the tensor.
         dom : The domain dimension.
         cod : The codomain dimension.
+        batch : The size of the leading batch axis of the array, if any.
 
     .. admonition:: Summary
 
@@ -100,6 +128,16 @@ class Tensor(Matrix):
     >>> v >> m >> v.dagger()
     Tensor([0], dom=Dim(1), cod=Dim(1))
 
+    Given a ``batch`` size, the array has a leading axis of that size and
+    the tensors in the batch are composed and tensored with others in one go.
+
+    >>> import numpy as np
+    >>> vs = Tensor(np.array([[1, 0], [0, 1], [1, 1]]), Dim(1), Dim(2), 3)
+    >>> vs
+    Tensor([1, 0, 0, 1, 1, 1], dom=Dim(1), cod=Dim(2), batch=3)
+    >>> vs >> m >> v.dagger()
+    Tensor([1, 0, 1], dom=Dim(1), cod=Dim(1), batch=3)
+
     Notes
     -----
     Tensors can have sympy symbols as free variables.
@@ -127,12 +165,39 @@ class Tensor(Matrix):
         """ We need a fresh cache for Tensor. """
         return Matrix.__class_getitem__.__func__(cls, dtype, _cache)
 
-    def __init__(self, array, dom: Dim, cod: Dim):
+    def __init__(self, array, dom: Dim, cod: Dim, batch: int = None):
         assert_isinstance(dom, Dim)
         assert_isinstance(cod, Dim)
-        super().__init__(array, product(dom.inside), product(cod.inside))
-        self.array = self.array.reshape(dom.inside + cod.inside)
-        self.dom, self.cod = dom, cod
+        super().__init__(
+            array, (batch or 1) * product(dom.inside), product(cod.inside))
+        self.array = self.array.reshape(
+            (batch, ) * (batch is not None) + dom.inside + cod.inside)
+        self.dom, self.cod, self.batch = dom, cod, batch
+
+    @classmethod
+    def _wrap(cls, array, dom: Dim, cod: Dim, batch: int = None) -> Tensor:
+        """
+        Wrap a backend array in a tensor without copying it, unless it needs
+        a different data type, the reshaping being a view whenever possible.
+
+        This is used for the results of :meth:`then`, :meth:`tensor`,
+        :meth:`dagger` and :class:`Functor`, i.e. for arrays that are freshly
+        computed or views of the inputs, see :meth:`Matrix._wrap`.
+        """
+        result = cls.__new__(cls)
+        result.dom, result.cod, result.batch = dom, cod, batch
+        with backend() as np:
+            result.array = np.asarray(array, dtype=cls.dtype).reshape(
+                (batch, ) * (batch is not None) + dom.inside + cod.inside)
+        return result
+
+    def __eq__(self, other):
+        return getattr(other, "batch", None) == self.batch\
+            and super().__eq__(other)
+
+    def __repr__(self):
+        return super().__repr__() if self.batch is None\
+            else super().__repr__()[:-1] + f", batch={self.batch})"
 
     @classmethod
     def id(cls, dom=Dim(1)) -> Tensor:
@@ -143,17 +208,31 @@ class Tensor(Matrix):
             return super().then(other, *others)
         assert_isinstance(other, type(self))
         assert_iscomposable(self, other)
+        if self.batch is not None or other.batch is not None:
+            n, m, k = len(self.dom), len(self.cod), len(other.cod)
+            array, batch = _batched(
+                [range(n + m), range(n, n + m + k)],
+                chain(range(n), range(n + m, n + m + k)), self, other)
+            return type(self)._wrap(array, self.dom, other.cod, batch)
         with backend() as np:
             array = np.tensordot(self.array, other.array, len(self.cod))\
                 if self.array.shape and other.array.shape\
                 else self.array * other.array
-        return type(self)(array, self.dom, other.cod)
+        return type(self)._wrap(array, self.dom, other.cod)
 
     def tensor(self, other: Tensor = None, *others: Tensor) -> Tensor:
         if other is None or others:
             return Diagram.tensor(self, other, *others)
         assert_isinstance(other, Tensor)
         dom, cod = self.dom @ other.dom, self.cod @ other.cod
+        if self.batch is not None or other.batch is not None:
+            n, m = len(self.dom @ self.cod), len(dom @ cod)
+            sd, od = len(self.dom), n + len(other.dom)
+            array, batch = _batched(
+                [range(n), range(n, m)],
+                chain(range(sd), range(n, od), range(sd, n), range(od, m)),
+                self, other)
+            return type(self)._wrap(array, dom, cod, batch)
         source = range(len(dom @ cod))
         target = [
             i if i < len(self.dom) or i >= len(self.dom @ other.dom @ self.cod)
@@ -164,15 +243,17 @@ class Tensor(Matrix):
                 if self.array.shape and other.array.shape\
                 else self.array * other.array
             array = np.moveaxis(array, source, target)
-        return type(self)(array, dom, cod)
+        return type(self)._wrap(array, dom, cod)
 
     def dagger(self) -> Tensor:
-        source = range(len(self.dom @ self.cod))
-        target = [i + len(self.cod) if i < len(self.dom) else
-                  i - len(self.dom) for i in range(len(self.dom @ self.cod))]
+        offset = int(self.batch is not None)
+        source = range(offset, offset + len(self.dom @ self.cod))
+        target = [i + len(self.cod) if i < offset + len(self.dom) else
+                  i - len(self.dom) for i in source]
         with backend() as np:
-            array = np.conjugate(np.moveaxis(self.array, source, target))
-        return type(self)(array, self.cod, self.dom)
+            array = np.moveaxis(self.array, source, target)
+            array = array if _is_real(self.dtype) else np.conjugate(array)
+        return type(self)._wrap(array, self.cod, self.dom, self.batch)
 
     @classmethod
     def cup_factory(cls, left: Dim, right: Dim) -> Tensor:
@@ -207,10 +288,10 @@ class Tensor(Matrix):
         assert_isatomic(typ, Dim)
         n, = typ.inside
         dom, cod = typ ** n_legs_in, typ ** n_legs_out
-        result = cls.zero(dom, cod)
-        for i in range(n):
-            result.array[len(dom @ cod) * (i, )] = 1
-        return result
+        array = cls.zero(dom, cod).array.reshape(-1)
+        # The diagonal of a copy tensor is evenly spaced in the flat array.
+        array[::sum(n ** i for i in range(len(dom @ cod))) or 1] = 1
+        return cls(array, dom, cod)
 
     @classmethod
     def spiders(cls, n_legs_in: int, n_legs_out: int, typ: Dim, phase=None
@@ -234,7 +315,7 @@ class Tensor(Matrix):
         ----
         This is *not* the same as the algebraic transpose for non-atomic dims.
         """
-        return type(self)(
+        return type(self)._wrap(
             self.array.transpose(), self.cod[::-1], self.dom[::-1])
 
     l = r = property(transpose)
@@ -257,8 +338,9 @@ class Tensor(Matrix):
         target = [
             len(self.dom) - i - 1 for i in range(len(self.dom @ self.cod))]
         with backend() as np:
-            array = np.conjugate(np.moveaxis(self.array, source, target))
-        return type(self)(array, self.dom[::-1], self.cod[::-1])
+            array = np.moveaxis(self.array, source, target)
+            array = array if _is_real(self.dtype) else np.conjugate(array)
+        return type(self)._wrap(array, self.dom[::-1], self.cod[::-1])
 
     @classmethod
     def zero(cls, dom: Dim, cod: Dim) -> Tensor:
@@ -313,6 +395,7 @@ class Functor(frobenius.Functor):
         ar : The arrow mapping.
         dom : The domain of the functor.
         dtype : The datatype for the codomain ``Category(Dim, Tensor[dtype])``.
+        cache_size : The size of the cache for images of objects and boxes.
 
     Example
     -------
@@ -340,15 +423,25 @@ class Functor(frobenius.Functor):
         :align: center
 
     >>> assert F(diagram) == F(rewrite)
+
+    Note
+    ----
+    Diagrams are compiled to one :func:`einsum` where cups, caps, swaps and
+    spiders become identifications of indices. Thus the boxes are contracted
+    in the order of :func:`contraction_path` rather than layer by layer.
+
+    >>> cup = Tensor[bool].cups(Dim(2), Dim(2))
+    >>> assert F(diagram) == F(Alice @ loves @ Bob) >> cup @ F(s) @ cup
     """
     dom, cod = frobenius.Category(), Category(Dim, Tensor)
 
     def __init__(
             self, ob: dict[cat.Ob, Dim], ar: dict[cat.Box, array],
-            dom: cat.Category = None, dtype: type = int):
+            dom: cat.Category = None, dtype: type = int,
+            cache_size: int | None = 0):
         self.dom, self.dtype = dom or type(self).dom, dtype
         cod = Category(type(self).cod.ob, type(self).cod.ar[dtype])
-        super().__init__(ob, ar, cod)
+        super().__init__(ob, ar, cod, cache_size)
 
     def __repr__(self):
         return factory_name(type(self)) + f"(ob={self.ob}, ar={self.ar}, "\
@@ -361,35 +454,453 @@ class Functor(frobenius.Functor):
             return self(other.arg).map(other.func)
         if isinstance(other, (cat.Ob, cat.Box)):
             return super().__call__(other)
-        assert_isinstance(other, monoidal.Diagram)
-        dim = lambda scan: len(self(scan))
-        scan, array = other.dom, Tensor.id(self(other.dom)).array
-        for box, off in zip(other.boxes, other.offsets):
-            if isinstance(box, symmetric.Swap):
-                source = range(
-                    dim(other.dom @ scan[:off]),
-                    dim(other.dom @ scan[:off] @ box.dom))
-                target = [
-                    i + dim(box.right)
-                    if i < dim(other.dom @ scan[:off]) + dim(box.left)
-                    else i - dim(box.left) for i in source]
-                with backend() as np:
-                    array = np.moveaxis(array, list(source), list(target))
-                scan = scan[:off] @ box.cod @ scan[off + len(box.dom):]
-                continue
-            left = dim(scan[:off])
-            source = list(range(dim(other.dom) + left,
-                                dim(other.dom) + left + dim(box.dom)))
-            target = list(range(dim(box.dom)))
-            with backend() as np:
-                array = np.tensordot(array, self(box).array, (source, target))
-            source = range(len(array.shape) - dim(box.cod), len(array.shape))
-            target = range(dim(other.dom) + left,
-                           dim(other.dom) + left + dim(box.cod))
-            with backend() as np:
-                array = np.moveaxis(array, list(source), list(target))
-            scan = scan[:off] @ box.cod @ scan[off + len(box.dom):]
-        return self.cod.ar(array, self(other.dom), self(other.cod))
+        assert_isinstance(
+            other, (monoidal.Diagram, monoidal.PackedDiagram))
+        plan = self._compile(other)
+        return plan(LazyMapping(plan.boxes, self._image), dtype=self.dtype)
+
+    def _compile(self, diagram: monoidal.Diagram) -> Contraction:
+        image = lambda typ: [Dim(x) for x in typ.inside]\
+            if isinstance(typ, Dim) else list(map(self._image, typ.inside))
+        return Contraction.from_diagram(diagram, image, self._delta)
+
+    def _delta(self, box: monoidal.Box) -> tuple[tuple[int, ...], ...] | None:
+        """
+        The axes identified by the image of a box if it is a product of copy
+        tensors, see :meth:`Contraction.from_diagram`, ``None`` by default.
+        """
+        return None
+
+    def cost(self, other: monoidal.Diagram, max_memory: int = None) -> Cost:
+        """
+        Estimate the cost of evaluating a diagram, with the same contraction
+        path but without calling the arrow mapping nor allocating arrays.
+
+        Parameters:
+            other : The diagram to evaluate.
+            max_memory : The maximum number of bytes in intermediate arrays.
+
+        Example
+        -------
+        Only the object mapping is needed, i.e. a dimension for each type.
+
+        >>> n, s = map(rigid.Ty, "ns")
+        >>> Alice = rigid.Box('Alice', rigid.Ty(), n)
+        >>> Bob = rigid.Box('Bob', rigid.Ty(), n)
+        >>> loves = rigid.Box('loves', rigid.Ty(), n.r @ s @ n.l)
+        >>> diagram = Alice @ loves @ Bob\\
+        ...     >> rigid.Cup(n, n.r) @ s @ rigid.Cup(n.l, n)
+        >>> F = Functor(ob={s: 1, n: 100}, ar={}, dom=rigid.Category())
+        >>> F.cost(diagram)
+        Cost(flops=10100, memory=808, slices=1, output=8)
+        """
+        return self._compile(other).cost(max_memory, self.dtype)
+
+
+class Contraction:
+    """
+    A contraction is a tensor diagram compiled to an :func:`einsum`, it holds
+    the indices of each box and the contraction path, computed only once.
+
+    Parameters:
+        boxes : The boxes of the diagram, one for each operand.
+        inputs : The indices of each box, then those of identity matrices.
+        output : The indices of the domain, then those of the codomain.
+        sizes : The size of each index.
+        dom : The domain of the diagram.
+        cod : The codomain of the diagram.
+
+    Example
+    -------
+    >>> x = Dim(2)
+    >>> f, g = Box('f', x, x), Box('g', x, x)
+    >>> plan = (f >> g).compile()
+    >>> plan({f: [0, 1, 1, 0], g: [1, 2, 3, 4]})
+    Tensor([3, 4, 1, 2], dom=Dim(2), cod=Dim(2))
+
+    A contraction can also be called on a flat vector of parameters, with the
+    entries of each box in order of first appearance.
+
+    >>> plan([0, 1, 1, 0, 1, 2, 3, 4])
+    Tensor([3, 4, 1, 2], dom=Dim(2), cod=Dim(2))
+
+    Note
+    ----
+    Contractions are cached by the shape of the diagram, i.e. with the boxes
+    forgotten, so that diagrams with the same skeleton share their indices.
+
+    >>> assert (g >> f).compile().inputs is plan.inputs
+    """
+    def __init__(self, boxes: list[Box], inputs: tuple[tuple[int, ...], ...],
+                 output: tuple[int, ...], sizes: tuple[int, ...],
+                 dom: Dim, cod: Dim):
+        self.boxes, self.inputs, self.output = boxes, inputs, output
+        self.sizes, self.dom, self.cod = sizes, dom, cod
+
+    def __repr__(self):
+        return factory_name(type(self)) + f"(boxes={self.boxes}, "\
+            f"inputs={self.inputs}, output={self.output}, "\
+            f"sizes={self.sizes}, dom={self.dom}, cod={self.cod})"
+
+    @property
+    def path(self) -> tuple[tuple[int, int, tuple[int, ...]], ...]:
+        """ The contraction path, see :func:`contraction_path`. """
+        return contraction_path(self.inputs, self.output, self.sizes)
+
+    def slices(self, max_memory: int = None, dtype: type = None) -> tuple[
+            tuple[int, ...], tuple[tuple[int, int, tuple[int, ...]], ...]]:
+        """
+        The indices to slice and the path for each slice, so that the
+        intermediate arrays fit in ``max_memory`` bytes if given, see
+        :func:`contraction_slices`.
+
+        Parameters:
+            max_memory : The maximum number of bytes in intermediate arrays.
+            dtype : The data type of the arrays.
+        """
+        if max_memory is None:
+            return (), self.path
+        max_size = max_memory // _itemsize(dtype or Tensor.dtype)
+        return contraction_slices(
+            self.inputs, self.output, self.sizes, max_size)
+
+    def cost(self, max_memory: int = None, dtype: type = None) -> Cost:
+        """
+        Estimate the cost of the contraction without running it.
+
+        Parameters:
+            max_memory : The maximum number of bytes in intermediate arrays.
+            dtype : The data type of the arrays.
+
+        Example
+        -------
+        >>> x = Dim(10)
+        >>> f, g, h = Box('f', x, x), Box('g', x, x), Box('h', x, x)
+        >>> plan = (Cap(x, x) >> (f >> g >> h) @ x >> Cup(x, x)).compile()
+        >>> plan.cost(dtype=float)
+        Cost(flops=1100, memory=808, slices=1, output=8)
+        >>> plan.cost(max_memory=100, dtype=float)
+        Cost(flops=1100, memory=88, slices=10, output=8)
+        """
+        dtype = dtype or Tensor.dtype
+        sliced, path = self.slices(max_memory, dtype)
+        sizes = tuple(
+            1 if i in sliced else n for i, n in enumerate(self.sizes))
+        flops, peak = contraction_cost(self.inputs, self.output, sizes, path)
+        itemsize, slices = _itemsize(dtype), prod(
+            self.sizes[i] for i in sliced)
+        output = prod(self.sizes[i] for i in self.output) * itemsize
+        return Cost(flops * slices, peak * itemsize, slices, output)
+
+    @property
+    def shapes(self) -> dict[Box, tuple[int, ...]]:
+        """ The shape of the array for each box, in order of appearance. """
+        return {box: tuple(self.sizes[i] for i in labels)
+                for box, labels in zip(self.boxes, self.inputs)}
+
+    @classmethod
+    def from_diagram(
+            cls, diagram: monoidal.Diagram,
+            image: Callable[[monoidal.Ty], list[Dim]] = None,
+            delta: Callable[[monoidal.Box], tuple[tuple[int, ...], ...]] = None
+    ) -> Contraction:
+        """
+        Compile a diagram given the dimension for each wire of a type.
+
+        Parameters:
+            diagram : The diagram to compile.
+            image : The dimension of each wire, the identity by default.
+            delta : The axes identified by a box if it is a product of copy
+                    tensors, i.e. a tuple of groups of positions among the
+                    axes of its domain then codomain, or ``None`` otherwise.
+
+        Note
+        ----
+        Swaps, cups, caps, spiders and the boxes given by ``delta`` are never
+        materialised, they only merge and relabel the indices of the others.
+
+        >>> x = Dim(2)
+        >>> copy = Box('copy', x, x @ x, [1, 0, 0, 0, 0, 0, 0, 1])
+        >>> f = Box('f', x, x, [1, 2, 3, 4])
+        >>> plan = Contraction.from_diagram(
+        ...     copy >> f @ x, delta=lambda box: box == copy and ((0, 1, 2), ))
+        >>> plan.boxes
+        [tensor.Box('f', Dim(2), Dim(2), data=[1, 2, 3, 4])]
+        >>> assert plan() == (copy >> f @ x).eval()
+        """
+        image = image or (lambda typ: [Dim(x) for x in typ.inside])
+        boxes, layers = [], []
+        for box, offset in zip(diagram.boxes, diagram.offsets):
+            kind, extra = "box", delta and delta(box) or None
+            if extra is not None:
+                kind = "delta"
+            elif isinstance(box, symmetric.Swap):
+                kind, extra = "swap", len(box.left)
+            elif isinstance(box, (rigid.Cup, rigid.Cap)):
+                kind = "cup" if isinstance(box, rigid.Cup) else "cap"
+            elif isinstance(box, frobenius.Spider):
+                kind, extra = "spider", image(box.typ)[0]
+            else:
+                boxes.append(box)
+            layers.append((kind, offset, extra,
+                           tuple(image(box.dom)), tuple(image(box.cod))))
+        dom, cod = map(tuple, map(image, (diagram.dom, diagram.cod)))
+        return cls(boxes, *_compile(dom, tuple(layers)),
+                   Dim(1).tensor(*dom), Dim(1).tensor(*cod))
+
+    def __call__(self, params: Mapping[Box, array] | array = None,
+                 dtype: type = None, threads: int = None,
+                 max_memory: int = None) -> Tensor:
+        """
+        Evaluate the contraction on a mapping from boxes to arrays, or on a
+        flat vector of parameters. By default, use the arrays of the boxes.
+
+        Parameters:
+            params : The arrays for each box, or a flat vector.
+            dtype : The data type of the result.
+            threads : The number of threads on which to contract the
+                connected components of the diagram, sequential by default.
+            max_memory : The maximum number of bytes in intermediate arrays,
+                above which the contraction is sliced, see :meth:`cost`.
+
+        Note
+        ----
+        Tensors with a batch, or a matrix of parameters with one row for
+        each element of the batch, are evaluated in one contraction.
+
+        >>> import numpy as np
+        >>> x = Dim(2)
+        >>> f, g = Box('f', x, x), Box('g', x, x)
+        >>> plan = (f >> g).compile()
+        >>> plan({f: Tensor([0, 1, 1, 0, 1, 0, 0, 1], x, x, batch=2),
+        ...       g: [1, 2, 3, 4]})
+        Tensor([3, 4, 1, 2, 1, 2, 3, 4], dom=Dim(2), cod=Dim(2), batch=2)
+        >>> plan(np.array([[0, 1, 1, 0, 1, 2, 3, 4],
+        ...                [1, 0, 0, 1, 1, 2, 3, 4]]))
+        Tensor([3, 4, 1, 2, 1, 2, 3, 4], dom=Dim(2), cod=Dim(2), batch=2)
+        """
+        dtype = dtype or Tensor.dtype
+        factory, tensors = Tensor[dtype], self._tensors(params, dtype)
+        if not tensors:
+            return factory(factory.id().array, self.dom, self.cod)
+        if any(tensor.batch is not None for tensor in tensors):
+            max_size = max_memory and max_memory // _itemsize(dtype)
+            array, batch = _batched(self.inputs, self.output, *tensors,
+                                    threads=threads, max_size=max_size)
+            return factory._wrap(array, self.dom, self.cod, batch)
+        sliced, path = self.slices(max_memory, dtype)
+        array = _sliced(self.inputs, self.output, self.sizes, sliced, path,
+                        [tensor.array for tensor in tensors], threads)
+        return factory._wrap(array, self.dom, self.cod)
+
+    def grad(self, params: Mapping[Box, array] | array = None,
+             cotangent: array = None, dtype: type = None
+             ) -> dict[Box, array] | array:
+        """
+        The gradient of the contraction with respect to the array of each box,
+        or to a flat vector of parameters, computed in reverse mode.
+
+        The intermediate arrays of the path are kept, then each step is run
+        backwards with two contractions, i.e. about twice the cost of one
+        evaluation for the gradients of all the boxes at once.
+
+        Parameters:
+            params : The arrays for each box, or a flat vector.
+            cotangent : The array with which to contract the result, all ones
+                by default, i.e. we compute the gradient of the sum of its
+                entries, which is the usual gradient for scalar diagrams.
+            dtype : The data type of the arrays.
+
+        Returns:
+            gradients : The gradient for each box, or a flat vector if given
+                flat ``params``, of the same shape as the box or parameters.
+                Tensors with a batch get one gradient for each element of
+                the batch, the others get the sum over the batch, all in the
+                same backward pass with the batch as one more index.
+
+        Example
+        -------
+        >>> import numpy as np
+        >>> x = Dim(2)
+        >>> v, f, w = Box('v', Dim(1), x), Box('f', x, x), Box('w', x, Dim(1))
+        >>> plan = (v >> f >> f >> w).compile()
+        >>> params = np.array([1., 2., 1., 2., 3., 4., 1., -1.])
+        >>> plan(params, dtype=float)
+        Tensor[float]([-17.], dom=Dim(1), cod=Dim(1))
+        >>> plan.grad(params, dtype=float)
+        array([ -3.,  -7.,   6.,  -8.,   8., -12.,  37.,  54.])
+
+        The entries of ``f`` get gradients from both of its occurrences, and
+        the contraction is multilinear, so we can check the result as follows.
+
+        >>> assert np.dot(plan.grad(params, dtype=float), params) == 4 * -17
+        """
+        dtype = dtype or Tensor.dtype
+        tensors = self._tensors(params, dtype)
+        batches = sorted({tensor.batch for tensor in tensors} - {None})
+        if len(batches) > 1:
+            raise ValueError(messages.BATCH_MISMATCH.format(*batches[:2]))
+        inputs, output, path = self.inputs, self.output, self.path
+        shape = tuple(self.sizes[i] for i in output)
+        if batches:
+            batch, = batches
+            inputs, output, path = _batch_labels(
+                inputs, output, path, [t.batch is not None for t in tensors])
+            shape = (batch, ) + shape
+        with backend() as np:
+            cotangent = np.ones(shape, dtype) if cotangent is None\
+                else np.reshape(getattr(cotangent, "array", cotangent), shape)
+            gradients = _gradient(inputs, output, path,
+                                  [tensor.array for tensor in tensors],
+                                  cotangent)
+            result = {}
+            for box, gradient in zip(self.boxes, gradients):
+                result[box] = result[box] + gradient if box in result\
+                    else gradient
+            if params is None or isinstance(params, Mapping):
+                return result
+            if batches:
+                return np.concatenate([
+                    np.reshape(result[box], (batch, -1))
+                    for box in self.shapes], axis=1)
+            return np.concatenate([
+                np.reshape(result[box], -1) for box in self.shapes])
+
+    def _tensors(self, params: Mapping[Box, array] | array,
+                 dtype: type) -> list[Tensor]:
+        """ The tensor for each box, then the identity of each open wire. """
+        batch, factory, shapes = None, Tensor[dtype], self.shapes
+        if params is None:
+            params = LazyMapping(shapes, Functor(
+                lambda x: x, lambda f: factory(f.array, f.dom, f.cod, f.batch),
+                dtype=dtype))
+        elif not isinstance(params, Mapping):
+            if len(getattr(params, "shape", ())) == 2:
+                batch, length = params.shape
+            else:
+                length = len(params)
+            sizes = list(accumulate(map(prod, shapes.values()), initial=0))
+            if sizes[-1] != length:
+                raise ValueError(messages.WRONG_PARAMETERS.format(
+                    sizes[-1], length))
+            params = dict(zip(shapes, (
+                params[i:j] if batch is None else params[:, i:j]
+                for i, j in zip(sizes, sizes[1:]))))
+        tensors = {}
+        for box, shape in shapes.items():
+            value = params[box]
+            # Arrays for a batch of boxes are given as tensors with a batch.
+            tensors[box] = factory._wrap(
+                value.array, Dim(1), Dim(*shape), value.batch)\
+                if isinstance(value, Tensor) else factory._wrap(
+                    value, Dim(1), Dim(*shape), batch)
+        return [tensors[box] for box in self.boxes] + [
+            factory.id(Dim(self.sizes[i]))
+            for i, _ in self.inputs[len(self.boxes):]]
+
+
+@dataclass
+class Cost:
+    """
+    The estimated cost of a contraction, computed without allocating arrays.
+
+    Parameters:
+        flops : The number of multiply-adds, summed over all the slices.
+        memory : The peak number of bytes held in intermediate arrays.
+        slices : The number of slices, see :func:`contraction_slices`.
+        output : The number of bytes of the result.
+    """
+    flops: int
+    memory: int
+    slices: int = 1
+    output: int = 0
+
+
+def _itemsize(dtype: type) -> int:
+    """ The number of bytes for each entry of a given ``dtype``. """
+    with backend('numpy') as np:
+        return np.dtype(dtype).itemsize
+
+
+@lru_cache(maxsize=config.CONTRACTION_CACHE_SIZE)
+def _compile(dom, layers):
+    """
+    The indices of the boxes in a diagram, given the dimensions of its domain
+    and for each layer: its kind, offset, extra data and dimensions.
+    """
+    # Each wire is a tuple of indices, one for each axis of its image.
+    parent, sizes, inputs = [], [], []
+
+    def fresh(dim: Dim) -> tuple[int, ...]:
+        parent.extend(range(len(parent), len(parent) + len(dim)))
+        sizes.extend(dim.inside)
+        return tuple(range(len(parent) - len(dim), len(parent)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = i = parent[parent[i]]
+        return i
+
+    def identify(*wires: tuple[int, ...]):
+        for i, j in zip(wires, wires[1:]):
+            for x, y in zip(i, j):
+                parent[find(x)] = find(y)
+
+    wires = list(map(fresh, dom))
+    dom = sum(wires, ())
+    for kind, offset, extra, box_dom, box_cod in layers:
+        legs = wires[offset:offset + len(box_dom)]
+        if kind == "swap":
+            cod = legs[extra:] + legs[:extra]
+        elif kind == "cup":
+            assert_isadjoint(*box_dom)
+            identify(legs[0], legs[1][::-1])
+            cod = []
+        elif kind == "cap":
+            assert_isadjoint(*box_cod)
+            left = fresh(box_cod[0])
+            cod = [left, left[::-1]]
+        elif kind == "spider":
+            identify(*legs)
+            # A spider with no legs is the scalar one, as in spider_factory.
+            cod = len(box_cod) * [legs[0] if legs else fresh(extra)]\
+                if legs or box_cod else []
+        elif kind == "delta":
+            axes, cod = sum(legs, ()), sum((x.inside for x in box_cod), ())
+            labels = list(axes) + list(cod)
+            for group in extra:
+                inside = [labels[i] for i in group if i < len(axes)]
+                identify(*((i, ) for i in inside))
+                label = inside[0] if inside\
+                    else fresh(Dim(cod[group[0] - len(axes)]))[0]
+                for i in group:
+                    labels[i] = label
+            labels = iter(labels[len(axes):])
+            cod = [tuple(next(labels) for _ in x.inside) for x in box_cod]
+        else:
+            cod = list(map(fresh, box_cod))
+            inputs.append(sum(legs + cod, ()))
+        wires[offset:offset + len(box_dom)] = cod
+    inputs = [tuple(map(find, labels)) for labels in inputs]
+    output = list(map(find, dom + sum(wires, ())))
+    used, seen = set().union(*inputs), set()
+    loops = sorted(set(map(find, range(len(parent)))) - used - set(output))
+    # Open wires and loops are contracted with identity matrices.
+    for p, i in chain(enumerate(output), ((None, i) for i in loops)):
+        if p is not None and i in used and i not in seen:
+            seen.add(i)
+            continue
+        j, = fresh(Dim(sizes[i]))
+        if p is not None:
+            output[p] = j
+        inputs.append((i, j))
+        used.add(i)
+    index = {}  # Indices are renamed in order of appearance.
+    for i in chain(*inputs, output):
+        index.setdefault(i, len(index))
+    inputs = tuple(tuple(map(index.get, labels)) for labels in inputs)
+    return inputs, tuple(map(index.get, output)), tuple(
+        sizes[i] for i in index)
 
 
 @factory
@@ -406,13 +917,19 @@ class Diagram(frobenius.Diagram):
     """
     ty_factory = Dim
 
-    def eval(self, contractor: Callable = None, dtype: type = None) -> Tensor:
+    def eval(self, contractor: Callable = None, dtype: type = None,
+             threads: int = None, max_memory: int = None) -> Tensor:
         """
         Evaluate a tensor diagram as a :class:`Tensor`.
 
         Parameters:
             contractor : Use ``tensornetwork`` or :class:`Functor` by default.
             dtype : Used for spiders.
+            threads : The number of threads on which to contract the
+                connected components of the diagram, sequential by default.
+            max_memory : The maximum number of bytes in intermediate arrays,
+                above which the contraction is sliced, see
+                :meth:`Contraction.cost`.
 
         Examples
         --------
@@ -420,14 +937,67 @@ class Diagram(frobenius.Diagram):
         >>> assert (vector >> vector[::-1]).eval().array == 1
         >>> from tensornetwork.contractors import auto
         >>> assert (vector >> vector[::-1]).eval(auto).array == 1
+
+        Boxes with a leading batch axis give a batch of tensors, evaluated
+        with only one contraction.
+
+        >>> vectors = Box('vectors', Dim(1), Dim(2), [0, 1, 1, 1], batch=2)
+        >>> (vectors >> vector[::-1]).eval()
+        Tensor([1, 1], dom=Dim(1), cod=Dim(1), batch=2)
+
+        Disconnected diagrams, e.g. sentences side by side, are contracted one
+        component at a time, in parallel if given a number of ``threads``.
+
+        >>> assert (vector @ vector).eval(threads=2)\\
+        ...     == (vector @ vector).eval() == vector.eval() @ vector.eval()
         """
         dtype = dtype or Tensor.dtype
+        if contractor is None and (threads or max_memory is not None):
+            return self.compile()(
+                dtype=dtype, threads=threads, max_memory=max_memory)
         if contractor is None:
-            return Functor(
-                ob=lambda x: x, ar=lambda f: f.array, dtype=dtype)(self)
+            return Functor(ob=lambda x: x, ar=lambda f: Tensor[dtype](
+                f.array, f.dom, f.cod, f.batch), dtype=dtype)(self)
         array = contractor(*self.to_tn(dtype=dtype)).tensor
         return Tensor[dtype](array, self.dom, self.cod)
 
+    def compile(self) -> Contraction:
+        """
+        Compile a tensor diagram to a :class:`Contraction`, which can be
+        evaluated many times with different arrays for the boxes.
+
+        Example
+        -------
+        >>> x = Dim(2)
+        >>> alice, bob = Box('alice', Dim(1), x, [1, 2]), Box('bob', x, x)
+        >>> plan = (alice >> bob).compile()
+        >>> for data in [[1, 0, 0, 1], [0, 1, 1, 0]]:
+        ...     print(plan({alice: [1, 2], bob: data}))
+        Tensor([1, 2], dom=Dim(1), cod=Dim(2))
+        Tensor([2, 1], dom=Dim(1), cod=Dim(2))
+        """
+        return Contraction.from_diagram(self)
+
+    def cost(self, dtype: type = None, max_memory: int = None) -> Cost:
+        """
+        Estimate the cost of :meth:`eval` without allocating any array, see
+        :meth:`Functor.cost` for diagrams of other types.
+
+        Parameters:
+            dtype : The data type of the arrays.
+            max_memory : The maximum number of bytes in intermediate arrays.
+
+        Example
+        -------
+        >>> x = Dim(1000)
+        >>> f, v = Box('f', x, x), Box('v', Dim(1), x)
+        >>> (v >> f >> f).cost(dtype=float)
+        Cost(flops=2000000, memory=16000, slices=1, output=8000)
+        >>> (f >> f >> v[::-1]).cost(dtype=float).flops
+        2000000
+        """
+        return self.compile().cost(max_memory, dtype)
+
     def to_tn(self, dtype: type = None) -> tuple[
             list["tensornetwork.Node"], list["tensornetwork.Edge"]]:
         """
@@ -527,15 +1097,51 @@ class Box(frobenius.Box, Diagram):
         cod : The codomain of the box, i.e. its output dimension.
         data : The array inside the tensor box.
         dtype : The datatype for the entries of the array.
+        batch : The size of the leading batch axis of the data, if any.
+
+    Example
+    -------
+    >>> f = Box('f', Dim(2), Dim(2), list(range(8)), batch=2)
+    >>> f.array.shape
+    (2, 2, 2)
+    >>> Box('f', Dim(2), Dim(2), list(range(8))).array
+    Traceback (most recent call last):
+    ...
+    ValueError: cannot reshape array of size 8 into shape (2,2)
     """
     __ambiguous_inheritance__ = (frobenius.Box, )
+    batch = None
+
+    def __init__(self, name: str, dom: Dim, cod: Dim, data=None,
+                 batch: int = None, **params):
+        if batch is not None:
+            self.batch = batch
+        super().__init__(name, dom, cod, data=data, **params)
+
+    def __eq__(self, other):
+        return super().__eq__(other)\
+            and getattr(other, "batch", None) == self.batch
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return super().__repr__() if self.batch is None or self.is_dagger\
+            else super().__repr__()[:-1] + f", batch={self.batch})"
 
     @property
     def array(self):
         if self.data is not None:
             with backend() as np:
                 return np.array(self.data).reshape(
-                    self.dom.inside + self.cod.inside)
+                    (self.batch, ) * (self.batch is not None)
+                    + self.dom.inside + self.cod.inside)
+
+    def dagger(self) -> Box:
+        result = super().dagger()
+        if self.batch is not None:
+            result.batch = self.batch
+        return result
 
     def grad(self, var, **params):
         return self.bubble(
@@ -688,6 +1294,567 @@ class Bubble(monoidal.Bubble, Box):
             @ self.arg.grad(var) >> Spider(2, 1, self.cod)
 
 
+def einsum(inputs: list[tuple[int, ...]], output: tuple[int, ...], *arrays,
+           optimize: str = "auto", threads: int = None, max_size: int = None):
+    """
+    Contract a list of ``arrays`` according to a list of ``inputs`` indices
+    and the indices of the ``output``, following a contraction path.
+
+    Parameters:
+        inputs : The tuple of indices for each array.
+        output : The indices of the result, which must appear in the inputs.
+        arrays : The arrays to contract.
+        optimize : Either ``"greedy"``, ``"optimal"`` or ``"auto"``.
+        threads : The number of threads on which to run independent steps,
+            e.g. the connected components of the network, if any.
+        max_size : The maximum number of entries held in intermediate arrays,
+            if any, see :func:`contraction_slices`.
+
+    Example
+    -------
+    >>> import numpy as np
+    >>> x, y = np.array([[1, 2], [3, 4]]), np.array([1, 1])
+    >>> einsum([(0, 1), (1, ), (2, 0)], (2, ), x, y, x)
+    array([17, 37])
+    >>> assert (einsum([(0, 1), (1, ), (2, 0)], (2, ), x, y, x)
+    ...     == np.einsum('ij,j,ki->k', x, y, x)).all()
+
+    Note
+    ----
+    The indices can be any integers, they are renamed in order of appearance
+    so that the contraction path is cached for each shape of network, see
+    :func:`contraction_path`.
+    """
+    index, sizes = {}, {}
+    for labels, array in zip(inputs, arrays):
+        for i, size in zip(labels, array.shape):
+            sizes[index.setdefault(i, len(index))] = size
+    inputs = tuple(tuple(index[i] for i in labels) for labels in inputs)
+    output = tuple(index[i] for i in output)
+    sizes = tuple(sizes[i] for i in range(len(index)))
+    if max_size is not None:
+        sliced, path = contraction_slices(
+            inputs, output, sizes, max_size, optimize)
+        return _sliced(inputs, output, sizes, sliced, path, arrays, threads)
+    path = contraction_path(inputs, output, sizes, optimize)
+    return _contract(inputs, output, path, arrays, threads)
+
+
+def _sliced(inputs, output, sizes, sliced, path, arrays, threads=None):
+    """
+    Contract the arrays once for each value of the ``sliced`` indices, then
+    sum the results as they come so that only one slice is held at a time.
+    """
+    if not sliced:
+        return _contract(inputs, output, path, arrays, threads)
+    result = None
+    for values in cartesian(*(range(sizes[i]) for i in sliced)):
+        where = dict(zip(sliced, values))
+        parts = [array[tuple(
+            slice(where[i], where[i] + 1) if i in where else slice(None)
+            for i in labels)] for labels, array in zip(inputs, arrays)]
+        part = _contract(inputs, output, path, parts, threads)
+        result = part if result is None else result + part
+    return result
+
+
+def _is_real(dtype: type) -> bool:
+    """ Whether the complex conjugate is the identity on a ``dtype``. """
+    with backend('numpy') as np:
+        return np.dtype(dtype).kind in "biuf"
+
+
+def _batched(inputs, output, *tensors, threads=None, max_size=None):
+    """
+    Contract tensors some of which have a leading batch axis, with indices
+    given without it, the result is batched along the same axis.
+    """
+    batches = sorted({tensor.batch for tensor in tensors} - {None})
+    if len(batches) > 1:
+        raise ValueError(messages.BATCH_MISMATCH.format(*batches[:2]))
+    inputs = [(-1, ) * (tensor.batch is not None) + tuple(labels)
+              for tensor, labels in zip(tensors, inputs)]
+    arrays = (tensor.array for tensor in tensors)
+    return einsum(inputs, (-1, ) + tuple(output), *arrays,
+                  threads=threads, max_size=max_size), batches[0]
+
+
+def _batch_labels(inputs, output, path, batched):
+    """
+    Add the index ``-1`` of a batch to the operands that are ``batched``, to
+    the steps of the path that involve one of them and to the output.
+    """
+    inputs, steps = [(-1, ) * is_batched + tuple(labels)
+                     for labels, is_batched in zip(inputs, batched)], []
+    for x, y, labels in path:
+        labels = tuple(labels)
+        if -1 in inputs[x] + inputs[y]:
+            # The batch comes first among the indices of its operand, as in
+            # the result of ``tensordot`` when only one operand has a batch.
+            i = 0 if -1 in inputs[x] else len(set(labels) & set(inputs[x]))
+            labels = labels[:i] + (-1, ) + labels[i:]
+        steps.append((x, y, labels))
+        inputs.append(labels)
+    return inputs[:len(batched)], (-1, ) + tuple(output), tuple(steps)
+
+
+def _contract(inputs, output, path, arrays, threads=None):
+    """
+    Contract a list of arrays following a given path, with each step run as
+    soon as its operands are ready on a pool of ``threads`` if given.
+    """
+    arrays, inputs = list(arrays), list(inputs)
+    with ThreadPoolExecutor(threads) if threads else nullcontext() as pool:
+        for x, y, labels in path:
+            args = (arrays[x], inputs[x], arrays[y], inputs[y], labels)
+            arrays.append(
+                pool.submit(_pairwise_async, *args) if pool
+                else _pairwise(*args))
+            arrays[x] = arrays[y] = None
+            inputs.append(labels)
+        if isinstance(arrays[-1], Future):
+            arrays[-1] = arrays[-1].result()
+    if inputs[-1] == output:
+        return arrays[-1]
+    return _pairwise(arrays[-1], inputs[-1], None, (), output)
+
+
+def _gradient(inputs, output, path, arrays, cotangent):
+    """
+    The gradient of a contraction with respect to each operand, contracted
+    with a ``cotangent`` for the output, running the path backwards.
+    """
+    arrays, inputs, n = list(arrays), list(inputs), len(arrays)
+    for x, y, labels in path:
+        arrays.append(_pairwise(
+            arrays[x], inputs[x], arrays[y], inputs[y], labels))
+        inputs.append(labels)
+    gradients = (len(arrays) - 1) * [None] + [
+        _adjoint(cotangent, output, (), inputs[-1], arrays[-1].shape)]
+    for z, (x, y, labels) in reversed(list(enumerate(path, n))):
+        for u, v in ((x, y), (y, x)):
+            gradient = _adjoint(gradients[z], labels, (
+                (arrays[v], inputs[v]), ), inputs[u], arrays[u].shape)
+            gradients[u] = gradient if gradients[u] is None\
+                else gradients[u] + gradient
+        arrays[z] = gradients[z] = None
+    return gradients[:n]
+
+
+def _adjoint(cotangent, labels, others, target, shape):
+    """
+    Contract a ``cotangent`` with some ``others`` arrays into an array with
+    indices ``target``, broadcasting the indices that appear nowhere else and
+    putting repeated indices on the diagonal.
+    """
+    inputs = [tuple(labels)] + [tuple(other) for _, other in others]
+    arrays = [cotangent] + [array for array, _ in others]
+    seen, output = set(chain(*inputs)), []
+    fresh = max(chain(*inputs, target), default=0) + 1
+    with backend() as np:
+        for i, n in zip(target, shape):
+            if i in output:
+                inputs.append((i, fresh))
+                arrays.append(np.identity(n, dtype=cotangent.dtype))
+                output.append(fresh)
+                fresh += 1
+                continue
+            if i not in seen:
+                inputs.append((i, ))
+                arrays.append(np.ones(n, dtype=cotangent.dtype))
+                seen.add(i)
+            output.append(i)
+    return einsum(inputs, output, *arrays)
+
+
+def _pairwise_async(x, x_labels, y, y_labels, labels):
+    """
+    Contract the results of two futures, submitted in the order of the path
+    so that they are either done or running in another thread.
+    """
+    x, y = (z.result() if isinstance(z, Future) else z for z in (x, y))
+    return _pairwise(x, x_labels, y, y_labels, labels)
+
+
+def _pairwise(x, x_labels, y, y_labels, labels):
+    """
+    Contract two arrays, or just one if ``y is None``, with ``tensordot``
+    when possible and ``einsum`` otherwise.
+    """
+    shared = set(x_labels) & set(y_labels)
+    if y is not None and not shared.intersection(labels)\
+            and len(set(x_labels + y_labels)) == len(x_labels + y_labels)\
+            - len(shared) and all(i in shared or i in labels
+                                  for i in x_labels + y_labels):
+        if not x_labels or not y_labels:
+            return x * y
+        axes = ([x_labels.index(i) for i in shared],
+                [y_labels.index(i) for i in shared])
+        with backend() as np:
+            return np.tensordot(x, y, axes)
+    if len(set(x_labels + y_labels)) > len(ascii_letters):
+        return _pairwise_matmul(x, x_labels, y, y_labels, labels)
+    letters = dict(zip(dict.fromkeys(x_labels + y_labels), ascii_letters))
+    subscripts = "".join(map(letters.get, x_labels))\
+        + ("," + "".join(map(letters.get, y_labels)) if y is not None else "")\
+        + "->" + "".join(map(letters.get, labels))
+    with backend() as np:
+        return np.einsum(subscripts, *((x, ) if y is None else (x, y)))
+
+
+def _pairwise_matmul(x, x_labels, y, y_labels, labels):
+    """
+    Contract two arrays, or just one if ``y is None``, with diagonals, sums,
+    reshapes and one batched ``matmul``, i.e. without ``einsum`` and its
+    limit of 52 distinct indices.
+    """
+    y_labels = () if y is None else y_labels
+    x, x_labels = _reduce(x, x_labels, set(y_labels).union(labels))
+    if y is not None:
+        y, y_labels = _reduce(y, y_labels, set(x_labels).union(labels))
+        with backend() as np:
+            sizes = dict(zip(x_labels + y_labels, np.shape(x) + np.shape(y)))
+        batch = [i for i in x_labels if i in y_labels and i in labels]
+        left = [i for i in x_labels if i not in y_labels]
+        inner = [i for i in x_labels if i in y_labels and i not in labels]
+        right = [i for i in y_labels if i not in x_labels]
+        size = lambda group: prod(sizes[i] for i in group)
+        with backend() as np:
+            x = np.reshape(np.transpose(
+                x, [x_labels.index(i) for i in batch + left + inner]),
+                (size(batch), size(left), size(inner)))
+            y = np.reshape(np.transpose(
+                y, [y_labels.index(i) for i in batch + inner + right]),
+                (size(batch), size(inner), size(right)))
+            x_labels = batch + left + right
+            x = np.reshape(np.matmul(x, y), [sizes[i] for i in x_labels])
+    with backend() as np:
+        return np.transpose(x, [x_labels.index(i) for i in labels])
+
+
+def _reduce(x, x_labels, keep):
+    """
+    Take the diagonal of the repeated indices of an array and sum over the
+    indices that are not in ``keep``, returning the array and its indices.
+    """
+    x_labels = list(x_labels)
+    with backend() as np:
+        for i in dict.fromkeys(x_labels):
+            while x_labels.count(i) > 1:
+                j = x_labels.index(i)
+                k = x_labels.index(i, j + 1)
+                x = np.diagonal(x, axis1=j, axis2=k)
+                x_labels = [m for n, m in enumerate(x_labels)
+                            if n not in (j, k)] + [i]
+        axes = tuple(j for j, i in enumerate(x_labels) if i not in keep)
+        x = np.sum(x, axis=axes) if axes else x
+    return x, tuple(i for i in x_labels if i in keep)
+
+
+@lru_cache(maxsize=config.CONTRACTION_CACHE_SIZE)
+def contraction_path(
+        inputs: tuple[tuple[int, ...], ...], output: tuple[int, ...],
+        sizes: tuple[int, ...], optimize: str = "auto") -> tuple[
+            tuple[int, int, tuple[int, ...]], ...]:
+    """
+    The order in which to contract a network of tensors, cached by shape.
+
+    Each step ``(x, y, labels)`` of the path contracts the operands ``x`` and
+    ``y`` into a new operand with indices ``labels``, which is appended to the
+    list of operands. Indices are removed as soon as they appear in no other
+    operand nor in the output.
+
+    Each of the :func:`connected_components` is contracted on its own, then
+    the scalars are multiplied and the outer product of the results is taken,
+    from the smallest to the largest.
+
+    Parameters:
+        inputs : The tuple of indices for each operand.
+        output : The indices of the result.
+        sizes : The size of each index, given as integers from zero.
+        optimize : Either ``"greedy"``, ``"optimal"`` or ``"auto"``, i.e.
+            optimal up to :code:`config.MAX_OPTIMAL_OPERANDS` operands in
+            each connected component.
+
+    Example
+    -------
+    The product of matrices of shape ``9 x 2``, ``2 x 9`` and ``9 x 9`` is
+    cheaper when we start from the last two.
+
+    >>> inputs, output = ((0, 1), (1, 2), (2, 3)), (0, 3)
+    >>> contraction_path(inputs, output, sizes=(9, 2, 9, 9))
+    ((1, 2, (1, 3)), (0, 3, (0, 3)))
+    >>> assert contraction_path(inputs, output, (9, 2, 9, 9), "greedy")\\
+    ...     == contraction_path(inputs, output, (9, 2, 9, 9), "optimal")
+
+    With a scalar and a vector apart, the scalars are multiplied first.
+
+    >>> inputs, output = ((0, 1), (1, 2), (), (3, ), ()), (0, 2, 3)
+    >>> contraction_path(inputs, output, sizes=(9, 2, 9, 9))
+    ((0, 1, (0, 2)), (2, 4, ()), (6, 3, (3,)), (7, 5, (3, 0, 2)))
+    """
+    if optimize not in ("greedy", "optimal", "auto"):
+        raise ValueError(messages.UNKNOWN_OPTIMIZE.format(optimize))
+    size = lambda labels: prod(sizes[i] for i in labels)
+    inputs = tuple(tuple(dict.fromkeys(labels)) for labels in inputs)
+    components = connected_components(inputs)
+    if len(components) > 1:
+        return _factorised_path(inputs, output, sizes, optimize, components)
+    if optimize == "auto":
+        optimize = "optimal" if len(inputs) <= config.MAX_OPTIMAL_OPERANDS\
+            else "greedy"
+    if optimize == "optimal":
+        return _optimal_path(inputs, output, size)
+    return _greedy_path(inputs, output, size)
+
+
+def contraction_cost(
+        inputs: tuple[tuple[int, ...], ...], output: tuple[int, ...],
+        sizes: tuple[int, ...], path: tuple[tuple[int, int, tuple[int, ...]],
+                                            ...]) -> tuple[int, int]:
+    """
+    The number of multiply-adds of a contraction path and the peak number of
+    entries held at once in the intermediate arrays, including the result.
+
+    Parameters:
+        inputs : The tuple of indices for each operand.
+        output : The indices of the result.
+        sizes : The size of each index.
+        path : The contraction path, see :func:`contraction_path`.
+
+    Example
+    -------
+    >>> inputs, output, sizes = ((0, 1), (1, 2), (2, 3)), (0, 3), (9, 2, 9, 9)
+    >>> path = contraction_path(inputs, output, sizes)
+    >>> contraction_cost(inputs, output, sizes, path)
+    (324, 99)
+    """
+    size = lambda labels: prod(sizes[i] for i in labels)
+    inputs, alive = list(inputs), {}
+    flops = peak = live = 0
+    for x, y, labels in path:
+        flops += size(set(inputs[x] + inputs[y]))
+        alive[len(inputs)] = size(labels)
+        live += alive[len(inputs)]
+        peak = max(peak, live)
+        live -= alive.pop(x, 0) + alive.pop(y, 0)
+        inputs.append(labels)
+    if not inputs or tuple(inputs[-1]) != tuple(output):
+        flops += size(set(inputs[-1] if inputs else ()))
+        peak = max(peak, live + size(output))
+    return flops, peak
+
+
+@lru_cache(maxsize=config.CONTRACTION_CACHE_SIZE)
+def contraction_slices(
+        inputs: tuple[tuple[int, ...], ...], output: tuple[int, ...],
+        sizes: tuple[int, ...], max_size: int, optimize: str = "auto"
+) -> tuple[tuple[int, ...], tuple[tuple[int, int, tuple[int, ...]], ...]]:
+    """
+    The indices to slice so that the intermediate arrays of a contraction
+    hold at most ``max_size`` entries, and the path for each slice.
+
+    The contraction is then computed once for each value of the sliced
+    indices and the results are summed. Indices are sliced greedily, each
+    time the one that minimises the peak size then the number of flops.
+
+    Parameters:
+        inputs : The tuple of indices for each operand.
+        output : The indices of the result, which are never sliced.
+        sizes : The size of each index.
+        max_size : The maximum number of entries in intermediate arrays.
+        optimize : Passed to :func:`contraction_path`.
+
+    Raises:
+        ValueError : If there are no more indices left to slice.
+
+    Example
+    -------
+    The trace of a product of three ``4 x 4`` matrices needs an intermediate
+    matrix, of which only one column is computed at a time.
+
+    >>> inputs, output, sizes = ((0, 1), (1, 2), (2, 0)), (), (4, 4, 4)
+    >>> contraction_slices(inputs, output, sizes, max_size=16)
+    ((1,), ((0, 2, (1, 2)), (3, 1, ())))
+    >>> contraction_slices(inputs, output, sizes, max_size=1)
+    Traceback (most recent call last):
+    ...
+    ValueError: Cannot slice the contraction to intermediates of at most 1 \
+entries, the smallest peak is 2.
+    """
+    sliced = ()
+    path = contraction_path(inputs, output, sizes, optimize)
+
+    def cost(sliced, path):
+        sliced_sizes = tuple(
+            1 if i in sliced else n for i, n in enumerate(sizes))
+        flops, peak = contraction_cost(inputs, output, sliced_sizes, path)
+        slices = prod(sizes[i] for i in sliced)
+        return peak, flops * slices
+
+    indices = sorted(set(chain(*inputs)) - set(output))
+    while cost(sliced, path)[0] > max_size:
+        candidates = [i for i in indices if i not in sliced and sizes[i] > 1]
+        best = min(candidates, key=lambda i: cost(sliced + (i, ), path),
+                   default=None)
+        if best is None or cost(sliced + (best, ), path) >= cost(
+                sliced, path):
+            raise ValueError(messages.MAX_SIZE_EXCEEDED.format(
+                max_size, cost(sliced, path)[0]))
+        sliced += (best, )
+        replanned = contraction_path(inputs, output, tuple(
+            1 if i in sliced else n for i, n in enumerate(sizes)), optimize)
+        if cost(sliced, replanned) < cost(sliced, path):
+            path = replanned
+    return sliced, path
+
+
+@lru_cache(maxsize=config.CONTRACTION_CACHE_SIZE)
+def connected_components(
+        inputs: tuple[tuple[int, ...], ...]) -> tuple[tuple[int, ...], ...]:
+    """
+    The connected components of a network of tensors, i.e. the groups of
+    operands linked by a chain of shared indices, ordered by first operand.
+
+    Parameters:
+        inputs : The tuple of indices for each operand.
+
+    Example
+    -------
+    >>> connected_components(((0, 1), (2, ), (1, 3), (), (2, 4)))
+    ((0, 2), (1, 4), (3,))
+    """
+    parent, first = list(range(len(inputs))), {}
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = x = parent[parent[x]]
+        return x
+
+    for x, labels in enumerate(inputs):
+        for i in labels:
+            parent[find(x)] = find(first.setdefault(i, x))
+    components = defaultdict(list)
+    for x in range(len(inputs)):
+        components[find(x)].append(x)
+    return tuple(map(tuple, components.values()))
+
+
+def _factorised_path(inputs, output, sizes, optimize, components):
+    """
+    Concatenate the path of each connected component, then multiply the
+    results from the smallest to the largest.
+    """
+    path, results = [], []
+    size = lambda labels: prod(sizes[i] for i in labels if i in output)
+    for operands in components:
+        component = tuple(inputs[x] for x in operands)
+        labels = set(chain(*component))
+        steps = contraction_path(component, tuple(
+            i for i in output if i in labels), sizes, optimize)
+        position = list(operands)
+        for x, y, labels in steps:
+            path.append((position[x], position[y], labels))
+            position.append(len(inputs) + len(path) - 1)
+        results.append((position[-1], path[-1][2] if steps else component[0]))
+    (x, x_labels), *results = sorted(
+        results, key=lambda result: size(result[1]))
+    for y, y_labels in results:
+        x_labels = tuple(i for i in x_labels + y_labels if i in output)
+        path.append((x, y, x_labels))
+        x = len(inputs) + len(path) - 1
+    return tuple(path)
+
+
+def _greedy_path(inputs, output, size):
+    """
+    Contract the pair of operands that share an index and minimise the size
+    of the result minus that of the pair, then the number of flops, then take
+    outer products of the smallest operands left.
+    """
+    count = Counter(chain(output, *inputs))
+    alive, where = dict(enumerate(inputs)), defaultdict(set)
+    for x, labels in enumerate(inputs):
+        for i in labels:
+            where[i].add(x)
+    merge = lambda x, y: tuple(i for i in dict.fromkeys(alive[x] + alive[y])
+                               if count[i] > (i in alive[x]) + (i in alive[y]))
+    heap, path = [], []
+
+    def push(x, y):
+        labels = merge(x, y)
+        cost = size(labels) - size(alive[x]) - size(alive[y])
+        flops = size(set(alive[x] + alive[y]))
+        heappush(heap, (cost, flops, x, y))
+
+    for x in range(len(inputs)):
+        for y in sorted(set().union(*map(where.get, inputs[x]))):
+            if y > x:
+                push(x, y)
+    while heap or len(alive) > 1:
+        if heap:
+            *_, x, y = heappop(heap)
+            if x not in alive or y not in alive:
+                continue
+        else:
+            x, y = sorted(alive, key=lambda x: (size(alive[x]), x))[:2]
+        labels, z = merge(x, y), len(inputs) + len(path)
+        for i in alive.pop(x) + alive.pop(y):
+            count[i] -= 1
+            where[i].discard(x), where[i].discard(y)
+        for i in labels:
+            count[i] += 1
+            where[i].add(z)
+        alive[z] = labels
+        path.append((x, y, labels))
+        for w in sorted(set().union(*map(where.get, labels)) - {z}):
+            push(w, z)
+    return tuple(path)
+
+
+def _optimal_path(inputs, output, size):
+    """
+    Dynamic programming over subsets of operands, minimising the sum of the
+    sizes of the pairwise contractions.
+    """
+    where = defaultdict(int)
+    for x, labels in enumerate(inputs):
+        for i in labels:
+            where[i] |= 1 << x
+    full = (1 << len(inputs)) - 1
+    labels = {1 << x: labels for x, labels in enumerate(inputs)}
+    best = {1 << x: (0, None) for x in range(len(inputs))}
+    for mask in sorted(range(1, full + 1), key=lambda m: bin(m).count("1")):
+        if mask in best:
+            continue
+        low, sub, best[mask] = mask & -mask, mask, (float("inf"), None)
+        while sub:
+            sub = (sub - 1) & mask
+            rest = mask ^ sub
+            if not sub or not sub & low:
+                continue
+            merged = tuple(dict.fromkeys(labels[sub] + labels[rest]))
+            cost = best[sub][0] + best[rest][0] + size(merged)
+            if cost < best[mask][0]:
+                best[mask] = (cost, sub)
+        merged = tuple(dict.fromkeys(
+            labels[best[mask][1]] + labels[mask ^ best[mask][1]]))
+        labels[mask] = tuple(
+            i for i in merged if i in output or where[i] & ~mask & full)
+    path = []
+
+    def build(mask):
+        if best[mask][1] is None:
+            return mask.bit_length() - 1
+        x, y = build(best[mask][1]), build(mask ^ best[mask][1])
+        path.append((x, y, labels[mask]))
+        return len(inputs) + len(path) - 1
+
+    if inputs:
+        build(full)
+    return tuple(path)
+
+
 Diagram.sum_factory, Diagram.braid_factory = Sum, Swap
 Diagram.cup_factory, Diagram.cap_factory = Cup, Cap
 Diagram.spider_factory, Diagram.bubble_factory = Spider, Bubble
@@ -5,6 +5,7 @@
 from __future__ import annotations
 
 import json
+from numbers import Number
 
 from discopy import messages
 
@@ -82,6 +83,88 @@ class MappingOrCallable(Mapping[KT, VT]):
         return MappingOrCallable(lambda key: other[self[key]])
 
 
+class LazyMapping(Mapping[KT, VT]):
+    """
+    A mapping with a given collection of keys where each value is computed
+    by a function when it is first looked up.
+
+    Parameters:
+        keys : The keys of the mapping.
+        func : The function from keys to values.
+
+    Example
+    -------
+    >>> mapping = LazyMapping({1, 2}, lambda key: print(key) or 2 * key)
+    >>> mapping[1], mapping[1]
+    1
+    (2, 2)
+    >>> assert mapping == {1: 2, 2: 4}
+    2
+
+    Note
+    ----
+    Values can be looked up for keys outside of ``keys``, these are not
+    listed when iterating over the mapping.
+
+    >>> assert mapping[3] == 6 and 3 not in list(mapping)
+    3
+    """
+    def __init__(self, keys: Iterable[KT], func: Callable[[KT], VT]):
+        self.keys_, self.func, self.values_ = keys, func, {}
+
+    def __getitem__(self, key: KT) -> VT:
+        if key not in self.values_:
+            self.values_[key] = self.func(key)
+        return self.values_[key]
+
+    def __iter__(self) -> Iterable[KT]:
+        return iter(self.keys_)
+
+    def __len__(self) -> int:
+        return len(self.keys_)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+def lazy_import(package: str, attributes: dict[str, str]
+                ) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    The module-level ``__getattr__`` and ``__dir__`` of a package which
+    imports its submodules only when they are first accessed, see PEP 562.
+
+    Parameters:
+        package : The name of the package.
+        attributes : Map from each attribute of the package to the submodule
+            it lives in, or to itself if it is a submodule. A submodule can
+            also be given as :code:`"module.name"` to rename an attribute.
+
+    Example
+    -------
+    >>> __getattr__, __dir__ = lazy_import(
+    ...     "discopy", {"cat": "cat", "Ob": "cat", "Object": "cat.Ob"})
+    >>> from discopy.cat import Ob
+    >>> assert __getattr__("Ob") is __getattr__("Object") is Ob
+    >>> assert {"Ob", "Object", "cat", "__version__"} <= set(__dir__())
+    """
+    import importlib
+    import sys
+
+    def __getattr__(name):
+        if name not in attributes:
+            raise AttributeError(
+                f"module {package!r} has no attribute {name!r}")
+        module, _, attr = attributes[name].partition('.')
+        module = importlib.import_module(f"{package}.{module}")
+        return module if name == attributes[name] else getattr(
+            module, attr or name)
+
+    def __dir__():
+        return sorted(set(vars(sys.modules[package])) | set(attributes))
+
+    return __getattr__, __dir__
+
+
 def product(xs: list, unit=1):
     """
     The left-fold product of a ``unit`` with list of ``xs``.
@@ -242,11 +325,67 @@ def load_corpus(url):
         return loads(f.read())
 
 
+def hash_data(data) -> int:
+    """
+    Hash some (possibly unhashable) data, e.g. the :code:`data` of a box.
+
+    Parameters:
+        data : The data to hash, arrays and sequences are hashed by shape and
+               entries regardless of their type, falling back on ``repr``.
+
+    Example
+    -------
+    >>> import numpy as np
+    >>> assert hash_data(42) == hash(42)
+    >>> assert hash_data([4, 2]) == hash_data([4, 2]) != hash_data([2, 4])
+    >>> assert hash_data([4, 2]) == hash_data(np.array([4., 2.]))
+    """
+    if data is None or isinstance(data, (Number, str, frozenset))\
+            or hasattr(data, "free_symbols"):
+        try:
+            return hash(data)
+        except TypeError:
+            pass
+    if isinstance(data, (list, tuple)) or hasattr(data, "shape"):
+        import numpy
+        try:
+            array = numpy.asarray(data)
+            entries = array.ravel().tolist()
+            return hash((array.shape, tuple(entries)) if array.shape
+                        else entries[0])
+        except (TypeError, ValueError, RuntimeError):
+            pass
+    return hash(repr(data))
+
+
+def eq_data(data, other) -> bool:
+    """
+    Whether two (possibly array-valued) data are equal, e.g. for boxes.
+
+    Example
+    -------
+    >>> import numpy as np
+    >>> assert eq_data(np.eye(2), np.eye(2)) and not eq_data(np.eye(2), 1)
+    >>> assert not eq_data(np.eye(2), np.eye(3))
+    """
+    if data is other:
+        return True
+    if hasattr(data, "shape") or hasattr(other, "shape"):
+        import numpy
+        try:
+            if numpy.shape(data) != numpy.shape(other):
+                return False
+        except ValueError:
+            return False
+    result = data == other
+    return bool(result.all() if hasattr(result, "all") else result)
+
+
 def assert_isinstance(object, cls: type | tuple[type, ...]):
     """ Raise ``TypeError`` if ``object`` is not instance of ``cls``. """
-    classes = cls if isinstance(cls, tuple) else (cls, )
-    cls_name = ' | '.join(map(factory_name, classes))
-    if not any(isinstance(object, cls) for cls in classes):
+    if not isinstance(object, cls):
+        classes = cls if isinstance(cls, tuple) else (cls, )
+        cls_name = ' | '.join(map(factory_name, classes))
         raise TypeError(messages.TYPE_ERROR.format(
             cls_name, factory_name(type(object))))
 
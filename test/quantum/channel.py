@@ -39,3 +39,26 @@ def test_Channel_measure():
     assert Channel.encode(Dim(1)) == Channel.measure(Dim(1)) == Channel.id(C())
     assert Channel.measure(Dim(2, 2))\
         == Channel.measure(Dim(2)) @ Channel.measure(Dim(2))
+
+
+def test_Functor_contract():
+    import numpy as np
+    from discopy import frobenius
+    functor = Functor(
+        {}, {}, dom=Category(circuit.Ty, Circuit), dtype=complex)
+    for diagram in [
+            Copy() >> Encode(2) >> CX >> Measure() @ Discard(),
+            Ket(0, 1) >> H @ qubit >> SWAP
+            >> Measure(destructive=False) @ qubit,
+            Measure() >> Copy() >> Match() >> Encode(),
+            MixedState() @ Bits(1) >> Measure() @ Discard(bit),
+            Bits(1) @ Ket(0) >> Encode() @ qubit >> CZ]:
+        expected = frobenius.Functor.__call__(functor, diagram)
+        result = functor(diagram)
+        assert (result.dom, result.cod) == (expected.dom, expected.cod)
+        assert np.allclose(result.array, expected.array)
+    assert functor._delta(H) is None
+    assert functor._delta(Measure()) == ((0, 1, 2), )
+    assert functor._delta(Encode()) == ((1, 2, 0), )
+    assert functor._delta(Discard(bit @ qubit)) == ((0, ), (1, 2))
+    assert functor._delta(Copy()) == functor._delta(Match()) == ((0, 1, 2), )
@@ -28,6 +28,22 @@ def test_Circuit_eval():
     assert MixedState().eval() == Discard().eval().dagger()
 
 
+def test_Circuit_cost():
+    n = 40
+    circuit = Ket(*n * (0, )) >> H @ qubit ** (n - 1)
+    for i in range(n - 1):
+        circuit = circuit >> qubit ** i @ CX @ qubit ** (n - i - 2)
+    cost = circuit.cost()
+    assert cost.output == 16 * 2 ** n and cost.memory >= cost.output
+    mixed = circuit.cost(mixed=True)
+    assert mixed.output == 16 * 4 ** n and mixed.flops > cost.flops
+    small = Ket(0, 0, 0) >> H @ qubit ** 2 >> CX @ qubit >> qubit @ CX\
+        >> Measure() @ Discard(qubit) @ Measure()
+    sliced = small.cost(max_memory=16 * 16)
+    assert sliced.slices > 1 and sliced.memory <= 16 * 16
+    assert sliced.flops >= small.cost().flops
+
+
 def test_Circuit_cups_and_caps():
     assert Circuit.cups(bit, bit) == Match() >> Discard(bit)
     assert Circuit.caps(bit, bit) == MixedState(bit) >> Copy()
@@ -207,6 +223,52 @@ def test_bra_ket_inputs():
 
 def test_Circuit_get_counts():
     assert Id(qubit).get_counts() == {(): 1.0}
+    circuit = Ket(0, 0, 0) >> H @ Rx(0.3) @ H >> CX @ qubit\
+        >> Measure() @ Bra(1) @ Measure() >> Bits(0).dagger() @ bit
+    circuit = circuit @ scalar(2)
+    exact = circuit.get_counts()
+    counts = circuit.get_counts(n_shots=10 ** 5, seed=0)
+    assert counts.keys() == exact.keys() == {(0, ), (1, )}
+    assert np.allclose(list(counts.values()), list(exact.values()), atol=.02)
+    assert counts == circuit.get_counts(n_shots=10 ** 5, seed=0)
+    raw = circuit.get_counts(
+        n_shots=100, seed=0, post_select=False, normalize=False, scale=False)
+    assert all(len(key) == 3 for key in raw) and sum(raw.values()) == 100
+    batch = circuit.get_counts(circuit, n_shots=100, seed=0)
+    assert len(batch) == 2 and batch[0].keys() <= exact.keys()
+
+
+def test_Circuit_get_counts_clifford():
+    circuit = Ket(0, 1, 0) >> H @ S @ H >> CX @ Z >> qubit @ CZ\
+        >> Measure() @ Bra(1) @ Measure() >> Bits(0).dagger() @ bit
+    circuit = circuit @ scalar(2)
+    assert circuit.is_clifford and not (Ket(0) >> T >> Measure()).is_clifford
+    exact = circuit.get_counts()
+    counts = circuit.get_counts(n_shots=10 ** 5, seed=0)
+    assert counts.keys() == exact.keys() == {(0, ), (1, )}
+    assert np.allclose(list(counts.values()), list(exact.values()), atol=.02)
+    batch = circuit.get_counts(Ket(0) >> Rx(0.3), n_shots=100, seed=0)
+    assert batch[0] == circuit.get_counts(n_shots=100, seed=0)
+    n = 300
+    ghz = Ket(*n * [0]) >> H @ qubit ** (n - 1)
+    for i in range(n - 1):
+        ghz = ghz >> qubit ** i @ CX @ qubit ** (n - i - 2)
+    counts = (ghz >> Measure(n)).get_counts(n_shots=100, seed=0)
+    assert counts.keys() == {n * (0, ), n * (1, )}
+
+
+def test_Circuit_get_counts_not_normalised():
+    circuit = Ket(0, 0) >> H @ Rx(0.3) >> Measure(2) >> Match()
+    exact = circuit.get_counts()
+    assert sum(exact.values()) < 1
+    counts = circuit.get_counts(n_shots=10 ** 5, seed=0)
+    assert counts.keys() == exact.keys() == {(0, ), (1, )}
+    assert np.allclose(list(counts.values()), list(exact.values()), atol=.02)
+    unscaled = circuit.get_counts(n_shots=10 ** 5, seed=0, scale=False)
+    assert np.isclose(sum(unscaled.values()), 1)
+    for param in ("measure_all", "compilation"):
+        with raises(TypeError):
+            circuit.get_counts(n_shots=10, **{param: None})
 
 
 def test_Circuit_conjugate():
@@ -216,6 +278,25 @@ def test_Circuit_conjugate():
 def test_Circuit_measure():
     assert Id().measure() == 1
     assert all(Bits(0).measure(mixed=True) == np.array([1, 0]))
+    circuit = H @ Ket(0) @ Rx(0.2) >> CX @ qubit >> qubit @ Controlled(
+        X, distance=-1)
+    probabilities = circuit.measure()
+    assert np.allclose(
+        circuit.measure(mixed=True, measure_all=True), probabilities)
+    assert np.allclose(circuit.measure(mixed=True), 1)
+    assert np.allclose(
+        circuit.measure(wires=[2, 0]), probabilities.sum(1).transpose())
+    assert np.allclose(circuit.measure(backend='statevector'), probabilities)
+    assert circuit.measure(as_dict=True).keys()\
+        == {(0, 0, 0), (0, 1, 1), (1, 1, 0), (1, 0, 1)}
+    mixed = circuit >> qubit @ Measure() @ qubit
+    assert np.allclose(mixed.measure(measure_all=True), probabilities)
+    assert np.allclose(mixed.measure(), probabilities.sum((0, 2)))
+    assert np.allclose(
+        mixed.measure(measure_all=True, wires=[1]), probabilities.sum((0, 2)))
+    assert np.allclose(circuit.measure(backend='density_matrix'), probabilities)
+    assert np.allclose(
+        mixed.measure(), mixed.init_and_discard().eval(mixed=True).array.real)
 
 
 def test_Box():
@@ -397,6 +478,13 @@ def test_Controlled():
         Controlled(None)
     with raises(ValueError):
         Controlled(X, distance=0)
+    assert np.allclose(
+        Controlled(S.dagger()).array.reshape(4, 4), np.diag([1, 1, 1, -1j]))
+    # The target of CX is the last wire, flipped when wires 0 and 2 are one.
+    matrix = np.eye(16)
+    matrix[[10, 11, 14, 15]] = matrix[[11, 10, 15, 14]]
+    assert np.allclose(
+        Controlled(CX, distance=2).eval().array.reshape(16, 16), matrix)
 
 
 def test_adjoint():
@@ -1,13 +1,18 @@
 # -*- coding: utf-8 -*-
 
 
+from itertools import product
+
+import numpy as np
 import pytest
 import tensornetwork as tn
+from pytest import raises
 
 from discopy.quantum import (
-    Circuit, IQPansatz,
-    Bra, Copy, CRz, Encode, Id, Ket, Rx, Rz, Match, Measure,
-    MixedState, Discard, bit, qubit, sqrt, CX, H, SWAP, X, Y, Z)
+    Circuit, IQPansatz, Controlled,
+    Bra, Copy, CRz, CZ, Encode, Id, Ket, Rx, Rz, Match, Measure,
+    MixedState, Discard, bit, qubit, sqrt, CX, H, S, SWAP, T, X, Y, Z)
+from discopy.quantum.simulation import Stabilizer
 
 mixed_circuits = [
     (Copy() >> Encode(2) >> CX >> Rx(0.3) @ Rz(0.3)
@@ -31,6 +36,15 @@ pure_circuits = [
     Circuit.permutation([1, 2, 0])
 ]
 
+controlled_circuits = [
+    H @ H @ qubit ** 2 >> Controlled(CX, distance=2)
+    >> Controlled(X, distance=-3)
+    >> qubit @ Controlled(Controlled(Rx(0.3), distance=-1)),
+    Ket(1, 0) @ H >> Controlled(CZ, distance=-1) >> Bra(1) @ qubit ** 2,
+    H @ H >> S.dagger() @ T.dagger() >> Controlled(T.dagger())
+    >> Controlled(S.dagger(), distance=-1),
+]
+
 contractor = tn.contractors.auto
 
 
@@ -71,3 +85,64 @@ def test_pytorch_consistent_eval(c):
             pure_result
             @ pure_result.conjugate(diagrammatic=False))
         doubled_result.is_close(mixed_result.to_tensor())
+
+
+@pytest.mark.parametrize('c', pure_circuits + controlled_circuits)
+def test_statevector_eval(c):
+    assert c.eval(backend='statevector').is_close(c.eval())
+
+
+def test_statevector_errors():
+    with raises(ValueError):
+        Measure().eval(backend='statevector')
+    with raises(ValueError):
+        H.eval(backend='statevector', mixed=True)
+    with raises(ValueError):
+        H.eval(backend='unknown')
+
+
+@pytest.mark.parametrize(
+    'c', pure_circuits + mixed_circuits + controlled_circuits + [
+        Measure(2, destructive=False) @ MixedState(bit),
+        Measure(override_bits=True) >> Encode()])
+def test_density_matrix_eval(c):
+    result, expected = c.eval(backend='density_matrix'), c.eval(mixed=True)
+    assert (result.dom, result.cod) == (expected.dom, expected.cod)
+    assert result.is_close(expected)
+
+
+clifford_circuits = [
+    Ket(0, 0) >> H @ qubit >> CX >> Measure(2),
+    Ket(1, 0, 1) >> S @ H @ Y >> Controlled(Z, distance=2)
+    >> H @ S.dagger() @ H >> SWAP @ qubit >> CX @ X >> Measure(3),
+    Ket(0, 0, 0) >> H @ H @ qubit >> Controlled(X, distance=-2)
+    >> Measure() @ Discard() @ qubit >> bit @ Ket(1) @ qubit >> bit @ CZ
+    >> Circuit.swap(bit, qubit) @ Measure() >> Measure() @ bit ** 2,
+]
+
+
+@pytest.mark.parametrize('c', clifford_circuits)
+def test_stabilizer(c):
+    outcomes = Stabilizer()(c).astype(int)
+    probabilities = np.zeros(len(c.cod) * (2, ))
+    for bits in product((0, 1), repeat=outcomes.shape[1] - 1):
+        probabilities[tuple(
+            (outcomes[:, 0] + outcomes[:, 1:] @ bits) % 2)] += 1
+    probabilities /= probabilities.sum()
+    assert np.allclose(probabilities, c.measure())
+    samples = Stabilizer().sample(c, n_shots=10, seed=0)
+    assert samples.shape == (10, len(c.cod))
+    assert all(c.measure()[tuple(sample)] for sample in samples)
+
+
+def test_stabilizer_errors():
+    with raises(ValueError):
+        Stabilizer()(Ket(0) >> T >> Measure())
+    with raises(ValueError):
+        Stabilizer()(Ket(0) >> Bra(0))
+
+
+def test_Controlled_distance():
+    circuit = Ket(1, 0, 1, 0) >> Controlled(CX, distance=2)
+    assert circuit.eval() == Ket(1, 0, 1, 1).eval()
+    assert circuit.eval(backend='statevector') == Ket(1, 0, 1, 1).eval()
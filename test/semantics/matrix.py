@@ -33,3 +33,20 @@ def test_matrix_add():
 def test_repeat():
     with raises(TypeError):
         Matrix[int](0, 1, 1, 0).repeat()
+
+
+def test_sparse_backend():
+    from discopy.matrix import backend
+    from discopy.sparse import COO
+    array = np.zeros((20, 30))
+    array[2, 3], array[4, 5] = .5, 2
+    with backend('sparse'):
+        m = Matrix[float](array, 20, 30)
+        assert isinstance(m.array, COO) and m.array.nnz == 2
+        assert isinstance((m >> m.dagger()).array, COO)
+        assert (m >> m.dagger()).array[2, 2] == .25
+        assert (m @ m).array[22, 33] == .5 and m @ m == Matrix[float](
+            np.block([[array, 0 * array], [0 * array, array]]), 40, 60)
+        assert isinstance(Matrix[float].zero(20, 30).array, COO)
+        dense = Matrix[float](np.ones((2, 2)), 2, 2)
+        assert isinstance((dense >> dense).array, np.ndarray)
@@ -145,6 +145,27 @@ def test_tensor_spiders():
         Tensor.spiders(1, 2, Dim(3), [0.5])
 
 
+def test_Functor_spider_no_legs():
+    x = Ty('x')
+    F, spider = Functor({x: 3}, {}), frobenius.Spider(0, 0, x)
+    assert F(spider) == Tensor.spider_factory(0, 0, Dim(3)) == Tensor.id()
+    assert F(spider >> spider) == F(spider @ spider) == F(spider)
+
+
+def test_Functor_delta():
+    x = Ty('x')
+    copy, f = frobenius.Box('copy', x, x @ x), frobenius.Box('f', x, x)
+
+    class DeltaFunctor(Functor):
+        def _delta(self, box):
+            return ((0, 1, 2), ) if box == copy else None
+
+    ar = {copy: Tensor.spider_factory(1, 2, Dim(2)).array, f: [1, 2, 3, 4]}
+    diagram = copy >> f @ x >> frobenius.Spider(2, 0, x)
+    assert DeltaFunctor({x: 2}, ar)._compile(diagram).boxes == [f]
+    assert DeltaFunctor({x: 2}, ar)(diagram) == Functor({x: 2}, ar)(diagram)
+
+
 def test_Functor_repr():
     x = Ty('x')
     F = Functor({x: 2}, {}, dom=frobenius.Category(), dtype=bool)
@@ -174,6 +195,48 @@ def test_Functor_swap():
            F(frobenius.Swap(x, y) >> g @ f)
 
 
+def test_Functor_packed():
+    x, y = Ty('x'), Ty('y')
+    f = frobenius.Box('f', x, y)
+    diagram = frobenius.Swap(x, y) >> frobenius.Spider(1, 2, y) @ f\
+        >> frobenius.Diagram.swap(y @ y, y)
+    F = Functor({x: 2, y: 3}, {f: [[1, 2, 3], [4, 5, 6]]})
+    assert F(diagram.to_packed()) == F(diagram)
+
+
+def test_Functor_cache():
+    x, y = Ty('x'), Ty('y')
+    f = frobenius.Box('f', x, y)
+    diagram = f @ f >> frobenius.Swap(y, y) >> frobenius.Spider(2, 1, y)
+    ob, ar = {x: 2, y: Dim(3, 1)}, {f: [[1, 2, 3], [4, 5, 6]]}
+    F = Functor(ob, ar, cache_size=None)
+    assert F(diagram) == Functor(ob, ar)(diagram)
+    assert F(diagram) == F(diagram.to_packed())
+    assert F.cache_info().currsize == 3
+
+
+def test_Functor_then():
+    from discopy import rigid
+    n, s = rigid.Ty('n'), rigid.Ty('s')
+    Alice, loves = rigid.Box('Alice', rigid.Ty(), n), rigid.Box(
+        'loves', rigid.Ty(), n.r @ s @ n.l)
+    sentence = Alice @ loves @ Alice\
+        >> rigid.Cup(n, n.r) @ s @ rigid.Cup(n.l, n)
+    f = rigid.Box('f', n, n)
+    F = rigid.Functor({n: n, s: s}, {Alice: Alice >> f, loves: loves})
+    G = Functor({n: 2, s: 1}, {
+        Alice: [0, 1], loves: [0, 1, 1, 0], f: [0, 1, 1, 0]},
+        dom=rigid.Category(), cache_size=None)
+    H = F >> G
+    assert type(H) is Functor and H.dom == F.dom and H.cod == G.cod
+    assert H.dtype == G.dtype and H.cod == Category(Dim, Tensor[int])
+    assert H(sentence) == G(F(sentence))
+    assert H.cache_size == 0
+    assert type(F >> F) is rigid.Functor and (F >> F).cod == F.cod
+    with raises(AxiomError):
+        G >> F
+
+
 def test_AxiomError():
     m = Tensor([1, 0, 0, 1, 0, 1, 1, 0], Dim(2, 2), Dim(2))
     with raises(AxiomError) as err:
@@ -265,3 +328,230 @@ def test_non_numpy_eval():
 def test_Tensor_array():
     box = Box("box", Dim(2), Dim(2), None)
     assert box.array is None
+
+
+def test_einsum():
+    x, y, z = (np.arange(n * m).reshape((n, m))
+               for n, m in [(2, 3), (3, 4), (4, 2)])
+    inputs, output = [(0, 1), (1, 2), (2, 3)], (0, 3)
+    for optimize in ["greedy", "optimal"]:
+        result = einsum(inputs, output, x, y, z, optimize=optimize)
+        assert (result == x @ y @ z).all()
+    assert einsum([(0, 0)], (), x[:, :2]) == np.trace(x[:, :2])
+    assert (einsum([(0, 1), (0, 2)], (2, 1, 0), x, x)
+            == np.einsum('ij,ik->kji', x, x)).all()
+    with raises(ValueError):
+        einsum(inputs, output, x, y, z, optimize="random")
+    x = np.random.rand(*30 * (1, ), 2, 3, 3)
+    y = np.random.rand(2, 3, *30 * (1, ))
+    inputs = [(*range(30), 30, 31, 31), (30, 32, *range(40, 70))]
+    output = (*range(69, 39, -1), 32, 30, *range(30))
+    assert len(set(inputs[0] + inputs[1])) > 52
+    result = einsum(inputs, output, x, y)
+    assert result.shape == 30 * (1, ) + (3, 2) + 30 * (1, )
+    expected = np.einsum('abb,ac->ca', x.reshape(2, 3, 3), y.reshape(2, 3))
+    assert np.allclose(result.reshape(3, 2), expected)
+
+
+def test_connected_components():
+    x, y = np.random.rand(2, 3), np.random.rand(3)
+    inputs, output = [(0, 1), (), (2, ), (1, ), (3, 3)], (2, 0)
+    assert connected_components(tuple(inputs)) == ((0, 3), (1, ), (2, ), (4, ))
+    path = contraction_path(tuple(inputs), output, (2, 3, 4, 5))
+    assert [labels for *_, labels in path[1:]] == [(), (0, ), (0, 2)]
+    arrays = x, np.array(2.), np.arange(4), y, np.eye(5)
+    expected = np.einsum('ab,,c,b,dd->ca', *arrays)
+    for threads in [None, 1, 4]:
+        assert np.allclose(
+            einsum(inputs, output, *arrays, threads=threads), expected)
+    diagram = Box('x', Dim(1), Dim(2, 3), x)\
+        >> Dim(2) @ Box('y', Dim(3), Dim(1), y)\
+        @ Box('z', Dim(1), Dim(4), np.arange(4))
+    assert diagram.eval(dtype=float, threads=2) == diagram.eval(dtype=float)
+
+
+def test_max_memory():
+    x = Dim(6)
+    f, g, h = (Box(name, x, x, np.random.rand(6, 6)) for name in "fgh")
+    diagram = Cap(x, x) >> (f >> g >> h) @ x >> Cup(x, x)
+    plan, expected = diagram.compile(), diagram.eval(dtype=float)
+    assert plan.cost(dtype=float).memory == (36 + 1) * 8
+    cost = plan.cost(max_memory=8 * 8, dtype=float)
+    assert cost.slices == 6 and cost.memory <= 8 * 8
+    assert cost.flops == plan.cost(dtype=float).flops
+    result = diagram.eval(dtype=float, max_memory=8 * 8)
+    assert np.isclose(result.array, expected.array)
+    inputs, output = [(0, 1), (1, 2), (2, 0)], ()
+    assert contraction_slices(tuple(inputs), output, (6, 6, 6), 8)[0]
+    arrays = f.array, g.array, h.array
+    assert np.isclose(
+        einsum(inputs, output, *arrays, max_size=8), expected.array)
+    with raises(ValueError):
+        diagram.eval(dtype=float, max_memory=8)
+
+
+def test_cost():
+    from discopy import rigid
+    n, s = map(rigid.Ty, "ns")
+    words = [rigid.Box(name, rigid.Ty(), typ) for name, typ in [
+        ("Alice", n), ("loves", n.r @ s @ n.l), ("Bob", n)]]
+    sentence = rigid.Id().tensor(*words)\
+        >> rigid.Cup(n, n.r) @ s @ rigid.Cup(n.l, n)
+    diagram = sentence @ sentence
+
+    def ar(box):
+        raise AssertionError
+
+    F = Functor(ob={n: 10, s: 3}, ar=ar, dom=rigid.Category(), dtype=float)
+    cost = F.cost(diagram)
+    assert cost.output == 9 * 8 and cost.slices == 1
+    plan = Contraction.from_diagram(diagram, lambda typ: [
+        Dim(F.ob[rigid.Ty(x.name)]) for x in typ.inside])
+    flops, peak = contraction_cost(
+        plan.inputs, plan.output, plan.sizes, plan.path)
+    assert (cost.flops, cost.memory) == (flops, 8 * peak)
+    x = Dim(10)
+    vector = Box('v', Dim(1), x @ x)
+    assert (vector >> Cup(x, x)).cost().flops == 10
+
+
+def test_Functor_einsum():
+    x, n = Dim(3), 12
+    words = [Box(f"w{i}", Dim(1), x @ x, np.arange(9) + i) for i in range(n)]
+    diagram = Id().tensor(*words)
+    for i in range(n - 1):
+        diagram = diagram >> x @ Cup(x, x) @ x ** (2 * n - 2 * i - 3)
+    result = diagram.eval(contractor=tn.contractors.auto)
+    assert (diagram.eval().array == result.array).all()
+    d = Spider(0, 2, x) >> Swap(x, x) >> Spider(1, 0, x) @ Cap(x, x) @ x\
+        >> x @ Cup(x, x)
+    assert d.eval() == Tensor[int]([1, 1, 1], Dim(1), x)
+    assert (Cap(x, x) >> Cup(x, x)).eval() == Tensor([3], Dim(1), Dim(1))
+
+
+def test_Contraction():
+    x = Dim(2)
+    f, g = Box('f', x, x, [1, 2, 3, 4]), Box('g', x, x @ x, list(range(8)))
+    diagram = f >> g >> Spider(2, 1, x) >> f[::-1]
+    plan = diagram.compile()
+    assert plan() == diagram.eval() == plan(dtype=int)
+    assert plan.boxes == [f, g, f[::-1]]
+    assert list(plan.shapes.values()) == [(2, 2), (2, 2, 2), (2, 2)]
+    params = {f: [0, 1, 1, 0], g: 8 * [1], f[::-1]: [0, 1, 1, 0]}
+    other = Box('h', x, x) >> g >> Spider(2, 1, x) >> Box('k', x, x)
+    assert other.compile().inputs is plan.inputs
+    vector = np.array([0, 1, 1, 0] + 8 * [1] + [0, 1, 1, 0])
+    assert plan(params) == plan(vector)
+    assert plan(params) == Functor(lambda x: x, params)(diagram)
+    with raises(ValueError):
+        plan(np.zeros(42))
+
+
+def test_Contraction_grad():
+    x = Dim(3)
+    f = Box('f', x, x @ x, np.random.rand(27) + 1j * np.random.rand(27))
+    g = Box('g', x @ x, x, np.random.rand(27))
+    diagram = f >> Swap(x, x) >> g >> Spider(1, 2, x) >> g
+    plan, cotangent = diagram.compile(), np.random.rand(3, 3)
+    flat = np.concatenate([f.array.reshape(-1), g.array.reshape(-1)])
+    loss = lambda params: np.sum(plan(params, complex).array * cotangent)
+    gradient = plan.grad(flat, cotangent, dtype=complex)
+    for i in range(len(flat)):
+        delta = np.zeros(len(flat))
+        delta[i] = 1e-6
+        expected = (loss(flat + delta) - loss(flat - delta)) / 2e-6
+        assert np.isclose(gradient[i], expected)
+    assert np.isclose(np.dot(gradient, flat), 3 * loss(flat))
+    gradients = plan.grad(cotangent=cotangent, dtype=complex)
+    assert np.allclose(gradients[g].reshape(-1), gradient[27:])
+    batched = plan.grad(np.stack([flat, 2 * flat]), dtype=complex)
+    assert batched.shape == (2, len(flat))
+    assert np.allclose(batched[1], plan.grad(2 * flat, dtype=complex))
+    params = {
+        f: Tensor[complex](np.stack(2 * [f.array]), x, x @ x, 2), g: g.array}
+    gradients = plan.grad(params, np.stack(2 * [cotangent]), dtype=complex)
+    assert np.allclose(gradients[f][1].reshape(-1), gradient[:27])
+    assert np.allclose(gradients[g].reshape(-1), 2 * gradient[27:])
+    gs, cotangents = np.random.rand(4, 27), np.random.rand(4, 3, 3)
+    gradients = plan.grad(
+        {f: f.array, g: Tensor[complex](gs, x @ x, x, 4)}, cotangents, complex)
+    expected = [plan.grad({f: f.array, g: array}, cotangent, complex)
+                for array, cotangent in zip(gs, cotangents)]
+    assert gradients[g].shape == (4, 3, 3, 3)
+    assert np.allclose(gradients[g], [grad[g] for grad in expected])
+    assert np.allclose(gradients[f], sum(grad[f] for grad in expected))
+    with raises(ValueError) as err:
+        plan.grad({f: params[f], g: Tensor[complex](
+            np.stack(3 * [g.array]), x @ x, x, 3)}, dtype=complex)
+    assert str(err.value) == messages.BATCH_MISMATCH.format(2, 3)
+
+
+def test_Tensor_batch():
+    x, y = Dim(2), Dim(3)
+    f = Tensor[float](np.random.rand(4, 2, 3), x, y, batch=4)
+    g = Tensor[float](np.random.rand(3, 2), y, x)
+    assert f.batch == 4 and g.batch is None
+    fs = [Tensor[float](array, x, y) for array in f.array]
+    for i, h in enumerate(fs):
+        assert np.allclose((f >> g).array[i], (h >> g).array)
+        assert np.allclose((g @ f).array[i], (g @ h).array)
+        assert np.allclose(f.dagger().array[i], h.dagger().array)
+    assert (f >> f.dagger()).batch == 4
+    with raises(ValueError):
+        f >> Tensor[float](np.random.rand(5, 3, 2), y, x, batch=5)
+    assert f != fs[0] and f == Tensor[float](f.array, x, y, batch=4)
+    with raises(ValueError):
+        Tensor(np.zeros((2, 2)), Dim(2), Dim(1))
+    with raises(ValueError):
+        Tensor[float](f.array, x, y)
+
+
+def test_Functor_batch():
+    x = Dim(2)
+    data = np.random.rand(8, 2, 2)
+    f, g = Box('f', x, x, data, batch=8), Box('g', x, x @ x, list(range(8)))
+    assert f != Box('f', x, x, data) and f.dagger().dagger() == f
+    diagram = f >> g >> Spider(2, 1, x) >> Cup(x, x).dagger() @ x
+    result = diagram.eval(dtype=float)
+    assert result.batch == 8
+    for i, array in enumerate(data):
+        expected = Functor(
+            lambda x: x, {f: array, g: g.array}, dtype=float)(diagram)
+        assert np.allclose(result.array[i], expected.array)
+    plan = diagram.compile()
+    params = np.concatenate([data.reshape(8, 4), np.tile(g.data, (8, 1))], 1)
+    assert np.allclose(plan(params, dtype=float).array, result.array)
+    with raises(ValueError):
+        Box('f', x, x, list(range(8))).eval()
+    with raises(ValueError):
+        plan({f: data, g: g.array})
+
+
+def test_sparse_backend():
+    from discopy.sparse import COO
+    x = Dim(32)
+    f = Box('f', x, x, np.roll(np.eye(32, dtype=int), 1, axis=1))
+    diagram = Spider(1, 2, x) >> f @ Spider(1, 2, x) >> x @ Spider(2, 1, x)
+    expected = diagram.eval()
+    with backend('sparse'):
+        result = diagram.eval()
+        assert isinstance(result.array, COO) and result.array.nnz == 32
+        assert result == expected
+        assert (result >> result.dagger()).array.nnz == 32
+        assert isinstance((result @ result).array, COO)
+        assert (result @ result).array.nnz == 32 ** 2
+
+
+def test_zero_copy():
+    x = Dim(2, 3)
+    f = Tensor[float](np.random.rand(36), x, x)
+    assert np.shares_memory(f.dagger().array, f.array)
+    assert np.shares_memory(f.transpose().array, f.array)
+    assert np.shares_memory(Tensor[float]._wrap(f.array, x, x).array, f.array)
+    assert not np.shares_memory(Tensor[float](f.array, x, x).array, f.array)
+    assert not np.shares_memory(
+        Tensor[int]._wrap(f.array, x, x).array, f.array)
+    g = Tensor[complex](np.random.rand(36) + 1j, x, x)
+    assert np.allclose(
+        g.dagger().array, g.array.conjugate().transpose(2, 3, 0, 1))
+    assert (f >> f.dagger()).array.dtype == np.float64
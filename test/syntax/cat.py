@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 
+from threading import Thread
+
 from pytest import raises
 
 from discopy.cat import *
+from discopy.cat import _is_trusted
 
 
 def test_main():
@@ -114,14 +117,59 @@ def test_Arrow_eq():
 
 def test_Arrow_hash():
     assert {Id(Ob('x')): 42}[Id(Ob('x'))] == 42
+    x, y, z = Ob('x'), Ob('y'), Ob('z')
+    f, g, h = Box('f', x, y), Box('g', y, z), Box('h', z, x, data=[42])
+    arrow = f >> g >> h
+    assert hash(f) == hash(Arrow((f, ), x, y))
+    assert hash(arrow) == hash(Arrow((f, g, h), x, x))
+    hash(f), hash(g), hash(h)
+    assert hash(f.then(g, h)) == hash(arrow)
+    assert hash(arrow[1:]) == hash(g >> h) and hash(arrow[:1]) == hash(f)
+
+
+def test_Arrow_pickle():
+    import pickle
+    x, y = Ob('x'), Ob('y')
+    f = Box('f', x, y)
+    hash(f), hash(f >> f[::-1])
+    assert pickle.loads(pickle.dumps(f >> f[::-1])) == f >> f[::-1]
+    assert "_hash" not in vars(pickle.loads(pickle.dumps(f)))
 
 
 def test_Arrow_then():
     x, y, z = Ob('x'), Ob('y'), Ob('z')
     f, g = Box('f', x, y), Box('g', y, z)
     assert f.then(g) == f >> g == g << f
+    assert f.then(g, g[::-1], f[::-1]) == f >> g >> g[::-1] >> f[::-1]
     with raises(TypeError) as err:
         f >> x
+    with raises(AxiomError):
+        f.then(g, f)
+
+
+def test_trusted(monkeypatch):
+    from discopy import config
+    x, y, z = Ob('x'), Ob('y'), Ob('z')
+    f, g = Box('f', x, y), Box('g', y, z)
+    with trusted():
+        assert (g >> f).inside == (g, f)
+        assert Arrow((g, ), x, y).inside == (g, )
+        with raises(TypeError):
+            f >> x
+    with raises(AxiomError):
+        g >> f
+    with trusted():
+        thread = Thread(target=lambda: results.append(_is_trusted()))
+        results = []
+        thread.start()
+        thread.join()
+        assert _is_trusted() and results == [False]
+    with raises(AxiomError):
+        Functor({x: x}, {f: g})(f >> f)
+    monkeypatch.setattr(config, "DEBUG", True)
+    with trusted():
+        with raises(AxiomError):
+            g >> f
 
 
 def test_Arrow_dagger():
@@ -199,6 +247,25 @@ def test_Functor():
     assert F(Id(Ob('x'))) == Id(Ob('y'))
 
 
+def test_Functor_then():
+    x, y = Ob('x'), Ob('y')
+    f = Box('f', x, x)
+
+    class Counter(Functor):
+        calls = 0
+
+        def __call__(self, other):
+            type(self).calls += 1
+            return super().__call__(other)
+
+    F = Functor({x: y}, {f: Box('g', y, y)})
+    G = Counter({y: x}, lambda box: f, cache_size=None)
+    H = F >> G
+    assert type(H) is Counter and (H.dom, H.cod) == (F.dom, G.cod)
+    assert H(f >> f) == f >> f and Counter.calls > 0
+    assert type(G >> F) is Functor and H.cache_size == 0
+
+
 def test_Functor_eq():
     x, y = Ob('x'), Ob('y')
     assert Functor({x: y, y: x}, {}) == Functor({y: x, x: y}, {})
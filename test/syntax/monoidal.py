@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 
+from random import Random
+
 from pytest import raises
 
+from discopy import cat
 from discopy.cat import *
 from discopy.monoidal import *
 
@@ -15,6 +18,8 @@ def test_Ty():
 
 def test_Ty_init():
     assert list(Ty('x', 'y', 'z')) == [Ty('x'), Ty('y'), Ty('z')]
+    with trusted():
+        assert Ty('x') == Ty('x') and Ty('x').inside == (Ob('x'), )
 
 
 def test_Ty_eq():
@@ -144,6 +149,22 @@ def test_Diagram_offsets():
 
 def test_Diagram_hash():
     assert {Id(Ty('x')): 42}[Id(Ty('x'))] == 42
+    x, y = Ty('x'), Ty('y')
+    f, g = Box('f', x, y), Box('g', y, x)
+    assert hash(x) == hash(Ob('x')) and hash(x @ y) == hash(Ty('x', 'y'))
+    assert hash(f) == hash(Diagram((Layer.cast(f), ), x, y))
+    assert hash(f @ g) == hash(f @ y >> y @ g)
+    assert hash(Layer(x, f, y)) == hash(Layer(x, f, y))
+    assert len({f @ g, f @ y >> y @ g, g @ f}) == 2
+
+
+def test_Diagram_decode():
+    x, y = Ty('x'), Ty('y')
+    f, g = Box('f', x, y), Box('g', y @ y, x)
+    diagram = f @ f >> g
+    assert Diagram.decode(*diagram.encode()) == diagram
+    with raises(AxiomError):
+        Diagram.decode(x @ x, [(f, 0), (g, 1)])
 
 
 def test_Diagram_str():
@@ -184,6 +205,52 @@ def test_Diagram_interchange():
     assert d.interchange(2, 0) == Id(x) @ f1 >> f0 @ Id(x) >> f1 @ f0
 
 
+def test_Diagram_foliation():
+    x, y = Ty('x'), Ty('y')
+    f, g = Box('f', x, y), Box('g', y, x)
+    state, effect = Box('state', Ty(), x @ x), Box('effect', y @ y, Ty())
+    diagram = f @ x >> g @ x >> x @ f >> x @ g
+    assert str(diagram.foliation()) == "f @ f >> g @ g"
+    assert diagram.foliation(left=False).to_staircases()\
+        == f @ f >> g @ g
+    assert diagram.depth() == 2 and diagram[::-1].depth() == 2
+    diagram = f @ state >> y @ f @ x >> effect @ f
+    assert diagram.depth() == len(diagram.foliation()) == 3
+    assert str(diagram.foliation()) == "f @ state >> y @ f @ f >> effect @ y"
+    s0, s1 = Box('s0', Ty(), Ty()), Box('s1', Ty(), Ty())
+    assert str((s0 >> s1).foliation()) == "s0 @ s1"
+    assert (s0 @ x >> f >> s1 @ y).depth() == 1
+    assert Id(x).foliation() == Id(x) and Id(x).depth() == 0
+
+
+def test_Diagram_depth_symmetric():
+    x = Ty('x')
+    u, u2 = Box('u', Ty(), x), Box('u2', Ty(), x @ x)
+    c, f = Box('c', x, Ty()), Box('f', x, x)
+    diagram = u2 >> c @ x >> u @ x >> f @ x
+    assert str(diagram.foliation()) == "u @ u2 >> f @ c @ x"
+    diagram = u2 >> x @ c >> x @ u >> x @ f
+    assert str(diagram.foliation()) == "u2 @ u >> x @ c @ f"
+    random = Random(0)
+    for _ in range(200):
+        diagram = Id(x ** random.randint(0, 2))
+        for i in range(random.randint(1, 10)):
+            m = random.randint(0, min(2, len(diagram.cod)))
+            offset = random.randint(0, len(diagram.cod) - m)
+            box = Box(f"b{i}", x ** m, x ** random.randint(0, 2))
+            diagram >>= diagram.cod[:offset] @ box\
+                @ diagram.cod[offset + m:]
+        depth = diagram.depth()
+        assert depth == diagram[::-1].depth()
+        for left in [True, False]:
+            foliation = diagram.foliation(left)
+            assert len(foliation) == depth
+            assert (foliation.dom, foliation.cod)\
+                == (diagram.dom, diagram.cod)
+            assert sorted(foliation.to_staircases().boxes, key=str)\
+                == sorted(diagram.boxes, key=str)
+
+
 def test_Diagram_normalize():
     x, y = Ty('x'), Ty('y')
     f0, f1 = Box('f0', x, y), Box('f1', y, x)
@@ -203,6 +270,22 @@ def test_Diagram_normal_form():
     assert (f0 >> f1).normal_form() == f0 >> f1
     assert (Id(x) @ f1 >> f0 @ Id(x)).normal_form() == f0 @ f1
     assert (f0 @ f1).normal_form(left=True) == Id(x) @ f1 >> f0 @ Id(x)
+    assert err.value.last_step in {s0 >> s1, s1 >> s0}
+    diagram = f0 @ f1 >> f1 @ f0 >> f0 @ f1
+    *_, last_step = diagram.normalize()
+    assert diagram.normal_form() == last_step
+    *_, last_step = diagram.normalize(left=True)
+    assert diagram.normal_form(left=True) == last_step
+
+
+def test_Diagram_normal_form_collisions(monkeypatch):
+    expected = [spiral(3).normal_form(left=left) for left in (False, True)]
+    s0, s1 = Box('s0', Ty(), Ty()), Box('s1', Ty(), Ty())
+    monkeypatch.setattr(cat, "HASH_MODULUS", 1)
+    for left in (False, True):
+        assert spiral(3).normal_form(left=left) == expected[left]
+    with raises(NotImplementedError):
+        (s0 >> s1).normal_form()
 
 
 def test_AxiomError():
@@ -296,6 +379,26 @@ def test_Functor_call():
         F(F)
 
 
+def test_Functor_cache():
+    x, y = Ty('x'), Ty('y')
+    f, g = Box('f', x, y), Box('g', y, x)
+    calls = []
+    ar = lambda box: calls.append(box) or box.dagger()
+    diagram = f @ g >> g @ f >> f @ g
+    expected = Functor({x: y, y: x}, ar)(diagram)
+    calls.clear()
+    F = Functor({x: y, y: x}, ar, cache_size=None)
+    assert F(diagram) == expected and calls == [f, g]
+    assert F.cache_info().misses == F.cache_info().currsize == 4
+    F.cache_clear()
+    assert F.cache_info().currsize == 0
+    G = Functor({x: y, y: x}, ar, cache_size=1)
+    assert G(diagram) == expected and G.cache_info().currsize == 1
+    G = Functor({x: y, y: x}, ar, cache_size=None)
+    G(f.dagger() >> f >> f.dagger())
+    assert G.cache_info().misses == 4  # f.dagger(), f, x and y
+
+
 def test_PRO_Functor():
     G = Functor(lambda x: x @ x, lambda f: f, cod=Category(PRO, Diagram))
     assert G(PRO(2)) == PRO(4)
@@ -334,3 +437,30 @@ def test_Layer_merge_cup_cap():
 def test_Layer_scalars():
     a, b = Box("a", Ty(), Ty()), Box("b", Ty(), Ty())
     assert Layer.cast(a).merge(Layer.cast(b)) == Layer(Ty(), a, Ty(), b, Ty())
+
+
+def test_PackedDiagram():
+    x, y = Ty('x'), Ty('y')
+    f, g = Box('f', x, y), Box('g', y @ y, x)
+    diagram = f @ f >> g
+    packed = diagram.to_packed()
+    assert packed.table == (f, g) and len(packed) == 3
+    assert packed == diagram and packed.to_diagram() == diagram
+    for key in (slice(None), slice(1, None), slice(2, 1), slice(5, 7), -1):
+        assert packed[key].to_diagram() == diagram[key]
+    assert packed[::-1].to_diagram() == diagram[::-1]
+    assert (packed >> packed[::-1]).to_diagram() == diagram >> diagram[::-1]
+    assert (x @ packed @ y).to_diagram() == x @ diagram @ y
+    assert (packed @ packed).table == (f, g)
+    assert PackedDiagram.id(x).to_diagram() == Id(x)
+    unscanned = PackedDiagram(x @ x, (f, g), [0, 0, 1], [0, 1, 0])
+    for other in (unscanned, diagram):
+        assert hash(packed) == hash(other) and packed == other
+    for key in (slice(1, None), slice(None, 2), slice(None, None, -1)):
+        assert hash(packed[key]) == hash(unscanned[key]) == hash(diagram[key])
+    assert hash(x @ packed >> unscanned[::-1] @ x)\
+        == hash(x @ diagram >> diagram[::-1] @ x)
+    with raises(AxiomError):
+        packed >> packed
+    with raises(ValueError):
+        PackedDiagram(x, (f, ), [0], [])
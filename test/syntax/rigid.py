@@ -71,6 +71,23 @@ def test_Diagram_normal_form():
     assert str(err.value) == messages.NOT_CONNECTED.format(Eckmann_Hilton)
 
 
+def test_Diagram_normal_form_fast():
+    x, y = Ty('x'), Ty('y')
+    f, g = Box('f', x, y @ y), Box('g', y, x)
+    for diagram in [
+            Id(x).transpose(left=True), Id(x @ y).transpose(),
+            f.transpose().transpose(left=True),
+            f.transpose(left=True).transpose() >> g @ g,
+            (f >> g @ g).transpose().transpose(left=True) @ Id(x).transpose(),
+            Cap(x, x.l) @ x >> x @ Cup(x.l, x) >> f]:
+        assert diagram.normal_form(fast=True) == diagram.normal_form()
+        assert diagram.normal_form(fast=True, left=True)\
+            == diagram.normal_form(left=True)
+    Eckmann_Hilton = Box('s0', Ty(), Ty()) @ Box('s1', Ty(), Ty())
+    with raises(NotImplementedError):
+        Eckmann_Hilton.normal_form(fast=True)
+
+
 def test_Cup_init():
     with raises(TypeError):
         Cup('x', Ty('y'))
@@ -1,6 +1,8 @@
 from unittest.mock import MagicMock
 from unittest.mock import patch
 
+from pytest import raises
+
 from discopy.cat import Ob
 from discopy.utils import *
 
@@ -13,3 +15,41 @@ zip_mock.open().__enter__().read.return_value =\
 @patch('zipfile.ZipFile', return_value=zip_mock)
 def test_load_corpus(a, b):
     assert load_corpus("[fake url]") == [Ob("a")]
+
+
+def test_hash_eq_data():
+    import numpy as np
+    from discopy.tensor import Box, Dim
+    boxes = [Box('f', Dim(2), Dim(1), data)
+             for data in ([1, 2], np.array([1, 2]), np.array([1., 2.]))]
+    assert boxes[0] == boxes[1] == boxes[2] and len(set(boxes)) == 1
+    assert hash_data(np.array(1)) == hash_data(1.) == hash(1)
+    assert hash_data(np.eye(2)) != hash_data(np.eye(2).ravel())
+    assert not eq_data(np.eye(2), np.eye(3))
+    assert not eq_data(np.ones(2), 1) and not eq_data([1, 2], np.ones(3))
+
+
+def test_lazy_import():
+    import subprocess
+    import sys
+    heavy = ("numpy", "sympy", "tensornetwork", "torch", "jax",
+             "tensorflow", "discopy.tensor", "discopy.quantum")
+    script = "import sys, time\n"\
+        "start = time.perf_counter()\n"\
+        "import discopy\n"\
+        "lazy = time.perf_counter() - start\n"\
+        f"print([name for name in sys.modules if name.startswith({heavy})])\n"\
+        "import discopy.tensor, discopy.quantum\n"\
+        "print(lazy / (time.perf_counter() - start))"
+    modules, ratio = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True,
+        check=True).stdout.splitlines()
+    assert eval(modules) == []
+    # Importing discopy takes a fraction of the time of the heavy modules,
+    # with a generous margin that only an eager import would exceed.
+    assert float(ratio) < .5
+    import discopy.quantum
+    assert discopy.quantum.CircuitFunctor is discopy.quantum.circuit.Functor
+    assert "Ket" in dir(discopy.quantum) and "qubit" in discopy.quantum.__all__
+    with raises(AttributeError):
+        discopy.quantum.Cat